@@ -0,0 +1,97 @@
+"""
+Throughput and event loop latency while downloading a large file.
+
+Run with ``python -m benchmarks.bench_file_response``. A 2 GB file is
+written to a temporary directory and sent with the old static file code,
+which read the whole file on the event loop, and with ``FileResponse`` at a
+few chunk sizes. While the download runs, a ticker task measures how late
+the loop wakes it up, which is the delay every other request on the worker
+would see.
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from inspira.responses import FileResponse
+
+FILE_SIZE_MB = 2048
+TICK_SECONDS = 0.001
+
+
+def write_file(path: str) -> None:
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as file:
+        for _ in range(FILE_SIZE_MB):
+            file.write(block)
+
+
+async def blocking_read(path, scope, receive, send):
+    # What TemplateResponse.handle_static_file used to do.
+    with open(path, "rb") as file:
+        body = file.read()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body, "more_body": False})
+
+
+def file_response(chunk_size: int):
+    async def variant(path, scope, receive, send):
+        await FileResponse(path, chunk_size=chunk_size)(scope, receive, send)
+
+    return variant
+
+
+async def download(variant, path):
+    lags = []
+    running = True
+
+    async def ticker():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    sent = 0
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+        # Give the loop a turn, as a real server does while writing.
+        await asyncio.sleep(0)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(TICK_SECONDS * 2)
+    start = time.perf_counter()
+    await variant(path, {"type": "http", "method": "GET", "headers": []}, receive, send)
+    elapsed = time.perf_counter() - start
+    running = False
+    await ticker_task
+
+    lags.sort()
+    return sent / elapsed / (1024 * 1024), lags[len(lags) // 2], lags[-1]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "download.bin")
+        write_file(path)
+
+        print(f"{'variant':>18} {'MB/s':>8} {'p50 lag ms':>11} {'max lag ms':>11}")
+        for name, variant in (
+            ("blocking read", blocking_read),
+            ("FileResponse 64K", file_response(64 * 1024)),
+            ("FileResponse 256K", file_response(256 * 1024)),
+            ("FileResponse 1M", file_response(1024 * 1024)),
+        ):
+            throughput, median, worst = asyncio.run(download(variant, path))
+            print(
+                f"{name:>18} {throughput:>8.0f} {median * 1e3:>11.2f} "
+                f"{worst * 1e3:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
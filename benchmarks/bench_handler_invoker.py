@@ -0,0 +1,58 @@
+"""
+Per-call overhead of binding handler arguments.
+
+Run with ``python -m benchmarks.bench_handler_invoker``. Compares inspecting
+the handler signature on every call with reusing a prebuilt invocation plan.
+"""
+import asyncio
+import time
+
+from inspira.requests import Request
+from inspira.utils.handler_invoker import build_invocation_plan, invoke_handler
+
+CALLS = 50_000
+
+
+async def handler_0():
+    return None
+
+
+async def handler_3(request, item_id: int, name: str):
+    return None
+
+
+async def handler_8(request, scope, a: int, b: int, c: str, d: str, e=1, f=None):
+    return None
+
+
+HANDLERS = {
+    0: (handler_0, {}),
+    3: (handler_3, {"item_id": "1", "name": "x"}),
+    8: (handler_8, {"a": "1", "b": "2", "c": "x", "d": "y"}),
+}
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def measure(handler, params, plan):
+    scope = {"type": "http", "query_string": b"", "headers": []}
+    request = Request(scope, receive, None)
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await invoke_handler(handler, request, scope, params, plan)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main():
+    print(f"{'params':>6} {'inspect usec':>13} {'plan usec':>10}")
+    for count, (handler, params) in HANDLERS.items():
+        plan = build_invocation_plan(handler)
+        uncached = await measure(handler, params, None)
+        cached = await measure(handler, params, plan)
+        print(f"{count:>6} {uncached:>13.3f} {cached:>10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
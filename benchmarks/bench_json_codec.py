@@ -0,0 +1,72 @@
+"""
+JSON encode and decode time per codec across payload shapes.
+
+Run with ``python -m benchmarks.bench_json_codec``. ``legacy`` is the plain
+``json.dumps``/``json.loads`` round trip used before the codec setting, with
+``default=str`` for the rich types. Codecs whose library is not installed
+are skipped.
+"""
+import datetime
+import json
+import time
+import uuid
+
+from inspira.utils.json_codec import load_json_codec, msgspec, orjson
+
+ITERATIONS = 2_000
+
+PAYLOADS = {
+    "small": {"id": 1, "name": "Lamp", "price": 19.99, "in_stock": True},
+    "records": [
+        {"id": index, "name": f"Product {index}", "tags": ["new", "sale"]}
+        for index in range(1_000)
+    ],
+    "nested": {
+        "level": {"level": {"level": {"values": list(range(100))}}},
+        "matrix": [[float(x * y) for x in range(20)] for y in range(20)],
+    },
+    "rich": [
+        {
+            "id": uuid.UUID(int=index),
+            "created_at": datetime.datetime(2024, 1, 1),
+        }
+        for index in range(200)
+    ],
+}
+
+
+class LegacyCodec:
+    name = "legacy"
+
+    def dumps(self, obj):
+        return json.dumps(obj, default=str).encode()
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    codecs = [LegacyCodec(), load_json_codec("json")]
+    if orjson is not None:
+        codecs.append(load_json_codec("orjson"))
+    if msgspec is not None:
+        codecs.append(load_json_codec("msgspec"))
+
+    print(f"{'payload':>8} {'codec':>8} {'dumps usec':>11} {'loads usec':>11}")
+    for payload_name, payload in PAYLOADS.items():
+        for codec in codecs:
+            encoded = codec.dumps(payload)
+            dumps = measure(lambda: codec.dumps(payload))
+            loads = measure(lambda: codec.loads(encoded))
+            print(f"{payload_name:>8} {codec.name:>8} {dumps:>11.1f} {loads:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
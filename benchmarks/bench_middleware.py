@@ -0,0 +1,69 @@
+"""
+Per-request overhead of the middleware chain.
+
+Run with ``python -m benchmarks.bench_middleware``. Compares composing the
+chain on every request with reusing the chain composed on the first request.
+"""
+import asyncio
+import logging
+import time
+
+from inspira import Inspira
+from inspira.enums import HttpMethod
+from inspira.logging import log
+from inspira.responses import HttpResponse
+
+MIDDLEWARE_COUNTS = (0, 5, 20)
+REQUESTS = 20_000
+
+SCOPE = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+
+async def passthrough(handler):
+    async def middleware(scope, receive, send):
+        await handler(scope, receive, send)
+
+    return middleware
+
+
+async def index():
+    return HttpResponse("ok")
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def build_app(middleware_count: int) -> Inspira:
+    app = Inspira(secret_key="benchmark")
+    app.add_route("/", HttpMethod.GET, index)
+    for _ in range(middleware_count):
+        app.add_middleware(passthrough)
+    return app
+
+
+async def measure(app: Inspira, rebuild: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if rebuild:
+            app.middleware_chain = None
+        await app(SCOPE, receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main():
+    log.setLevel(logging.CRITICAL)
+    print(f"{'middlewares':>11} {'rebuilt usec':>13} {'cached usec':>12}")
+    for middleware_count in MIDDLEWARE_COUNTS:
+        app = build_app(middleware_count)
+        rebuilt = await measure(app, rebuild=True)
+        cached = await measure(app, rebuild=False)
+        print(f"{middleware_count:>11} {rebuilt:>13.2f} {cached:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Multipart parse throughput and memory use for large uploads.
+
+Run with ``python -m benchmarks.bench_multipart``. Each upload is a single
+file field delivered in 64 KB chunks through ``Request.form()``. Peak traced
+memory should stay flat as the upload grows, since the file is spooled to
+disk instead of buffered.
+"""
+import asyncio
+import time
+import tracemalloc
+
+from inspira.requests import Request
+
+UPLOAD_SIZES = (10 * 1024 * 1024, 100 * 1024 * 1024, 1024 * 1024 * 1024)
+CHUNK_SIZE = 64 * 1024
+BOUNDARY = b"----benchmarkboundary"
+
+HEAD = (
+    b"--" + BOUNDARY + b"\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="upload.bin"\r\n'
+    b"Content-Type: application/octet-stream\r\n\r\n"
+)
+TAIL = b"\r\n--" + BOUNDARY + b"--\r\n"
+CHUNK = bytes(range(256)) * (CHUNK_SIZE // 256)
+
+SCOPE = {
+    "type": "http",
+    "method": "POST",
+    "path": "/",
+    "headers": [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)],
+}
+
+
+def make_receive(size: int):
+    messages = [HEAD] + [CHUNK] * (size // CHUNK_SIZE) + [TAIL]
+    iterator = iter(enumerate(messages, 1))
+
+    async def receive():
+        index, body = next(iterator)
+        return {
+            "type": "http.request",
+            "body": body,
+            "more_body": index < len(messages),
+        }
+
+    return receive
+
+
+async def parse(size: int):
+    request = Request(SCOPE, make_receive(size), None)
+    form = await request.form()
+    assert form["file"].size == size // CHUNK_SIZE * CHUNK_SIZE
+    form["file"].close()
+
+
+def main():
+    print(f"{'upload MB':>10} {'MB/s':>8} {'peak KB':>8}")
+    for size in UPLOAD_SIZES:
+        tracemalloc.start()
+        start = time.perf_counter()
+        asyncio.run(parse(size))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        megabytes = size / (1024 * 1024)
+        print(f"{megabytes:>10.0f} {megabytes / elapsed:>8.0f} {peak / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+404 throughput under a flood of random URLs.
+
+Run with ``python -m benchmarks.bench_not_found``. Compares formatting the
+error page into a new response on every 404, as before the pages were
+cached, with serving the pre-rendered page.
+"""
+import asyncio
+import logging
+import secrets
+import time
+from unittest import mock
+
+from inspira import Inspira
+from inspira.enums import HttpMethod
+from inspira.helpers import error_handlers
+from inspira.helpers.error_templates import template
+from inspira.logging import log
+from inspira.responses import HttpResponse
+
+REQUESTS = 20_000
+
+
+def legacy_not_found() -> HttpResponse:
+    msg = template.format(
+        title="Not Found",
+        message="Ooops!!! The page you are looking for is not found",
+        status_code=404,
+    )
+    return HttpResponse(content=msg, status_code=404, content_type="text/html")
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def flood(app, paths):
+    for path in paths:
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+        await app(scope, receive, send)
+
+
+def measure(app, paths) -> float:
+    start = time.perf_counter()
+    asyncio.run(flood(app, paths))
+    return len(paths) / (time.perf_counter() - start)
+
+
+def main():
+    log.setLevel(logging.CRITICAL)
+    app = Inspira(secret_key="benchmark")
+
+    async def handler():
+        return HttpResponse("ok")
+
+    for index in range(50):
+        app.add_route(f"/api/items{index}/{{item_id:int}}", HttpMethod.GET, handler)
+
+    paths = [f"/{secrets.token_hex(8)}/{secrets.token_hex(4)}" for _ in range(REQUESTS)]
+
+    with mock.patch.object(
+        error_handlers, "format_not_found_exception", legacy_not_found
+    ):
+        legacy = measure(app, paths)
+    cached = measure(app, paths)
+
+    print(f"{'pages':>8} {'requests/s':>11}")
+    print(f"{'legacy':>8} {legacy:>11.0f}")
+    print(f"{'cached':>8} {cached:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cost of reading a large request body delivered in many chunks.
+
+Run with ``python -m benchmarks.bench_request_body``. Compares growing the
+body with ``+=`` on every chunk against ``Request.body()``, for a 10 MB body
+in 64 KB chunks.
+"""
+import asyncio
+import time
+
+from inspira.requests import Request
+
+BODY_SIZE = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+ITERATIONS = 5
+
+CHUNK = b"x" * CHUNK_SIZE
+CHUNK_COUNT = BODY_SIZE // CHUNK_SIZE
+
+
+def make_receive():
+    remaining = CHUNK_COUNT
+
+    async def receive():
+        nonlocal remaining
+        remaining -= 1
+        return {"type": "http.request", "body": CHUNK, "more_body": remaining > 0}
+
+    return receive
+
+
+async def concatenate(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def read_body(receive):
+    return await Request({"headers": []}, receive, None).body()
+
+
+def measure(read) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        body = asyncio.run(read(make_receive()))
+        assert len(body) == BODY_SIZE
+    return (time.perf_counter() - start) / ITERATIONS * 1e3
+
+
+def main():
+    print(f"{'strategy':>12} {'msec/body':>10}")
+    print(f"{'concatenate':>12} {measure(concatenate):>10.1f}")
+    print(f"{'body()':>12} {measure(read_body):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Allocations and time spent reading request headers.
+
+Run with ``python -m benchmarks.bench_request_headers``. Each iteration makes
+a request with typical browser headers and reads them the way one request
+does: the CORS origin, the session cookie, and the form content type.
+"""
+import asyncio
+import time
+import tracemalloc
+
+from inspira import Inspira
+from inspira.requests import Request
+from inspira.utils.session_utils import get_session_token_from_request
+
+ITERATIONS = 20_000
+
+SCOPE = {
+    "type": "http",
+    "method": "POST",
+    "path": "/",
+    "headers": [
+        (b"host", b"localhost:8000"),
+        (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0"),
+        (b"accept", b"text/html,application/xhtml+xml,*/*;q=0.8"),
+        (b"accept-language", b"en-US,en;q=0.5"),
+        (b"accept-encoding", b"gzip, deflate, br"),
+        (b"origin", b"http://localhost:3000"),
+        (b"content-type", b"application/x-www-form-urlencoded"),
+        (b"content-length", b"7"),
+        (b"cookie", b"theme=dark; session=abc.def.ghi; csrftoken=xyz"),
+        (b"connection", b"keep-alive"),
+    ],
+}
+
+
+async def receive():
+    return {"type": "http.request", "body": b"a=1&b=2", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def handle_request():
+    request = Request(SCOPE, receive, send)
+    request.get_headers().get("origin")
+    get_session_token_from_request(request, "session")
+    await request.form()
+
+
+async def run():
+    for _ in range(ITERATIONS):
+        await handle_request()
+
+
+def main():
+    Inspira(secret_key="benchmark")
+
+    tracemalloc.start()
+    asyncio.run(handle_request())
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1e6
+
+    print(f"usec/request: {elapsed:.2f}")
+    print(f"peak bytes for one request: {peak}")
+    print(f"live blocks after one request: {blocks}")
+
+
+if __name__ == "__main__":
+    main()
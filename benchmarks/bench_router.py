@@ -0,0 +1,40 @@
+"""
+Route lookup time for growing route tables.
+
+Run with ``python -m benchmarks.bench_router``. The lookup time of the trie
+router should stay flat as the number of routes grows.
+"""
+import timeit
+
+from inspira.router import Router
+
+ROUTE_COUNTS = (10, 100, 1_000, 10_000)
+LOOKUPS = 100_000
+
+
+def handler():
+    pass
+
+
+def build_router(route_count: int) -> Router:
+    router = Router()
+    for index in range(route_count):
+        router.add_route(
+            f"/resource{index}/{{item_id}}/children/{{child_id}}", "GET", handler
+        )
+    return router
+
+
+def main():
+    print(f"{'routes':>8} {'usec/lookup':>12}")
+    for route_count in ROUTE_COUNTS:
+        router = build_router(route_count)
+        path = f"/resource{route_count - 1}/42/children/7"
+        assert router.match("GET", path) is not None
+
+        elapsed = timeit.timeit(lambda: router.match("GET", path), number=LOOKUPS)
+        print(f"{route_count:>8} {elapsed / LOOKUPS * 1e6:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Session cookie encode/decode cost, legacy against cached codec.
+
+Run with ``python -m benchmarks.bench_session_codec``. The legacy path builds
+a new ``URLSafeTimedSerializer`` and round-trips through ``json`` on every
+call, the way sessions were signed before the serializer was cached.
+"""
+import json
+import secrets
+import time
+
+from itsdangerous import URLSafeTimedSerializer
+
+from inspira import Inspira
+from inspira.utils.session_utils import decode_session_data, encode_session_data
+
+SECRET_KEY = "benchmark"
+SESSION_SIZES = (100, 2048, 3584)
+ITERATIONS = 5_000
+
+
+def make_session(size: int):
+    return {"user_id": 1, "cart": secrets.token_hex(size // 2)}
+
+
+def legacy_encode(data):
+    return URLSafeTimedSerializer(SECRET_KEY).dumps(json.dumps(data))
+
+
+def legacy_decode(token):
+    return json.loads(URLSafeTimedSerializer(SECRET_KEY).loads(token))
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    Inspira(secret_key=SECRET_KEY)
+
+    print(
+        f"{'codec':>8} {'size':>6} {'encode usec':>12} "
+        f"{'decode usec':>12} {'bytes':>6}"
+    )
+    for size in SESSION_SIZES:
+        data = make_session(size)
+
+        token = legacy_encode(data)
+        encode = measure(lambda: legacy_encode(data))
+        decode = measure(lambda: legacy_decode(token))
+        print(
+            f"{'legacy':>8} {size:>6} {encode:>12.1f} "
+            f"{decode:>12.1f} {len(token):>6}"
+        )
+
+        token = encode_session_data(data, SECRET_KEY)
+        encode = measure(lambda: encode_session_data(data, SECRET_KEY))
+        decode = measure(lambda: decode_session_data(token, SECRET_KEY))
+        print(
+            f"{'cached':>8} {size:>6} {encode:>12.1f} "
+            f"{decode:>12.1f} {len(token):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-request session cost against session size.
+
+Run with ``python -m benchmarks.bench_sessions``. Each iteration loads and
+saves a session, once signed into the cookie and once through each
+server-side store, and reports the resulting cookie size.
+"""
+import secrets
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from inspira import Inspira
+from inspira.utils.session_stores import (
+    DatabaseSessionStore,
+    FileSessionStore,
+    MemorySessionStore,
+    generate_session_id,
+)
+from inspira.utils.session_utils import decode_session_data, encode_session_data
+
+SECRET_KEY = "benchmark"
+MAX_AGE = 3600
+SESSION_SIZES = (100, 1024, 3584)
+ITERATIONS = 2_000
+
+
+def make_session(size: int):
+    return {"user_id": 1, "cart": secrets.token_hex(size // 2)}
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def bench_cookie(data):
+    token = encode_session_data(data, SECRET_KEY)
+    return measure(lambda: decode_session_data(token, SECRET_KEY)) + measure(
+        lambda: encode_session_data(data, SECRET_KEY)
+    ), len(token)
+
+
+def bench_store(store, data):
+    session_id = generate_session_id()
+    store.save(session_id, data, MAX_AGE)
+    return measure(lambda: store.load(session_id)) + measure(
+        lambda: store.save(session_id, data, MAX_AGE)
+    ), len(session_id)
+
+
+def main():
+    Inspira(secret_key=SECRET_KEY)
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = {
+            "memory": MemorySessionStore(),
+            "file": FileSessionStore(directory),
+            "sqlite": DatabaseSessionStore(create_engine("sqlite://")),
+        }
+
+        print(f"{'backend':>8} {'size':>6} {'usec/request':>13} {'cookie bytes':>13}")
+        for size in SESSION_SIZES:
+            data = make_session(size)
+            elapsed, cookie_size = bench_cookie(data)
+            print(f"{'cookie':>8} {size:>6} {elapsed:>13.1f} {cookie_size:>13}")
+            for name, store in stores.items():
+                elapsed, cookie_size = bench_store(store, data)
+                print(f"{name:>8} {size:>6} {elapsed:>13.1f} {cookie_size:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Requests per second for a small static file.
+
+Run with ``python -m benchmarks.bench_static_files``. Compares the old
+per-request ``isfile``, ``guess_type`` and full read with ``StaticFiles``
+serving the file from its cache, and answering a revalidation with 304.
+"""
+import asyncio
+import mimetypes
+import os
+import tempfile
+import time
+
+from inspira.staticfiles import StaticFiles
+
+REQUESTS = 20_000
+
+
+async def per_request_read(directory, scope, receive, send):
+    # What TemplateResponse.handle_static_file used to do.
+    file_path = os.path.join(directory, scope["path"][len("/static/") :])
+    if os.path.isfile(file_path):
+        content_type, _ = mimetypes.guess_type(file_path)
+        with open(file_path, "rb") as file:
+            body = file.read()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", content_type.encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+
+async def run(app, headers) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/static/css/site.css"}
+    scope["headers"] = headers
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, "css"))
+        with open(os.path.join(directory, "css", "site.css"), "w") as file:
+            file.write("body { margin: 0; }\n" * 200)
+
+        static_files = StaticFiles(directory)
+        etag = None
+
+        async def capture_etag(message):
+            nonlocal etag
+            etag = dict(message.get("headers", {})).get(b"etag", etag)
+
+        asyncio.run(
+            static_files(
+                {"method": "GET", "path": "/static/css/site.css", "headers": []},
+                None,
+                capture_etag,
+            )
+        )
+
+        async def old(scope, receive, send):
+            await per_request_read(directory, scope, receive, send)
+
+        variants = (
+            ("per-request read", old, []),
+            ("StaticFiles", static_files, []),
+            ("StaticFiles 304", static_files, [(b"if-none-match", etag)]),
+        )
+        for name, app, headers in variants:
+            rate = asyncio.run(run(app, headers))
+            print(f"{name:>18}: {rate:>9,.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
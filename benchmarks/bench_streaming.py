@@ -0,0 +1,77 @@
+"""
+Time to first byte and peak memory of a large CSV export.
+
+Run with ``python -m benchmarks.bench_streaming``. Compares building the
+whole export into an ``HttpResponse`` with producing it through a
+``StreamingResponse``. The buffered variant is skipped for the largest
+export, which would need several times its size in memory. The rows are
+coalesced into 64 KB chunks, as a bulk export would be.
+"""
+import asyncio
+import time
+import tracemalloc
+
+from inspira.responses import HttpResponse, StreamingResponse
+
+EXPORT_SIZES_MB = (10, 100, 500)
+BUFFERED_MAX_MB = 100
+ROW = "{},2024-01-01T00:00:00,customer@example.com,19.99,shipped\n"
+ROW_SIZE = len(ROW.format(0))
+
+
+def rows(size_mb: int):
+    for index in range(size_mb * 1024 * 1024 // ROW_SIZE):
+        yield ROW.format(index % 10)
+
+
+async def never_disconnect():
+    await asyncio.Event().wait()
+
+
+async def export(response) -> float:
+    start = time.perf_counter()
+    first_byte = None
+
+    async def send(message):
+        nonlocal first_byte
+        if message["type"] == "http.response.body" and first_byte is None:
+            first_byte = time.perf_counter() - start
+
+    await response({"type": "http"}, never_disconnect, send)
+    return first_byte
+
+
+async def buffered(size_mb: int) -> float:
+    start = time.perf_counter()
+    response = HttpResponse("".join(rows(size_mb)), content_type="text/csv")
+    await export(response)
+    return time.perf_counter() - start
+
+
+async def streamed(size_mb: int) -> float:
+    response = StreamingResponse(
+        rows(size_mb), content_type="text/csv", chunk_size=64 * 1024
+    )
+    return await export(response)
+
+
+def measure(function, size_mb: int):
+    tracemalloc.start()
+    first_byte = asyncio.run(function(size_mb))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte * 1e3, peak / (1024 * 1024)
+
+
+def main():
+    print(f"{'response':>10} {'export MB':>10} {'TTFB ms':>9} {'peak MB':>8}")
+    for size_mb in EXPORT_SIZES_MB:
+        if size_mb <= BUFFERED_MAX_MB:
+            ttfb, peak = measure(buffered, size_mb)
+            print(f"{'buffered':>10} {size_mb:>10} {ttfb:>9.1f} {peak:>8.1f}")
+        ttfb, peak = measure(streamed, size_mb)
+        print(f"{'streaming':>10} {size_mb:>10} {ttfb:>9.1f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
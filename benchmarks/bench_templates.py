@@ -0,0 +1,98 @@
+"""
+Render throughput of a template with inheritance and includes.
+
+Run with ``python -m benchmarks.bench_templates``. Compares creating a new
+Jinja2 ``Environment`` for every render, as ``TemplateResponse`` used to,
+with and without an on-disk bytecode cache, against the environment shared
+through ``Templates``.
+"""
+import os
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from inspira.templating import Templates
+
+RENDERS = 2_000
+
+TEMPLATES = {
+    "base.html": (
+        "<html><head><title>{% block title %}{% endblock %}</title></head>"
+        "<body>{% include 'nav.html' %}{% block content %}{% endblock %}"
+        "{% include 'footer.html' %}</body></html>"
+    ),
+    "nav.html": (
+        "<nav>{% for link in links %}"
+        "<a href='{{ link.url }}'>{{ link.title | title }}</a>"
+        "{% endfor %}</nav>"
+    ),
+    "footer.html": "<footer>{{ year }} {{ company | upper }}</footer>",
+    "page.html": (
+        "{% extends 'base.html' %}{% block title %}{{ title }}{% endblock %}"
+        "{% block content %}<ul>{% for item in items %}"
+        "<li>{{ loop.index }}. {{ item.name }} {{ '%.2f' | format(item.price) }}"
+        "</li>{% endfor %}</ul>{% endblock %}"
+    ),
+}
+
+CONTEXT = {
+    "title": "Orders",
+    "links": [{"url": f"/{name}", "title": name} for name in ("home", "orders")],
+    "year": 2024,
+    "company": "inspira",
+    "items": [{"name": f"item {index}", "price": index * 1.5} for index in range(20)],
+}
+
+
+def per_render(template_dir):
+    environment = Environment(loader=FileSystemLoader(template_dir))
+    return environment.get_template("page.html").render(**CONTEXT)
+
+
+def per_render_with_bytecode_cache(template_dir, bytecode_cache):
+    environment = Environment(
+        loader=FileSystemLoader(template_dir), bytecode_cache=bytecode_cache
+    )
+    return environment.get_template("page.html").render(**CONTEXT)
+
+
+def measure(render) -> float:
+    render()
+    start = time.perf_counter()
+    for _ in range(RENDERS):
+        render()
+    return RENDERS / (time.perf_counter() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as template_dir:
+        for name, source in TEMPLATES.items():
+            with open(os.path.join(template_dir, name), "w") as file:
+                file.write(source)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+            templates = Templates(bytecode_cache_dir=cache_dir)
+
+            variants = (
+                ("new Environment", lambda: per_render(template_dir)),
+                (
+                    "new Environment + bytecode",
+                    lambda: per_render_with_bytecode_cache(
+                        template_dir, bytecode_cache
+                    ),
+                ),
+                (
+                    "shared Environment",
+                    lambda: templates.get_environment(template_dir)
+                    .get_template("page.html")
+                    .render(**CONTEXT),
+                ),
+            )
+            for name, render in variants:
+                print(f"{name:>26}: {measure(render):>9,.0f} renders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from inspira.constants import STATIC_DIST_DIRECTORY, STATIC_MANIFEST_FILE
+from inspira.responses import guess_content_type
+from inspira.staticfiles import load_manifest
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+HASH_LENGTH = 12
+
+# Types that are worth compressing; images, fonts and archives already are.
+COMPRESSIBLE_TYPES = frozenset(
+    (
+        "application/javascript",
+        "application/json",
+        "application/manifest+json",
+        "application/wasm",
+        "application/xml",
+        "image/svg+xml",
+        "image/x-icon",
+        "image/vnd.microsoft.icon",
+    )
+)
+
+
+def is_compressible(name: str) -> bool:
+    content_type = guess_content_type(name)
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+def fingerprint(name: str, content_hash: str) -> str:
+    root, extension = os.path.splitext(name)
+    return f"{root}.{content_hash}{extension}"
+
+
+def compressed_variants(data: bytes, with_brotli: bool) -> List[Tuple[str, bytes]]:
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if with_brotli:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    # A variant that does not save anything would only waste a lookup.
+    return [(suffix, body) for suffix, body in variants if len(body) < len(data)]
+
+
+def write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+def build_file(
+    source_dir: str,
+    dist_dir: str,
+    name: str,
+    previous: Optional[str],
+    with_brotli: bool,
+    force: bool = False,
+) -> Tuple[str, str, bool]:
+    """
+    Fingerprint one file and write it with its compressed variants.
+
+    Returns the name, the fingerprinted name and whether anything was
+    written. Runs in a worker process.
+    """
+    with open(os.path.join(source_dir, name), "rb") as file:
+        data = file.read()
+
+    content_hash = hashlib.blake2b(data, digest_size=HASH_LENGTH // 2).hexdigest()
+    hashed_name = fingerprint(name, content_hash)
+    output_path = os.path.join(dist_dir, hashed_name)
+    if not force and previous == hashed_name and os.path.exists(output_path):
+        return name, hashed_name, False
+
+    write_file(output_path, data)
+    if is_compressible(name):
+        for suffix, body in compressed_variants(data, with_brotli):
+            write_file(output_path + suffix, body)
+    return name, hashed_name, True
+
+
+def find_static_files(source_dir: str) -> List[str]:
+    names = []
+    for root, directories, files in os.walk(source_dir):
+        if os.path.samefile(root, source_dir):
+            # The build output is not an input.
+            if STATIC_DIST_DIRECTORY in directories:
+                directories.remove(STATIC_DIST_DIRECTORY)
+        for file_name in files:
+            # Compressed files are skipped, the build creates its own.
+            if file_name.startswith(".") or file_name.endswith((".gz", ".br")):
+                continue
+            path = os.path.relpath(os.path.join(root, file_name), source_dir)
+            names.append(path.replace(os.sep, "/"))
+    return sorted(names)
+
+
+def build_static_files(
+    source_dir: str = "static",
+    workers: Optional[int] = None,
+    clean: bool = False,
+    force: bool = False,
+) -> Tuple[List[str], List[str]]:
+    """
+    Build the fingerprinted copies of the files in ``source_dir``.
+
+    Every file is copied to ``<source_dir>/dist`` under a name containing a
+    hash of its content, together with gzip and, when the ``brotli`` package
+    is installed, Brotli variants of text files. Files are processed in
+    parallel on ``workers`` processes, one per core by default. The mapping
+    from the original names to the fingerprinted ones is written to
+    ``<source_dir>/dist/manifest.json``. Files whose hash is unchanged since
+    the previous build are skipped unless ``force`` is set. With ``clean``,
+    outputs no longer in the manifest are removed.
+
+    Returns the names that were built and the names that were unchanged.
+    """
+    dist_dir = os.path.join(source_dir, STATIC_DIST_DIRECTORY)
+    manifest_path = os.path.join(dist_dir, STATIC_MANIFEST_FILE)
+    previous_manifest = load_manifest(manifest_path)
+    names = find_static_files(source_dir)
+    with_brotli = brotli is not None
+
+    jobs = [
+        (source_dir, dist_dir, name, previous_manifest.get(name), with_brotli, force)
+        for name in names
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(build_file, *zip(*jobs)))
+    else:
+        results = [build_file(*job) for job in jobs]
+
+    manifest = {name: hashed_name for name, hashed_name, _ in results}
+    built = [name for name, _, written in results if written]
+    unchanged = [name for name, _, written in results if not written]
+
+    if clean:
+        remove_stale_files(dist_dir, manifest)
+
+    os.makedirs(dist_dir, exist_ok=True)
+    write_file(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return built, unchanged
+
+
+def remove_stale_files(dist_dir: str, manifest: Dict[str, str]) -> None:
+    current = set()
+    for hashed_name in manifest.values():
+        current.update((hashed_name, hashed_name + ".gz", hashed_name + ".br"))
+    current.add(STATIC_MANIFEST_FILE)
+
+    for root, _, files in os.walk(dist_dir):
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            name = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+            if name not in current:
+                os.remove(path)
@@ -1,5 +1,8 @@
+import os
+
 import click
 
+from inspira.cli.build_static import brotli, build_static_files
 from inspira.cli.create_app import generate_project
 from inspira.cli.create_controller import create_controller_file
 from inspira.cli.generate_database_file import create_database_file
@@ -126,6 +129,36 @@ def migrate(down):
         click.echo("Migration failed. Check logs for more details.")
 
 
+@cli.group()
+def static():
+    """
+    Manage static assets.
+    """
+
+
+@static.command()
+@click.option("--source", default="static", help="Directory of the static files.")
+@click.option("--workers", type=int, default=None, help="Number of processes.")
+@click.option("--clean", is_flag=True, help="Remove outdated build outputs.")
+@click.option("--force", is_flag=True, help="Rebuild unchanged files as well.")
+def build(source, workers, clean, force):
+    """
+    Fingerprint and precompress the static files.
+
+    The files are written to the dist directory inside the source directory,
+    with a manifest.json mapping the original names to the fingerprinted
+    ones, which the static_url template function uses.
+    """
+    if not os.path.isdir(source):
+        click.echo(f"Static directory '{source}' does not exist.")
+        return
+
+    built, unchanged = build_static_files(source, workers, clean, force)
+    click.echo(f"Built {len(built)} files, {len(unchanged)} unchanged.")
+    if brotli is None:
+        click.echo("Install the brotli package to also create .br files.")
+
+
 @cli.command()
 @click.option("--only-controller",  "only_controller", is_flag=True, required=False, help="Generates only controller module")
 def init(only_controller):
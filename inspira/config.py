@@ -14,6 +14,20 @@ class Config:
             "SESSION_COOKIE_SAMESITE": None,
             "TOKEN_EXPIRATION_TIME": 3600,
             "SECRET_KEY": "change_me",
+            "ROUTE_CACHE_SIZE": 1024,
+            "MAX_BODY_SIZE": None,
+            "MULTIPART_SPOOL_MAX_SIZE": 1024 * 1024,
+            "MULTIPART_MAX_FIELD_SIZE": 1024 * 1024,
+            "JSON_CODEC": "auto",
+            "STATIC_URL": "/static",
+            "STATIC_DIR": "static",
+            "STATIC_MAX_AGE": None,
+            "STATIC_CACHE_SIZE": 256,
+            "STATIC_CACHE_MAX_FILE_SIZE": 64 * 1024,
+            "STATIC_AUTO_RELOAD": False,
+            "TEMPLATE_AUTO_RELOAD": False,
+            "TEMPLATE_BYTECODE_CACHE": True,
+            "TEMPLATE_BYTECODE_CACHE_DIR": None,
         }
 
     def __getitem__(self, key):
@@ -1,6 +1,7 @@
 UTF8 = "utf-8"
 
 APPLICATION_JSON = "application/json"
+APPLICATION_OCTET_STREAM = "application/octet-stream"
 TEXT_PLAIN = "text/plain"
 TEXT_HTML = "text/html"
 
@@ -16,3 +17,5 @@ WEBSOCKET_TYPE = "websocket"
 SRC_DIRECTORY = "src"
 MIGRATION_DIRECTORY = "migrations"
 INIT_DOT_PY = "__init__.py"
+STATIC_DIST_DIRECTORY = "dist"
+STATIC_MANIFEST_FILE = "manifest.json"
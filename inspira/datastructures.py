@@ -0,0 +1,183 @@
+import urllib.parse
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from inspira.constants import UTF8
+
+T = TypeVar("T")
+
+TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+FALSE_VALUES = frozenset(("0", "false", "no", "off", ""))
+
+RawHeaders = Iterable[Tuple[bytes, bytes]]
+
+
+class Headers(Mapping[str, str]):
+    """
+    Immutable, case-insensitive view of the raw ASGI request headers.
+
+    Header names are indexed on first access and a value is only decoded the
+    first time it is read. Repeated headers are all kept; indexing returns
+    the first value and ``getlist`` returns every value.
+    """
+
+    __slots__ = ("raw", "_index", "_decoded")
+
+    def __init__(self, raw: Optional[RawHeaders] = None):
+        self.raw = raw if raw is not None else []
+        self._index: Optional[Dict[bytes, List[bytes]]] = None
+        self._decoded: Dict[bytes, List[str]] = {}
+
+    def _get_index(self) -> Dict[bytes, List[bytes]]:
+        if self._index is None:
+            index: Dict[bytes, List[bytes]] = {}
+            for key, value in self.raw:
+                index.setdefault(key.lower(), []).append(value)
+            self._index = index
+        return self._index
+
+    def getlist(self, key: str) -> List[str]:
+        name = key.lower().encode(UTF8)
+        values = self._decoded.get(name)
+        if values is None:
+            raw_values = self._get_index().get(name)
+            if raw_values is None:
+                return []
+            values = [value.decode(UTF8) for value in raw_values]
+            self._decoded[name] = values
+        return list(values)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        values = self._decoded.get(key.lower().encode(UTF8))
+        if values is not None:
+            return values[0]
+
+        values = self.getlist(key)
+        return values[0] if values else default
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        return key.lower().encode(UTF8) in self._get_index()
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.decode(UTF8) for key in self._get_index())
+
+    def __len__(self) -> int:
+        return len(self._get_index())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class QueryParams(Mapping[str, str]):
+    """
+    Immutable multidict of the parameters in a query string.
+
+    Indexing returns the first value of a parameter and ``getlist`` returns
+    every value. The typed getters return the default when the parameter is
+    missing or cannot be converted.
+    """
+
+    __slots__ = ("_dict",)
+
+    def __init__(self, query_string: Any = b""):
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode("latin-1")
+
+        values: Dict[str, List[str]] = {}
+        if query_string:
+            for key, value in urllib.parse.parse_qsl(
+                query_string, keep_blank_values=True
+            ):
+                values.setdefault(key, []).append(value)
+        self._dict = values
+
+    def getlist(self, key: str) -> List[str]:
+        return list(self._dict.get(key, ()))
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        values = self._dict.get(key)
+        return values[0] if values else default
+
+    def get_typed(
+        self, key: str, converter: Callable[[str], T], default: Optional[T] = None
+    ) -> Optional[T]:
+        value = self.get(key)
+        if value is None:
+            return default
+        try:
+            return converter(value)
+        except ValueError:
+            return default
+
+    def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return self.get_typed(key, int, default)
+
+    def get_float(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        return self.get_typed(key, float, default)
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        return self.get_typed(key, parse_bool, default)
+
+    def __getitem__(self, key: str) -> str:
+        return self._dict[key][0]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._dict
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dict)
+
+    def __len__(self) -> int:
+        return len(self._dict)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._dict!r})"
+
+
+def parse_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+
+def parse_cookie_header(cookie_header: str) -> Dict[str, str]:
+    """
+    Parse a ``Cookie`` header into a dict.
+
+    Malformed pairs are skipped instead of discarding the whole header, and
+    the first occurrence of a repeated name wins, as browsers send the most
+    specific cookie first.
+    """
+    cookies: Dict[str, str] = {}
+    for cookie in cookie_header.split(";"):
+        name, separator, value = cookie.partition("=")
+        name = name.strip()
+        if not separator or not name or name in cookies:
+            continue
+
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        cookies[name] = value
+    return cookies
@@ -0,0 +1,12 @@
+from typing import Any, Callable, Iterable, Type
+
+
+def middleware(
+    *middlewares: Callable, exclude: Iterable[Any] = ()
+) -> Callable[[Type], Type]:
+    def decorator(handler: Type) -> Type:
+        handler.__middleware__ = list(middlewares)
+        handler.__exclude_middleware__ = list(exclude)
+        return handler
+
+    return decorator
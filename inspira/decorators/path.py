@@ -1,10 +1,16 @@
-from typing import Callable, Type
+from typing import Any, Callable, List, Type
 
 
-def path(path: str) -> Callable[[Type], Type]:
+def path(
+    path: str,
+    middleware: List[Callable] = None,
+    exclude_middleware: List[Any] = None,
+) -> Callable[[Type], Type]:
     def decorator(cls: Type) -> Type:
         cls.__path__ = path
         cls.__is_controller__ = True
+        cls.__middleware__ = list(middleware or [])
+        cls.__exclude_middleware__ = list(exclude_middleware or [])
         return cls
 
     return decorator
@@ -8,6 +8,7 @@ class HttpMethod(Enum):
     PUT = "PUT"
     PATCH = "PATCH"
     OPTIONS = "OPTIONS"
+    HEAD = "HEAD"
 
 
 SQLALCHEMY_TYPE_MAPPING = {
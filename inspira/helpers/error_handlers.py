@@ -1,19 +1,31 @@
 import logging
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 from inspira.helpers.error_templates import (
+    format_bad_request_exception,
     format_forbidden_exception,
     format_internal_server_error,
     format_method_not_allowed_exception,
     format_not_found_exception,
+    format_request_entity_too_large_exception,
     format_unauthorized_exception,
 )
 
 
-async def handle_method_not_allowed(
+async def handle_bad_request(
     scope: Dict[str, Any], receive: Callable, send: Callable
 ) -> None:
-    method_not_allowed_response = format_method_not_allowed_exception()
+    bad_request_response = format_bad_request_exception()
+    await bad_request_response(scope, receive, send)
+
+
+async def handle_method_not_allowed(
+    scope: Dict[str, Any],
+    receive: Callable,
+    send: Callable,
+    allow: Optional[str] = None,
+) -> None:
+    method_not_allowed_response = format_method_not_allowed_exception(allow)
     await method_not_allowed_response(scope, receive, send)
 
 
@@ -38,6 +50,13 @@ async def handle_unauthorized(
     await unauthorized_response(scope, receive, send)
 
 
+async def handle_request_entity_too_large(
+    scope: Dict[str, Any], receive: Callable, send: Callable
+) -> None:
+    request_entity_too_large_response = format_request_entity_too_large_exception()
+    await request_entity_too_large_response(scope, receive, send)
+
+
 async def handle_internal_server_error(
     scope: Dict[str, Any], receive: Callable, send: Callable
 ) -> None:
@@ -1,3 +1,6 @@
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+
 from inspira.constants import TEXT_HTML
 from inspira.responses import HttpResponse
 
@@ -51,48 +54,119 @@ h1, a{{
 """
 
 
-def format_internal_server_error() -> HttpResponse:
-    msg = template.format(
-        title="Internal Server Error",
-        message="Internal Server Error"
-        "<br><br>We are currently trying to fix the problem.",
-        status_code=500,
+ERROR_PAGES: Dict[int, Tuple[str, str]] = {
+    HTTPStatus.BAD_REQUEST: (
+        "Bad Request",
+        "Bad Request<br><br>The request could not be understood by the server.",
+    ),
+    HTTPStatus.UNAUTHORIZED: ("Unauthorized", "Unauthorized"),
+    HTTPStatus.FORBIDDEN: ("Forbidden", "Forbidden"),
+    HTTPStatus.NOT_FOUND: (
+        "Not Found",
+        "Ooops!!! The page you are looking for is not found",
+    ),
+    HTTPStatus.METHOD_NOT_ALLOWED: (
+        "Method Not Allowed",
+        "Method Not Allowed<br><br>The method is not allowed for the requested URL.",
+    ),
+    HTTPStatus.REQUEST_ENTITY_TOO_LARGE: (
+        "Request Entity Too Large",
+        "Request Entity Too Large<br><br>The request body exceeds the allowed size.",
+    ),
+    HTTPStatus.INTERNAL_SERVER_ERROR: (
+        "Internal Server Error",
+        "Internal Server Error<br><br>We are currently trying to fix the problem.",
+    ),
+}
+
+# Templates set with set_error_template, keyed by status code; None applies
+# to every status without a template of its own.
+error_templates: Dict[Optional[int], str] = {}
+
+# Rendered, frozen error responses keyed by status code and Allow header.
+error_responses: Dict[Tuple[int, Optional[str]], HttpResponse] = {}
+
+
+def set_error_template(error_template: str, status_code: Optional[int] = None):
+    """
+    Replace the HTML of the error pages, for every status or for one.
+
+    The template uses the ``{title}``, ``{message}`` and ``{status_code}``
+    placeholders. Pages are rendered once, the first time they are needed,
+    and reused for every following error.
+    """
+    # Fail on unknown placeholders now rather than on the first error.
+    error_template.format(title="", message="", status_code=0)
+    error_templates[status_code] = error_template
+    error_responses.clear()
+    prerender_error_pages()
+
+
+def reset_error_templates() -> None:
+    error_templates.clear()
+    error_responses.clear()
+    prerender_error_pages()
+
+
+def get_error_response(status_code: int, allow: Optional[str] = None) -> HttpResponse:
+    """Return the cached error page for the status, rendering it if needed."""
+    key = (status_code, allow)
+    response = error_responses.get(key)
+    if response is None:
+        response = render_error_response(status_code, allow)
+        error_responses[key] = response
+    return response
+
+
+def render_error_response(
+    status_code: int, allow: Optional[str] = None
+) -> HttpResponse:
+    title, message = ERROR_PAGES[status_code]
+    error_template = error_templates.get(
+        status_code, error_templates.get(None, template)
+    )
+    msg = error_template.format(
+        title=title, message=message, status_code=int(status_code)
     )
-    return HttpResponse(content=msg, status_code=500, content_type=TEXT_HTML)
+    headers = {"Allow": allow} if allow else None
+    response = HttpResponse(
+        content=msg, status_code=status_code, content_type=TEXT_HTML, headers=headers
+    )
+    return response.freeze()
+
+
+def format_bad_request_exception() -> HttpResponse:
+    return get_error_response(HTTPStatus.BAD_REQUEST)
+
+
+def format_internal_server_error() -> HttpResponse:
+    return get_error_response(HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
 def format_not_found_exception() -> HttpResponse:
-    msg = template.format(
-        title="Not Found",
-        message="Ooops!!! The page you are looking for is not found",
-        status_code=404,
-    )
-    return HttpResponse(content=msg, status_code=404, content_type=TEXT_HTML)
+    return get_error_response(HTTPStatus.NOT_FOUND)
 
 
 def format_forbidden_exception() -> HttpResponse:
-    msg = template.format(
-        title="Forbidden",
-        message="Forbidden",
-        status_code=403,
-    )
-    return HttpResponse(content=msg, status_code=403, content_type=TEXT_HTML)
+    return get_error_response(HTTPStatus.FORBIDDEN)
 
 
 def format_unauthorized_exception() -> HttpResponse:
-    msg = template.format(
-        title="Unauthorized",
-        message="Unauthorized",
-        status_code=401,
-    )
-    return HttpResponse(content=msg, status_code=401, content_type=TEXT_HTML)
+    return get_error_response(HTTPStatus.UNAUTHORIZED)
 
 
-def format_method_not_allowed_exception() -> HttpResponse:
-    msg = template.format(
-        title="Method Not Allowed",
-        message="Method Not Allowed"
-        "<br><br>The method is not allowed for the requested URL.",
-        status_code=405,
-    )
-    return HttpResponse(content=msg, status_code=405, content_type=TEXT_HTML)
+def format_method_not_allowed_exception(allow: Optional[str] = None) -> HttpResponse:
+    return get_error_response(HTTPStatus.METHOD_NOT_ALLOWED, allow)
+
+
+def format_request_entity_too_large_exception() -> HttpResponse:
+    return get_error_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+
+def prerender_error_pages() -> None:
+    for status_code in ERROR_PAGES:
+        get_error_response(status_code)
+
+
+# Render the standard pages at import, before the first request needs them.
+prerender_error_pages()
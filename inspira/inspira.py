@@ -1,9 +1,9 @@
 import importlib
 import inspect
 import os
-import re
 import sys
-from typing import Any, Callable, Dict, List
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional
 
 from inspira.config import Config
 from inspira.constants import SRC_DIRECTORY
@@ -11,16 +11,30 @@ from inspira.enums import HttpMethod
 from inspira.globals import set_global_app
 from inspira.helpers.error_handlers import (
     default_error_handler,
+    handle_bad_request,
     handle_method_not_allowed,
     handle_not_found,
+    handle_request_entity_too_large,
 )
-from inspira.helpers.static_file_handler import handle_static_files
 from inspira.logging import log
-from inspira.requests import Request, RequestContext
+from inspira.requests import (
+    ClientDisconnect,
+    Request,
+    RequestBodyConsumed,
+    RequestContext,
+    RequestEntityTooLarge,
+)
+from inspira.responses import HttpResponse
+from inspira.router import Route, Router, RouteResolution
+from inspira.staticfiles import StaticFiles
+from inspira.templating import Templates
 from inspira.utils.controller_parser import parse_controller_decorators
 from inspira.utils.dependency_resolver import resolve_dependencies_automatic
-from inspira.utils.handler_invoker import invoke_handler
-from inspira.utils.session_utils import get_or_create_session
+from inspira.utils.handler_invoker import InvocationPlan, invoke_handler
+from inspira.utils.lru_cache import LRUCache
+from inspira.utils.multipart import MultipartError
+from inspira.utils.param_converter import InvalidParameter
+from inspira.utils.session_utils import preload_session
 from inspira.websockets import handle_websocket
 
 
@@ -35,21 +49,112 @@ class Inspira:
         self.routes: Dict[str, Dict[str, Callable]] = {
             method.value: {} for method in HttpMethod
         }
+        self.router = Router()
+        self.route_cache = LRUCache(self.config["ROUTE_CACHE_SIZE"] or 0)
         self.error_handler = default_error_handler
         self.middleware: List[Callable] = []
+        self.middleware_chain: Optional[Callable] = None
+        self.route_middleware_chains: Dict[Route, Callable] = {}
+        self.session_store = None
+        self.static_files = self.create_static_files()
+        self.templates = self.create_templates()
         self.discover_controllers()
 
+    def create_static_files(self) -> StaticFiles:
+        """Index the ``STATIC_DIR`` directory, served under ``STATIC_URL``."""
+        return StaticFiles(
+            self.config["STATIC_DIR"] or "static",
+            self.config["STATIC_URL"] or "/static",
+            cache_size=self.config["STATIC_CACHE_SIZE"] or 0,
+            cache_max_file_size=self.config["STATIC_CACHE_MAX_FILE_SIZE"] or 0,
+            max_age=self.config["STATIC_MAX_AGE"],
+            auto_reload=bool(self.config["STATIC_AUTO_RELOAD"]),
+        )
+
+    def create_templates(self) -> Templates:
+        """
+        Create the Jinja2 environments shared by every ``TemplateResponse``.
+
+        ``static_url`` is available in every template.
+        """
+        templates = Templates(
+            auto_reload=bool(self.config["TEMPLATE_AUTO_RELOAD"]),
+            bytecode_cache=bool(self.config["TEMPLATE_BYTECODE_CACHE"]),
+            bytecode_cache_dir=self.config["TEMPLATE_BYTECODE_CACHE_DIR"],
+        )
+        templates.add_global("static_url", self.static_files.url_for)
+        return templates
+
+    def add_template_filter(
+        self, function: Callable, name: Optional[str] = None
+    ) -> Callable:
+        """Make a function available as a filter in every template."""
+        return self.templates.add_filter(name or function.__name__, function)
+
+    def add_template_global(self, value: Any, name: Optional[str] = None) -> Any:
+        """Make a value or function available as a global in every template."""
+        return self.templates.add_global(name or value.__name__, value)
+
     def add_middleware(self, middleware: Callable) -> Callable:
+        """
+        Register a middleware.
+
+        A middleware is a callable that receives the next ASGI application and
+        returns a new ASGI application ``(scope, receive, send)``. It may be an
+        ``async def __call__(self, handler)`` that returns a closure, or simply
+        a class whose constructor takes the next application. The returned
+        application can answer the request itself, without calling the next
+        one, to short-circuit the chain.
+
+        The chain is composed once, on the first request after the middleware
+        list changes, and reused for every following request. Routes can add
+        their own middlewares or exclude global ones, see ``add_route``.
+        """
         self.middleware.append(middleware)
+        self.middleware_chain = None
+        self.route_middleware_chains.clear()
         return middleware
 
-    def add_route(self, path: str, method: HttpMethod, handler: Callable) -> None:
+    def add_route(
+        self,
+        path: str,
+        method: HttpMethod,
+        handler: Callable,
+        middleware: List[Callable] = None,
+        exclude_middleware: List[Any] = None,
+        max_body_size: Optional[int] = None,
+    ) -> None:
+        """
+        Register a handler for the path and method.
+
+        ``middleware`` runs for this route only, inside the global middlewares.
+        ``exclude_middleware`` lists global middlewares, as instances or
+        classes, that are skipped for this route. Both are extended with the
+        values set on the handler by the ``middleware`` decorator.
+
+        ``max_body_size`` overrides the ``MAX_BODY_SIZE`` config for this
+        route; it defaults to the value given to the HTTP method decorator.
+        """
         if path in self.routes[method.value]:
             raise AssertionError(
                 f"Route with method '{method}' and path '{path}' already exists"
             )
 
         self.routes[method.value][path] = handler
+        self.router.add_route(
+            path,
+            method.value,
+            handler,
+            list(middleware or []) + getattr(handler, "__middleware__", []),
+            list(exclude_middleware or [])
+            + getattr(handler, "__exclude_middleware__", []),
+            (
+                max_body_size
+                if max_body_size is not None
+                else getattr(handler, "__max_body_size__", None)
+            ),
+        )
+        self.route_cache.clear()
 
     def discover_controllers(self) -> None:
         current_dir = os.getcwd()
@@ -100,7 +205,13 @@ class Inspira:
                 http_method = getattr(method, "__method__")
                 route = getattr(method, "__path__")
                 full_route = path_prefix + route
-                self.add_route(full_route, http_method, method)
+                self.add_route(
+                    full_route,
+                    http_method,
+                    method,
+                    getattr(cls, "__middleware__", []),
+                    getattr(cls, "__exclude_middleware__", []),
+                )
 
     def _file_path_to_module(self, file_path: str) -> str:
         rel_path = os.path.relpath(file_path, os.getcwd())
@@ -123,70 +234,111 @@ class Inspira:
         self, scope: Dict[str, Any], receive: Callable, send: Callable
     ) -> None:
         request = RequestContext.get_request()
-        await self.set_request_session(request)
 
         method = scope["method"]
         path = scope["path"]
 
-        if path.startswith("/static"):
-            await handle_static_files(scope, receive, send, request)
-        elif path in self.routes[method]:
-            await self.handle_route(method, path, receive, request, scope, send)
+        if self.is_static_path(path):
+            await self.static_files(scope, receive, send)
+            return
+
+        # A middleware may have rewritten the path since the route was
+        # resolved to select the middleware chain.
+        key, resolution = scope.get("route_resolution", (None, None))
+        if key != (method, path):
+            resolution = self.resolve_route(method, path)
+
+        if resolution.status is HTTPStatus.OK:
+            if method == HttpMethod.HEAD.value and resolution.route.method != method:
+                send = self.without_body(send)
+            await self.handle_route(
+                resolution.route, resolution.params, request, scope, receive, send
+            )
+        elif resolution.status is HTTPStatus.NOT_FOUND:
+            await handle_not_found(scope, receive, send)
+        elif resolution.status is HTTPStatus.METHOD_NOT_ALLOWED:
+            await handle_method_not_allowed(
+                scope, receive, send, resolution.allow_header
+            )
         else:
-            # Check if the route is present but with a different method
-            if any(path in methods for methods in self.routes.values()):
-                await handle_method_not_allowed(scope, receive, send)
-            else:
-                await self.handle_dynamic_route(
-                    method, path, request, scope, receive, send
-                )
+            options_response = HttpResponse(
+                status_code=HTTPStatus.NO_CONTENT,
+                headers={"Allow": resolution.allow_header},
+            )
+            await options_response(scope, receive, send)
 
-    async def handle_dynamic_route(
-        self,
-        method: str,
-        path: str,
-        request: Request,
-        scope: Dict[str, Any],
-        receive: Callable,
-        send: Callable,
-    ):
-        for route_path, handler in self.routes[method].items():
-            if "{" in route_path and "}" in route_path:
-                route_pattern = route_path.replace("{", "(?P<").replace("}", ">[^/]+)")
-                match = re.fullmatch(route_pattern, path)
-                if match:
-                    try:
-                        params = match.groupdict()
-                        response = await invoke_handler(handler, request, scope, params)
-                        await response(scope, receive, send)
-                        return
-                    except Exception as exc:
-                        error_response = await self.error_handler(exc)
-                        await error_response(scope, receive, send)
-        # If no matching route is found, return a 404 response
-        await handle_not_found(scope, receive, send)
+    def resolve_route(self, method: str, path: str) -> RouteResolution:
+        """
+        Resolve a request through a bounded LRU cache keyed by method and path.
+
+        Negative results (404 and 405) are cached as well. The cache is
+        cleared whenever a route is added.
+        """
+        key = (method, path)
+        resolution = self.route_cache.get(key)
+        if resolution is None:
+            resolution = self.router.resolve(method, path)
+            self.route_cache.set(key, resolution)
+        return resolution
+
+    def is_static_path(self, path: str) -> bool:
+        return self.static_files.is_static_path(path)
+
+    @staticmethod
+    def without_body(send: Callable) -> Callable:
+        async def send_wrapper(message):
+            if message["type"] == "http.response.body":
+                message = {**message, "body": b""}
+            await send(message)
+
+        return send_wrapper
 
     async def handle_route(
         self,
-        method: str,
-        path: str,
-        receive: Callable,
+        route: Route,
+        params: Dict[str, Any],
         request: Request,
         scope: Dict[str, Any],
+        receive: Callable,
         send: Callable,
     ):
+        if route.max_body_size is not None:
+            request.max_body_size = route.max_body_size
+        if request.exceeds_max_body_size():
+            await handle_request_entity_too_large(scope, receive, send)
+            return
+
         try:
-            handler = self.get_handler(method, path)
-            response = await self.invoke_handler(handler, request, scope)
+            response = await self.invoke_handler(
+                route.handler, request, scope, params, route.plan
+            )
             await response(scope, receive, send)
+        except RequestEntityTooLarge:
+            await handle_request_entity_too_large(scope, receive, send)
+        except (InvalidParameter, MultipartError) as exc:
+            log.info(f"Bad request: {exc}")
+            await handle_bad_request(scope, receive, send)
+        except RequestBodyConsumed as exc:
+            log.error(f"{exc}; read the body before streaming it or parsing a form")
+            await handle_bad_request(scope, receive, send)
+        except ClientDisconnect:
+            # Nobody is left to receive a response.
+            log.info("Client disconnected before the request body was received")
         except Exception as exc:
             await self.handle_error(exc, scope, receive, send)
 
     def get_handler(self, method: str, path: str):
         return self.routes[method][path]
 
-    async def invoke_handler(self, handler, request: Request, scope: Dict[str, Any]):
-        return await invoke_handler(handler, request, scope)
+    async def invoke_handler(
+        self,
+        handler,
+        request: Request,
+        scope: Dict[str, Any],
+        params=None,
+        plan: InvocationPlan = None,
+    ):
+        return await invoke_handler(handler, request, scope, params, plan)
 
     async def handle_error(self, exc, scope, receive, send):
         error_response = await self.error_handler(exc)
@@ -197,17 +349,67 @@ class Inspira:
     ):
         request = await self.create_request(receive, scope, send)
         RequestContext.set_request(request)
+        RequestContext.set_current_user(None)
+        if self.session_store is not None:
+            await preload_session(request)
 
-        for middleware in reversed(self.middleware):
-            handler = await middleware(handler)
-        response = await handler(scope, receive, send)
+        chain = await self.get_middleware_chain(scope, handler)
+        try:
+            response = await chain(scope, receive, send)
+        except RequestEntityTooLarge:
+            # Raised when a middleware reads a body over the global limit.
+            await handle_request_entity_too_large(scope, receive, send)
+            return None
+        except MultipartError as exc:
+            log.info(f"Malformed multipart body: {exc}")
+            await handle_bad_request(scope, receive, send)
+            return None
+        except RequestBodyConsumed as exc:
+            log.error(f"{exc}; read the body before streaming it or parsing a form")
+            await handle_bad_request(scope, receive, send)
+            return None
+        except ClientDisconnect:
+            log.info("Client disconnected before the request body was received")
+            return None
         return response
 
+    async def get_middleware_chain(
+        self, scope: Dict[str, Any], handler: Callable
+    ) -> Callable:
+        route = None
+        if not self.is_static_path(scope["path"]):
+            key = (scope["method"], scope["path"])
+            resolution = self.resolve_route(*key)
+            scope["route_resolution"] = (key, resolution)
+            route = resolution.route
+
+        if route is None or not (route.middleware or route.exclude_middleware):
+            if self.middleware_chain is None:
+                self.middleware_chain = await self.build_middleware_chain(
+                    handler, self.middleware
+                )
+            return self.middleware_chain
+
+        chain = self.route_middleware_chains.get(route)
+        if chain is None:
+            middlewares = [m for m in self.middleware if not route.excludes(m)]
+            middlewares.extend(route.middleware)
+            chain = await self.build_middleware_chain(handler, middlewares)
+            self.route_middleware_chains[route] = chain
+        return chain
+
+    async def build_middleware_chain(
+        self, handler: Callable, middlewares: List[Callable]
+    ) -> Callable:
+        for middleware in reversed(middlewares):
+            handler = middleware(handler)
+            if inspect.isawaitable(handler):
+                handler = await handler
+        return handler
+
     async def create_request(
         self, receive: Callable, scope: Dict[str, Any], send: Callable
     ) -> Request:
-        return Request(scope, receive, send)
-
-    async def set_request_session(self, request: Request) -> None:
-        session = get_or_create_session(request)
-        request.session = session
+        request = Request(scope, receive, send)
+        request.max_body_size = self.config["MAX_BODY_SIZE"]
+        return request
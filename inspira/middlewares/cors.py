@@ -1,7 +1,7 @@
 from typing import Any, Callable, Dict, List
 
 from inspira.helpers.error_handlers import handle_forbidden
-from inspira.requests import Request
+from inspira.requests import Request, RequestContext
 
 
 class CORSMiddleware:
@@ -19,8 +19,10 @@ class CORSMiddleware:
 
     async def __call__(self, handler):
         async def middleware(scope: Dict[str, Any], receive: Callable, send: Callable):
-            request = Request(scope, receive, send)
-            origin = request.get_headers().get("origin")
+            request = RequestContext.get_request()
+            if request is None or request.scope is not scope:
+                request = Request(scope, receive, send)
+            origin = request.headers.get("origin")
 
             if scope["method"] == "OPTIONS":
                 return await self.handle_options(scope, receive, send, origin)
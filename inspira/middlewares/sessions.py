@@ -1,31 +1,51 @@
+import asyncio
 import datetime
 import uuid
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 from inspira.globals import get_global_app
-from inspira.helpers.error_handlers import handle_forbidden
-from inspira.inspira import RequestContext
 from inspira.logging import log
-from inspira.utils.session_utils import (
-    decode_session_data,
-    encode_session_data,
-    get_session_token_from_request,
-)
+from inspira.requests import RequestContext
+from inspira.utils.session_stores import SessionStore, generate_session_id
+from inspira.utils.session_utils import encode_session_data
 
 
 class SessionMiddleware:
-    def __init__(self):
+    """
+    Writes the session back to the client when it changed during the request.
+
+    By default the whole session is signed into the cookie. With a ``store``
+    the cookie only carries an opaque session id and the data is kept in the
+    store; expired entries are then purged every ``purge_interval`` seconds in
+    the background. Blocking stores are read and written in a worker thread;
+    the app loads the session from them before the middleware chain runs.
+    """
+
+    def __init__(
+        self,
+        store: Optional[SessionStore] = None,
+        purge_interval: Optional[int] = 300,
+    ):
         self.app = get_global_app()
+        self.store = store
+        self.purge_interval = purge_interval
+        self.purge_task = None
+
+        if store is not None:
+            self.app.session_store = store
 
     def build_set_cookie_header(self, session_data):
         encoded_payload = encode_session_data(session_data, self.app.secret_key)
+        return self.build_cookie_header(encoded_payload)
+
+    def build_cookie_header(self, value):
         expires_date = datetime.datetime.utcnow() + datetime.timedelta(
             seconds=self.app.config["SESSION_MAX_AGE"]
         )
         formatted_expires = expires_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
         cookie_value = (
-            f"{self.app.config['SESSION_COOKIE_NAME']}={encoded_payload}; "
+            f"{self.app.config['SESSION_COOKIE_NAME']}={value}; "
             f"Expires={formatted_expires}; Path={self.app.config['SESSION_COOKIE_PATH'] or '/'}; HttpOnly"
         )
 
@@ -40,44 +60,98 @@ class SessionMiddleware:
 
         return cookie_value
 
+    def build_clear_cookie_header(self):
+        return (
+            f"{self.app.config['SESSION_COOKIE_NAME']}=; "
+            f"Expires=Thu, 01 Jan 1970 00:00:00 GMT; "
+            f"Path={self.app.config['SESSION_COOKIE_PATH'] or '/'}; HttpOnly"
+        )
+
     async def __call__(self, handler):
         async def middleware(scope: Dict[str, Any], receive: Callable, send: Callable):
+            self.start_purging()
+
             async def send_wrapper(message):
                 if message["type"] == "http.response.start":
-                    headers = message.get("headers", [])
                     request = RequestContext().get_request()
-                    session_cookie = get_session_token_from_request(
-                        request, self.app.config["SESSION_COOKIE_NAME"]
-                    )
-
-                    decoded_session = {}
-
-                    if request.session and not session_cookie:
-                        request.set_session("session_id", str(uuid.uuid4()))
-
-                    if session_cookie:
-                        decoded_session = decode_session_data(
-                            session_cookie, self.app.secret_key
-                        )
 
-                        if decoded_session is None:
-                            log.error("Invalid session format.")
-                            return await handle_forbidden(scope, receive, send)
-
-                    if not request.session or decoded_session != request.session:
-                        if request.session:
-                            cookie_value = self.build_set_cookie_header(request.session)
-
-                            headers.append((b"Set-Cookie", cookie_value.encode()))
+                    # Requests that never read the session need no cookie work.
+                    if request.is_session_loaded():
+                        if self.store is not None:
+                            cookie_value = await self.save_to_store(request.session)
                         else:
-                            cookie_value = f"{self.app.config['SESSION_COOKIE_NAME']}=; Expires=Thu, 01 Jan 1970 00:00:00 GMT; Path={self.app.config['SESSION_COOKIE_PATH'] or '/'}; HttpOnly"
-
+                            cookie_value = self.get_set_cookie_value(request.session)
+                        if cookie_value is not None:
+                            headers = message.get("headers", [])
                             headers.append((b"Set-Cookie", cookie_value.encode()))
-
-                    message["headers"] = headers
+                            message["headers"] = headers
 
                 await send(message)
 
             await handler(scope, receive, send_wrapper)
 
         return middleware
+
+    def get_set_cookie_value(self, session):
+        modified = session.is_modified()
+        if session.invalid:
+            log.error("Invalid session format.")
+        elif not modified:
+            return None
+
+        if session:
+            if not session.token and "session_id" not in session:
+                session["session_id"] = str(uuid.uuid4())
+            return self.build_set_cookie_header(session)
+
+        if session.token or modified:
+            return self.build_clear_cookie_header()
+
+        return None
+
+    async def call_store(self, function, *args):
+        if self.store.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    async def save_to_store(self, session):
+        if not session.is_modified():
+            return None
+
+        if session:
+            session_id = session.token or generate_session_id()
+            await self.call_store(
+                self.store.save,
+                session_id,
+                dict(session),
+                self.app.config["SESSION_MAX_AGE"],
+            )
+            return self.build_cookie_header(session_id)
+
+        if session.token:
+            await self.call_store(self.store.delete, session.token)
+            return self.build_clear_cookie_header()
+
+        return None
+
+    def start_purging(self):
+        if (
+            self.store is None
+            or not self.purge_interval
+            or (self.purge_task is not None and not self.purge_task.done())
+        ):
+            return
+
+        self.purge_task = asyncio.get_running_loop().create_task(
+            self.purge_expired_sessions()
+        )
+
+    async def purge_expired_sessions(self):
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                removed = await self.call_store(self.store.purge_expired)
+                if removed:
+                    log.info(f"Purged {removed} expired sessions")
+            except Exception as e:
+                log.error(f"Error purging expired sessions: {e}")
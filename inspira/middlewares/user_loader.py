@@ -6,10 +6,6 @@ from inspira.globals import get_global_app
 from inspira.helpers.error_handlers import handle_forbidden
 from inspira.logging import log
 from inspira.requests import RequestContext
-from inspira.utils.session_utils import (
-    decode_session_data,
-    get_session_token_from_request,
-)
 
 
 class UserLoaderMiddleware:
@@ -20,24 +16,20 @@ class UserLoaderMiddleware:
     async def __call__(self, handler):
         async def middleware(scope: Dict[str, Any], receive: Callable, send: Callable):
             request = RequestContext().get_request()
-            session_cookie = get_session_token_from_request(
-                request, self.app.config["SESSION_COOKIE_NAME"]
-            )
+            session = request.session
 
             user = None
 
-            if session_cookie:
-                decoded_session = decode_session_data(
-                    session_cookie, self.app.secret_key
-                )
-                if decoded_session is None:
-                    log.error("Invalid session format.")
-                    return await handle_forbidden(scope, receive, send)
-                else:
-                    user_id = decode_auth_token(decoded_session.get("token", None))
-
-                    if user_id:
-                        user = self.user_model.query.get(user_id)
+            if session.invalid:
+                log.error("Invalid session format.")
+                return await handle_forbidden(scope, receive, send)
+
+            token = session.get("token")
+            if token:
+                user_id = decode_auth_token(token)
+
+                if user_id:
+                    user = self.user_model.query.get(user_id)
             RequestContext.set_current_user(user or AnonymousUserMixin())
             request.user = RequestContext.get_current_user()
 
@@ -1,38 +1,102 @@
-import json
 import urllib.parse
-from typing import Any, Callable, Dict
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
 from inspira.constants import UTF8
+from inspira.datastructures import Headers, QueryParams, parse_cookie_header
+from inspira.globals import get_global_app
+from inspira.utils.json_codec import get_json_codec
+from inspira.utils.multipart import (
+    DEFAULT_MAX_FIELD_SIZE,
+    DEFAULT_SPOOL_MAX_SIZE,
+    MultipartParser,
+    parse_options_header,
+)
+from inspira.utils.session_utils import Session, load_session
+
+
+class RequestEntityTooLarge(Exception):
+    """Raised when a request body exceeds the allowed size."""
+
+
+class RequestBodyConsumed(RuntimeError):
+    """
+    Raised when the body is read after it was streamed without being cached.
+
+    That happens when ``stream()`` is called twice, or when ``body()``,
+    ``json()`` or ``stream()`` is called after ``form()`` parsed a multipart
+    body, which is streamed so uploads are not held in memory.
+    """
+
+
+class ClientDisconnect(Exception):
+    """Raised when the client disconnects before the whole body was received."""
+
+
+_current_request: ContextVar[Optional["Request"]] = ContextVar(
+    "inspira_current_request", default=None
+)
+_current_user: ContextVar[Any] = ContextVar("inspira_current_user", default=None)
 
 
 class RequestContext:
-    _current_request = None
-    _current_user = None
+    """
+    Access to the request being handled by the current task.
+
+    The values live in context variables, so every request, served in its
+    own task, sees only its own request and user even when many requests are
+    in flight on the same event loop.
+    """
 
     @classmethod
     def set_request(cls, request):
-        cls._current_request = request
+        _current_request.set(request)
 
     @classmethod
     def get_request(cls):
-        return cls._current_request
+        return _current_request.get()
 
     @classmethod
     def get_current_user(cls):
-        return cls._current_user
+        return _current_user.get()
 
     @classmethod
     def set_current_user(cls, user):
-        cls._current_user = user
+        _current_user.set(user)
 
 
 class Request:
+    __slots__ = (
+        "scope",
+        "receive",
+        "send",
+        "_session",
+        "_headers",
+        "_request_headers",
+        "_cookies",
+        "_query_params",
+        "_body",
+        "_stream_consumed",
+        "_form",
+        "max_body_size",
+        "_forbidden",
+        "user",
+    )
+
     def __init__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
         self.scope = scope
         self.receive = receive
         self.send = send
-        self._session = {}
-        self._headers = {}
+        self._session = None
+        # Headers added to the response, created on the first set_header.
+        self._headers: Optional[Dict[str, str]] = None
+        self._request_headers = None
+        self._cookies = None
+        self._query_params = None
+        self._body = None
+        self._stream_consumed = False
+        self._form = None
+        self.max_body_size = None
         self._forbidden = False
         self.user = None
 
@@ -44,79 +108,159 @@ class Request:
 
     @property
     def session(self):
+        # The session cookie is only verified the first time it is read.
+        if self._session is None:
+            self._session = load_session(self)
         return self._session
 
     @session.setter
     def session(self, value):
+        if not isinstance(value, Session):
+            value = Session(value)
+            value.modified = True
         self._session = value
 
-    def set_session(self, key, value):
-        if not isinstance(self._session, dict):
-            self._session = {}
+    def is_session_loaded(self):
+        return self._session is not None
 
-        self._session[key] = value
+    def set_session(self, key, value):
+        self.session[key] = value
 
     def get_session(self, key, default=None):
-        if not isinstance(self._session, dict):
-            return default
-
-        return self._session.get(key, default)
+        return self.session.get(key, default)
 
     def remove_session(self, key, default=None):
-        if not isinstance(self._session, dict):
-            return default
+        return self.session.pop(key, default)
+
+    @property
+    def headers(self) -> Headers:
+        if self._request_headers is None:
+            self._request_headers = Headers(self.scope.get("headers"))
+        return self._request_headers
 
-        return self._session.pop(key, default)
+    @property
+    def query_params(self) -> QueryParams:
+        if self._query_params is None:
+            self._query_params = QueryParams(self.scope.get("query_string", b""))
+        return self._query_params
 
-    def get_headers(self):
-        return dict(
-            (key.decode(UTF8), value.decode(UTF8))
-            for key, value in self.scope.get("headers", [])
-        )
+    def get_headers(self) -> Headers:
+        return self.headers
 
     def set_header(self, key, value):
+        if self._headers is None:
+            self._headers = {}
         self._headers[key] = value
 
     def get_request_headers(self):
-        return list(
+        if not self._headers:
+            return []
+        return [
             (key.encode(UTF8), value.encode(UTF8))
             for key, value in self._headers.items()
-        )
+        ]
+
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            self._cookies = parse_cookie_header(self.headers.get("cookie", ""))
+        return self._cookies
+
+    def exceeds_max_body_size(self) -> bool:
+        """Check the declared Content-Length against ``max_body_size``."""
+        if self.max_body_size is None:
+            return False
+
+        content_length = self.headers.get("content-length")
+        if content_length is None:
+            return False
+        try:
+            return int(content_length) > self.max_body_size
+        except ValueError:
+            return False
+
+    async def stream(self) -> AsyncIterator[memoryview]:
+        """
+        Receive the request body chunk by chunk without buffering it.
+
+        Chunks are memoryviews over the received ASGI messages. Raises
+        ``RequestEntityTooLarge`` as soon as the Content-Length or the bytes
+        received so far exceed ``max_body_size``, and ``ClientDisconnect`` if
+        the client goes away before the end of the body. The body can only be
+        streamed once, unless it has already been read with ``body()``.
+        """
+        if self._body is not None:
+            if self._body:
+                yield memoryview(self._body)
+            return
+        if self._stream_consumed:
+            raise RequestBodyConsumed("The request body has already been consumed")
+        self._stream_consumed = True
+
+        if self.exceeds_max_body_size():
+            raise RequestEntityTooLarge()
+
+        received = 0
+        more_body = True
+        while more_body:
+            message = await self.receive()
+            if message.get("type") == "http.disconnect":
+                raise ClientDisconnect()
+            chunk = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not chunk:
+                continue
 
-    def cookies(self):
-        cookie_header = self.get_headers().get("cookie", "")
-        if cookie_header:
-            try:
-                return {
-                    key.strip(): value.strip()
-                    for key, value in [
-                        cookie.split("=", 1) for cookie in cookie_header.split(";")
-                    ]
-                }
-            except ValueError:
-                return {}
-        return {}
+            received += len(chunk)
+            if self.max_body_size is not None and received > self.max_body_size:
+                raise RequestEntityTooLarge()
+            yield memoryview(chunk)
+
+    async def body(self) -> bytes:
+        """
+        Read the whole request body.
+
+        The body is received once and cached, so it can be read again by
+        ``json()``, ``form()`` or a middleware further down the chain. A body
+        cut short by a disconnect is never cached.
+        """
+        if self._body is None:
+            # The views wrap whole messages, so their bytes are joined directly.
+            chunks = [chunk.obj async for chunk in self.stream()]
+            self._body = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        return self._body
 
     async def json(self):
-        body = await self._get_body()
+        body = await self.body()
         if body:
-            return json.loads(body.decode(UTF8))
+            return get_json_codec().loads(body)
         return {}
 
     async def _get_boundary(self):
-        content_type_header = self.get_headers().get("content-type", "")
+        content_type_header = self.headers.get("content-type", "")
         if "multipart/form-data" in content_type_header:
-            parts = content_type_header.split(";")
-            for part in parts:
-                if "boundary" in part:
-                    _, boundary = part.strip().split("=")
-                    return boundary.strip('"')
+            _, options = parse_options_header(content_type_header)
+            return options.get("boundary")
         return None
 
     async def form(self):
-        content_type_header = self.get_headers().get("content-type", "")
+        """
+        Parse an urlencoded or multipart form.
+
+        The result is cached. Files in a multipart form are returned as
+        ``UploadedFile`` objects; a malformed multipart body raises
+        ``MultipartError``. A multipart body is streamed into the parser
+        without being cached, so reading the body afterwards raises
+        ``RequestBodyConsumed``; call ``body()`` first to keep it as well.
+        Urlencoded forms are parsed from the cached body.
+        """
+        if self._form is None:
+            self._form = await self._parse_form()
+        return self._form
+
+    async def _parse_form(self):
+        content_type_header = self.headers.get("content-type", "")
         if "application/x-www-form-urlencoded" in content_type_header:
-            body = await self._get_body()
+            body = await self.body()
             form_data = urllib.parse.parse_qsl(body.decode(UTF8))
             return {key: value for key, value in form_data}
         elif "multipart/form-data" in content_type_header:
@@ -125,57 +269,30 @@ class Request:
 
         return {}
 
-    async def _get_body(self):
-        body = b""
-        more_body = True
-        while more_body:
-            message = await self.receive()
-            body += message.get("body", b"")
-            more_body = message.get("more_body", False)
-        return body
-
     async def _parse_multipart_form_data(self):
-        form_data = await self._get_body()
         boundary = await self._get_boundary()
-
-        if not boundary or not form_data:
+        if not boundary:
             return {}
 
-        parts = form_data.split(b"--" + boundary.encode())
-
-        form_data_dict = {}
-        for part in parts:
-            if not part.strip():
-                continue
-
-            headers_content = part.split(b"\r\n\r\n", 1)
-            if len(headers_content) == 2:
-                headers, content = headers_content
-                content_lines = content.split(b"\r\n")
-                # Filter out empty lines and join the rest
-                content = b"\r\n".join(line for line in content_lines if line.strip())
-            else:
-                headers, content = headers_content[0], b""
-
-            headers_lines = headers.decode(UTF8).split("\r\n")
-
-            content_disposition = next(
-                (
-                    line
-                    for line in headers_lines
-                    if line.startswith("Content-Disposition")
-                ),
-                None,
-            )
-
-            if not content_disposition:
-                continue
-
-            _, name = content_disposition.split(";")
-            name = name.split("=")[1].strip('"')
-
-            content_str = content.decode(UTF8)
-
-            form_data_dict[name] = content_str.strip()
+        app = get_global_app()
+        parser = MultipartParser(
+            boundary,
+            spool_max_size=(
+                app.config["MULTIPART_SPOOL_MAX_SIZE"]
+                if app is not None
+                else DEFAULT_SPOOL_MAX_SIZE
+            ),
+            max_field_size=(
+                app.config["MULTIPART_MAX_FIELD_SIZE"]
+                if app is not None
+                else DEFAULT_MAX_FIELD_SIZE
+            ),
+        )
+        received = False
+        async for chunk in self.stream():
+            parser.feed(chunk)
+            received = True
 
-        return form_data_dict
+        if not received:
+            return {}
+        return parser.close()
@@ -1,17 +1,89 @@
+import asyncio
 import datetime
-import json
+import email.utils
+import functools
 import mimetypes
 import os
+import secrets
+import stat
+import urllib.parse
+import warnings
 from http import HTTPStatus
-
-from jinja2 import Environment, FileSystemLoader
-
-from inspira.constants import APPLICATION_JSON, NOT_FOUND, TEXT_HTML, TEXT_PLAIN, UTF8
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from jinja2 import TemplateNotFound
+
+from inspira.constants import (
+    APPLICATION_JSON,
+    APPLICATION_OCTET_STREAM,
+    NOT_FOUND,
+    TEXT_HTML,
+    TEXT_PLAIN,
+    UTF8,
+)
+from inspira.datastructures import Headers
 from inspira.logging import log
 from inspira.requests import RequestContext
+from inspira.templating import get_templates
+from inspira.utils.json_codec import get_json_codec
+
+# Statuses whose responses never carry a body, and so no Content-Length.
+BODYLESS_STATUSES = frozenset((HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED))
+
+
+@functools.lru_cache(maxsize=64)
+def encode_content_type(content_type: str) -> bytes:
+    return content_type.encode(UTF8)
+
+
+@functools.lru_cache(maxsize=64)
+def content_type_header(content_type: str) -> Tuple[bytes, bytes]:
+    return (b"content-type", encode_content_type(content_type))
+
+
+@functools.lru_cache(maxsize=256)
+def encode_header_name(name: str) -> bytes:
+    return name.encode(UTF8)
+
+
+def content_length_header(length: int) -> Tuple[bytes, bytes]:
+    return (b"content-length", str(length).encode())
+
+
+@functools.lru_cache(maxsize=1024)
+def guess_content_type(path: str) -> str:
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or APPLICATION_OCTET_STREAM
+
+
+async def wait_for_disconnect(receive) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
 
 
 class HttpResponse:
+    __slots__ = (
+        "content",
+        "status_code",
+        "content_type",
+        "_headers",
+        "_raw_headers",
+        "_raw_body",
+    )
+
     def __init__(
         self,
         content=None,
@@ -22,7 +94,43 @@ class HttpResponse:
         self.content = content
         self.status_code = status_code
         self.content_type = content_type
-        self.headers = dict(headers or {})
+        self._headers = dict(headers) if headers else None
+        self._raw_headers = None
+        self._raw_body = None
+
+    @property
+    def headers(self):
+        # Most responses carry no extra headers, so the dict is created lazily.
+        if self._headers is None:
+            self._headers = {}
+        if self._raw_headers is not None:
+            return MappingProxyType(self._headers)
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        if self._raw_headers is not None:
+            raise TypeError("A frozen response cannot be modified")
+        self._headers = dict(value)
+
+    def freeze(self) -> "HttpResponse":
+        """
+        Pre-encode the body and the header block of a response that is sent
+        many times, such as an error page.
+
+        Every send reuses the same bytes. The headers can no longer be
+        changed afterwards.
+        """
+        body = self.render_body()
+        headers = self.render_headers()
+        if self.has_content_length(body):
+            headers.append(content_length_header(len(body)))
+        self._raw_body = body
+        self._raw_headers = tuple(headers)
+        return self
+
+    def is_frozen(self) -> bool:
+        return self._raw_headers is not None
 
     def set_cookie(
         self,
@@ -60,7 +168,18 @@ class HttpResponse:
         self.headers.setdefault("set-cookie", []).append(cookie_str)
 
     async def __call__(self, scope, receive, send):
-        headers = await self.encoded_headers()
+        if self._raw_headers is not None:
+            body = self._raw_body
+            headers = list(self._raw_headers)
+            request = RequestContext.get_request()
+            if request is not None:
+                headers.extend(request.get_request_headers())
+        else:
+            # The body is serialized first, so its length can be announced.
+            body = await self.serialize_content()
+            headers = await self.encoded_headers()
+            if self.has_content_length(body):
+                headers.append(content_length_header(len(body)))
 
         await send(
             {
@@ -70,8 +189,6 @@ class HttpResponse:
             }
         )
 
-        body = await self.serialize_content()
-
         await send(
             {
                 "type": "http.response.body",
@@ -80,23 +197,43 @@ class HttpResponse:
             }
         )
 
-    async def encoded_headers(self):
-        request_headers = RequestContext().get_request().get_request_headers()
+    def has_content_length(self, body: bytes) -> bool:
+        """Check whether a Content-Length header should be added for the body."""
+        if self.status_code < 200 or self.status_code in BODYLESS_STATUSES:
+            return False
+        return self.get_header("content-length") is None
 
-        headers = [(b"content-type", self.content_type.encode(UTF8))]
+    def get_header(self, name: str) -> Any:
+        """Return the value of a response header, ignoring the name's case."""
+        if self._headers:
+            for key, value in self._headers.items():
+                if key.lower() == name:
+                    return value
+        return None
 
-        headers.extend(request_headers)
+    async def encoded_headers(self):
+        headers = self.render_headers()
+
+        request = RequestContext.get_request()
+        if request is not None:
+            headers.extend(request.get_request_headers())
 
-        for key, value_list in self.headers.items():
-            headers.extend(self.encode_header(key, value_list))
+        return headers
 
+    def render_headers(self) -> List[Tuple[bytes, bytes]]:
+        """Encode the response's own headers, without request headers."""
+        headers = [content_type_header(self.content_type)]
+        if self._headers:
+            for key, value_list in self._headers.items():
+                headers.extend(self.encode_header(key, value_list))
         return headers
 
     def encode_header(self, key, value_list):
         if not isinstance(value_list, list):
             value_list = [value_list]
 
-        return [(key.encode(UTF8), self.encode_value(value)) for value in value_list]
+        name = encode_header_name(key)
+        return [(name, self.encode_value(value)) for value in value_list]
 
     def encode_value(self, value):
         if isinstance(value, str):
@@ -104,11 +241,14 @@ class HttpResponse:
         return value
 
     async def serialize_content(self):
+        return self.render_body()
+
+    def render_body(self) -> bytes:
         if self.content is not None:
             if isinstance(self.content, bytes):
                 body = self.content
             elif self.content_type == APPLICATION_JSON:
-                body = json.dumps(self.content).encode(UTF8)
+                body = get_json_codec().dumps(self.content)
             else:
                 body = str(self.content).encode(UTF8)
         else:
@@ -117,33 +257,36 @@ class HttpResponse:
 
 
 class JsonResponse(HttpResponse):
+    __slots__ = ()
+
     def __init__(self, content=None, status_code=HTTPStatus.OK, headers=None):
         super().__init__(content, status_code, APPLICATION_JSON, headers)
 
 
 class TemplateResponse(HttpResponse):
+    __slots__ = ("template_name", "context", "template_dir")
+
     def __init__(
         self,
         template_name=None,
         context=None,
         template_dir="templates",
-        static_dir="static",
+        static_dir=None,
     ):
+        if static_dir is not None:
+            warnings.warn(
+                "TemplateResponse(static_dir=...) is ignored and deprecated; "
+                "static files are served by the app from the STATIC_DIR config",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         super().__init__(None, HTTPStatus.OK, TEXT_HTML)
         self.template_name = template_name
         self.context = context or {}
-        self.static_dir = static_dir
         self.template_dir = template_dir
 
     async def __call__(self, scope, receive, send):
-        path_info = scope.get("path", "").lstrip("/") or scope.get(
-            "raw_path", b""
-        ).decode(UTF8).lstrip("/")
-
-        if path_info.startswith("static/"):
-            await self.handle_static_file(scope, receive, send)
-        else:
-            await self.render_template(scope, receive, send)
+        await self.render_template(scope, receive, send)
 
     async def render_template(self, scope, receive, send):
         if self.template_name is None:
@@ -154,84 +297,425 @@ class TemplateResponse(HttpResponse):
             await not_found_response(scope, receive, send)
             return
 
-        template_path = os.path.join(self.template_dir, self.template_name)
-
-        if not os.path.exists(template_path):
-            log.error("Template not found:", template_path)
+        environment = get_templates().get_environment(self.template_dir)
+        try:
+            template = environment.get_template(self.template_name)
+        except TemplateNotFound:
+            log.error(f"Template not found: {self.template_name}")
             not_found_response = JsonResponse(
                 {"error": NOT_FOUND}, status_code=HTTPStatus.NOT_FOUND
             )
             await not_found_response(scope, receive, send)
+            return
 
-        template_env = Environment(loader=FileSystemLoader(self.template_dir))
-        template = template_env.get_template(self.template_name)
         content = template.render(**self.context)
 
         self.content = content.encode(UTF8)
         await super().__call__(scope, receive, send)
 
-    async def handle_static_file(self, scope, receive, send):
-        path_info = scope.get("path", "").lstrip("/") or scope.get(
-            "raw_path", b""
-        ).decode(UTF8).lstrip("/")
-        static_prefix = "static/"
 
-        if path_info.startswith(static_prefix):
-            relative_path = path_info[len(static_prefix) :]
-            file_path = os.path.join(self.static_dir, relative_path)
+class HttpResponseRedirect(HttpResponse):
+    __slots__ = ()
 
-            if os.path.isfile(file_path):
-                content_type, _ = mimetypes.guess_type(file_path)
-                headers = [(b"content-type", content_type.encode(UTF8))]
+    def __init__(self, url: str, status_code=HTTPStatus.FOUND, headers=None):
+        super().__init__(content=None, status_code=status_code, headers=headers or {})
+        self.headers["Location"] = url
 
-                with open(file_path, "rb") as file:
-                    body = file.read()
 
-                await send(
-                    {
-                        "type": "http.response.start",
-                        "status": HTTPStatus.OK,
-                        "headers": headers,
-                    }
-                )
+class ForbiddenResponse(HttpResponse):
+    __slots__ = ()
 
-                await send(
-                    {
-                        "type": "http.response.body",
-                        "body": body,
-                        "more_body": False,
-                    }
-                )
-            else:
-                log.error("File not found:", file_path)
+    def __init__(
+        self,
+        content=None,
+        content_type=TEXT_PLAIN,
+        status_code=HTTPStatus.FORBIDDEN,
+        headers=None,
+    ):
+        super().__init__(content, status_code, content_type, headers)
+
+
+class StreamingResponse(HttpResponse):
+    """
+    Response whose body is produced by a sync or async iterable of bytes or
+    str chunks.
+
+    Chunks are sent as they are produced, so the body is never held in
+    memory as a whole. With a ``chunk_size``, chunks are coalesced until
+    that many bytes are buffered, which saves sends and thread hops for bulk
+    exports from a fast producer but holds back the output of a slow one;
+    it is off by default. Sync iterables are consumed in a worker thread, so
+    they may block. Producing stops as soon as the client disconnects.
+    """
 
-                # Return a 404 response for non-existing static files
-                not_found_response = JsonResponse(
-                    {"error": "Not Found"}, status_code=HTTPStatus.NOT_FOUND
+    __slots__ = ("body_iterator", "chunk_size")
+
+    def __init__(
+        self,
+        content: Union[Iterable[Any], AsyncIterable[Any]],
+        status_code=HTTPStatus.OK,
+        content_type=TEXT_PLAIN,
+        headers=None,
+        chunk_size: int = 0,
+    ):
+        super().__init__(None, status_code, content_type, headers)
+        self.body_iterator = content
+        self.chunk_size = chunk_size
+
+    async def __call__(self, scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": await self.encoded_headers(),
+            }
+        )
+
+        disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+        chunks = self.iterate_chunks()
+        try:
+            async for chunk in chunks:
+                if disconnected.done():
+                    return
+                try:
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+                except OSError:
+                    return
+
+            if not disconnected.done():
+                await send(
+                    {"type": "http.response.body", "body": b"", "more_body": False}
                 )
-                await not_found_response(scope, receive, send)
+        finally:
+            disconnected.cancel()
+            await chunks.aclose()
+
+    async def iterate_chunks(self) -> AsyncIterator[bytes]:
+        """Yield the encoded body, coalesced into chunks of ``chunk_size``."""
+        if hasattr(self.body_iterator, "__aiter__"):
+            iterator = self.body_iterator
         else:
-            log.error("Unexpected path:", path_info)
+            iterator = self.iterate_in_thread(iter(self.body_iterator))
+
+        buffer: List[bytes] = []
+        size = 0
+        try:
+            async for chunk in iterator:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(UTF8)
+                if not chunk:
+                    continue
+                if not self.chunk_size:
+                    yield chunk
+                    continue
+
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= self.chunk_size:
+                    yield b"".join(buffer)
+                    buffer.clear()
+                    size = 0
+
+            if buffer:
+                yield b"".join(buffer)
+        finally:
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+    async def iterate_in_thread(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        # Items are pulled in batches of about chunk_size bytes, so a thread
+        # hop is made per sent chunk instead of per item; without a
+        # chunk_size every item is sent as soon as it is produced.
+        def take_batch() -> List[Any]:
+            batch = []
+            size = 0
+            for item in iterator:
+                batch.append(item)
+                size += len(item)
+                if size >= self.chunk_size:
+                    break
+            return batch
+
+        while True:
+            batch = await asyncio.to_thread(take_batch)
+            if not batch:
+                return
+            for item in batch:
+                yield item
+
+
+CRLF = "\r\n"
+
+# Large enough that the thread hop per chunk does not limit throughput.
+FILE_CHUNK_SIZE = 256 * 1024
+
+# Requests for more ranges than this, after merging, are answered in full.
+MAX_RANGES = 64
+
+
+def parse_range_header(value: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a ``Range`` header into sorted, merged ``(start, end)`` byte ranges,
+    with ``end`` inclusive.
+
+    Returns None when the header is invalid or should be ignored, and an
+    empty list when none of the ranges can be satisfied.
+    """
+    unit, _, specs = value.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+
+    ranges = []
+    for spec in specs.split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        first, separator, last = spec.partition("-")
+        if not separator:
+            return None
+        try:
+            if not first:
+                length = int(last)
+                if length > 0 and size > 0:
+                    ranges.append((max(size - length, 0), size - 1))
+                continue
+
+            start = int(first)
+            end = int(last) if last else None
+        except ValueError:
+            return None
+        if start < 0 or (end is not None and end < start):
+            return None
+        if end is None:
+            end = size - 1
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
 
-            # Return a 404 response for unexpected paths
-            not_found_response = JsonResponse(
-                {"error": "Not Found"}, status_code=HTTPStatus.NOT_FOUND
-            )
-            await not_found_response(scope, receive, send)
+    if len(merged) > MAX_RANGES:
+        return None
+    return merged
 
 
-class HttpResponseRedirect(HttpResponse):
-    def __init__(self, url: str, status_code=HTTPStatus.FOUND, headers=None):
-        super().__init__(content=None, status_code=status_code, headers=headers or {})
-        self.headers["Location"] = url
+def content_disposition(filename: str) -> str:
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        return f"attachment; filename*=utf-8''{urllib.parse.quote(filename)}"
+    escaped = filename.replace("\\", "\\\\").replace('"', '\\"')
+    return f'attachment; filename="{escaped}"'
 
 
-class ForbiddenResponse(HttpResponse):
+class FileResponse(HttpResponse):
+    """
+    Response that sends a file from disk.
+
+    The file is read in chunks of ``chunk_size`` in a worker thread, so large
+    downloads neither block the event loop nor are held in memory. Single
+    and multiple ``Range`` requests are answered with 206, honouring
+    ``If-Range``. When the server supports the ASGI ``http.response.pathsend``
+    or ``http.response.zerocopy`` extension, the file is handed to the server
+    instead of being read here.
+
+    ``ETag`` and ``Last-Modified`` are derived from the file's stat unless
+    they are given in ``headers``. ``filename`` makes the browser download the
+    file under that name.
+    """
+
+    __slots__ = ("path", "filename", "stat_result", "chunk_size")
+
     def __init__(
         self,
-        content=None,
-        content_type=TEXT_PLAIN,
-        status_code=HTTPStatus.FORBIDDEN,
+        path: Union[str, "os.PathLike[str]"],
+        status_code=HTTPStatus.OK,
+        content_type: Optional[str] = None,
         headers=None,
+        filename: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+        chunk_size: int = FILE_CHUNK_SIZE,
     ):
-        super().__init__(content, status_code, content_type, headers)
+        path = os.fspath(path)
+        if content_type is None:
+            content_type = guess_content_type(filename or path)
+        super().__init__(None, status_code, content_type, headers)
+        self.path = path
+        self.filename = filename
+        self.stat_result = stat_result
+        self.chunk_size = chunk_size
+        if filename is not None and self.get_header("content-disposition") is None:
+            self.headers["content-disposition"] = content_disposition(filename)
+
+    async def __call__(self, scope, receive, send):
+        stat_result = self.stat_result
+        if stat_result is None:
+            try:
+                stat_result = await asyncio.to_thread(os.stat, self.path)
+            except OSError:
+                stat_result = None
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            log.error(f"File not found: {self.path}")
+            not_found_response = JsonResponse(
+                {"error": NOT_FOUND}, status_code=HTTPStatus.NOT_FOUND
+            )
+            await not_found_response(scope, receive, send)
+            return
+
+        size = stat_result.st_size
+        etag = self.get_header("etag")
+        if etag is None:
+            etag = f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+            self.headers["etag"] = etag
+        last_modified = self.get_header("last-modified")
+        if last_modified is None:
+            last_modified = email.utils.formatdate(stat_result.st_mtime, usegmt=True)
+            self.headers["last-modified"] = last_modified
+
+        method = scope.get("method", "GET")
+        ranges = None
+        if self.status_code == HTTPStatus.OK and method in ("GET", "HEAD"):
+            request_headers = Headers(scope.get("headers"))
+            range_header = request_headers.get("range")
+            if range_header and self.if_range_matches(
+                request_headers.get("if-range"), etag, last_modified
+            ):
+                ranges = parse_range_header(range_header, size)
+
+        if ranges == []:
+            not_satisfiable = HttpResponse(
+                status_code=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"content-range": f"bytes */{size}"},
+            )
+            await not_satisfiable(scope, receive, send)
+            return
+
+        headers = await self.encoded_headers()
+        headers.append((b"accept-ranges", b"bytes"))
+        if ranges is None:
+            status_code = self.status_code
+            parts = [(b"", 0, size - 1)] if size else []
+            length = size
+            trailer = b""
+        elif len(ranges) == 1:
+            status_code = HTTPStatus.PARTIAL_CONTENT
+            start, end = ranges[0]
+            headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+            parts = [(b"", start, end)]
+            length = end - start + 1
+            trailer = b""
+        else:
+            status_code = HTTPStatus.PARTIAL_CONTENT
+            boundary = secrets.token_hex(16)
+            parts = []
+            for start, end in ranges:
+                # Every part after the first starts on a new line.
+                part_header = (
+                    f"{CRLF if parts else ''}--{boundary}{CRLF}"
+                    f"Content-Type: {self.content_type}{CRLF}"
+                    f"Content-Range: bytes {start}-{end}/{size}{CRLF}{CRLF}"
+                ).encode(UTF8)
+                parts.append((part_header, start, end))
+            trailer = f"{CRLF}--{boundary}--{CRLF}".encode()
+            length = len(trailer) + sum(
+                len(part_header) + end - start + 1 for part_header, start, end in parts
+            )
+            # render_headers always starts with the content type.
+            headers[0] = content_type_header(
+                f"multipart/byteranges; boundary={boundary}"
+            )
+        headers.append(content_length_header(length))
+
+        await send(
+            {"type": "http.response.start", "status": status_code, "headers": headers}
+        )
+
+        extensions = scope.get("extensions") or {}
+        if method == "HEAD" or not parts:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif ranges is None and "http.response.pathsend" in extensions:
+            await send(
+                {
+                    "type": "http.response.pathsend",
+                    "path": os.path.abspath(self.path),
+                }
+            )
+        elif len(parts) == 1 and "http.response.zerocopy" in extensions:
+            await self.send_zerocopy(send, parts[0][1], parts[0][2])
+        else:
+            await self.send_parts(send, receive, parts, trailer)
+
+    @staticmethod
+    def if_range_matches(
+        if_range: Optional[str], etag: str, last_modified: str
+    ) -> bool:
+        # A range is only honoured if the client's copy is still current;
+        # weak validators never match.
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == etag and not etag.startswith("W/")
+        return if_range == last_modified
+
+    async def send_zerocopy(self, send, start: int, end: int) -> None:
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            await send(
+                {
+                    "type": "http.response.zerocopy",
+                    "file": file,
+                    "offset": start,
+                    "count": end - start + 1,
+                    "more_body": False,
+                }
+            )
+        finally:
+            file.close()
+
+    async def send_parts(
+        self, send, receive, parts: List[Tuple[bytes, int, int]], trailer: bytes
+    ) -> None:
+        """Send the byte ranges of the file, each after its part header."""
+        disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            for prefix, start, end in parts:
+                file.seek(start)
+                remaining = end - start + 1
+                while remaining:
+                    chunk = await asyncio.to_thread(
+                        file.read, min(self.chunk_size, remaining)
+                    )
+                    if not chunk:
+                        # The file was truncated while it was being sent.
+                        return
+                    remaining -= len(chunk)
+                    if prefix:
+                        chunk = prefix + chunk
+                        prefix = b""
+                    if disconnected.done():
+                        return
+                    try:
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": chunk,
+                                "more_body": True,
+                            }
+                        )
+                    except OSError:
+                        return
+
+            await send(
+                {"type": "http.response.body", "body": trailer, "more_body": False}
+            )
+        finally:
+            disconnected.cancel()
+            file.close()
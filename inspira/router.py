@@ -0,0 +1,320 @@
+import re
+from http import HTTPStatus
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from inspira.enums import HttpMethod
+from inspira.utils.handler_invoker import InvocationPlan, build_invocation_plan
+from inspira.utils.param_converter import (
+    PathConverter,
+    RestOfPathConverter,
+    get_path_converter,
+)
+
+PARAM_REGEX = re.compile(r"{([a-zA-Z_][a-zA-Z0-9_]*)(?::([a-zA-Z_]+))?}")
+
+
+class Segment:
+    """
+    Matcher for a path segment that contains one or more placeholders.
+
+    Placeholders are written as ``{name}`` or ``{name:converter}``; values that
+    the converter rejects make the segment fail to match.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        match = PARAM_REGEX.fullmatch(pattern)
+        if match:
+            self.name = match.group(1)
+            self.converter = get_path_converter(match.group(2))
+            self.regex = None
+            self.converters = None
+        else:
+            self.name = None
+            self.converter = None
+            parts = PARAM_REGEX.split(pattern)
+            self.converters = {
+                name: get_path_converter(converter)
+                for name, converter in zip(parts[1::3], parts[2::3])
+            }
+            regex = re.escape(parts[0])
+            for name, text in zip(parts[1::3], parts[3::3]):
+                regex += f"(?P<{name}>{self.converters[name].regex})"
+                regex += re.escape(text)
+            self.regex = re.compile(regex)
+
+        self.is_catch_all = isinstance(self.converter, RestOfPathConverter)
+
+    def match(self, value: str) -> Optional[Dict[str, Any]]:
+        try:
+            if self.name is not None:
+                return {self.name: self.converter.convert(value)}
+
+            match = self.regex.fullmatch(value)
+            if match is None:
+                return None
+            return {
+                name: self.converters[name].convert(group)
+                for name, group in match.groupdict().items()
+            }
+        except ValueError:
+            return None
+
+
+class Route:
+    __slots__ = (
+        "path",
+        "method",
+        "handler",
+        "plan",
+        "middleware",
+        "exclude_middleware",
+        "max_body_size",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        method: str,
+        handler: Callable,
+        middleware: Sequence[Callable] = (),
+        exclude_middleware: Sequence[Any] = (),
+        max_body_size: Optional[int] = None,
+    ):
+        self.path = path
+        self.method = method
+        self.handler = handler
+        self.middleware = tuple(middleware)
+        self.exclude_middleware = tuple(exclude_middleware)
+        self.max_body_size = max_body_size
+        self.plan: InvocationPlan = build_invocation_plan(
+            handler,
+            converted_params={
+                name for name, converter in PARAM_REGEX.findall(path) if converter
+            },
+        )
+
+    def excludes(self, middleware: Any) -> bool:
+        """Check whether a global middleware is excluded from this route."""
+        for excluded in self.exclude_middleware:
+            if middleware is excluded or (
+                isinstance(excluded, type) and isinstance(middleware, excluded)
+            ):
+                return True
+        return False
+
+
+class RouteResolution:
+    """Outcome of resolving a request method and path against the router."""
+
+    __slots__ = ("status", "route", "params", "allowed_methods")
+
+    def __init__(
+        self,
+        status: HTTPStatus,
+        route: Optional[Route] = None,
+        params: Optional[Dict[str, Any]] = None,
+        allowed_methods: FrozenSet[str] = frozenset(),
+    ):
+        self.status = status
+        self.route = route
+        self.params = params
+        self.allowed_methods = allowed_methods
+
+    @property
+    def allow_header(self) -> str:
+        methods = set(self.allowed_methods)
+        methods.add(HttpMethod.OPTIONS.value)
+        if HttpMethod.GET.value in methods:
+            methods.add(HttpMethod.HEAD.value)
+        return ", ".join(sorted(methods))
+
+
+class RouteNode:
+    __slots__ = ("static", "dynamic", "routes")
+
+    def __init__(self):
+        self.static: Dict[str, "RouteNode"] = {}
+        self.dynamic: List[Tuple[Segment, "RouteNode"]] = []
+        self.routes: Dict[str, Route] = {}
+
+    def get_or_create_child(self, segment: str) -> "RouteNode":
+        if "{" not in segment:
+            return self.static.setdefault(segment, RouteNode())
+
+        for matcher, child in self.dynamic:
+            if matcher.pattern == segment:
+                return child
+
+        child = RouteNode()
+        self.dynamic.append((Segment(segment), child))
+        # Segments mixing text and placeholders are more specific than a bare
+        # placeholder, typed placeholders are more specific than untyped ones,
+        # and a placeholder that swallows the rest of the path comes last.
+        self.dynamic.sort(
+            key=lambda item: (
+                item[0].is_catch_all,
+                item[0].name is not None,
+                type(item[0].converter) is PathConverter,
+            )
+        )
+        return child
+
+
+class Router:
+    """
+    Segment trie of the registered routes.
+
+    Routes are compiled once when they are added, so resolving a path costs
+    one dictionary lookup per segment instead of a regex per route. Static
+    segments are always tried before placeholders.
+    """
+
+    def __init__(self):
+        self.root = RouteNode()
+
+    def add_route(
+        self,
+        path: str,
+        method: str,
+        handler: Callable,
+        middleware: Sequence[Callable] = (),
+        exclude_middleware: Sequence[Any] = (),
+        max_body_size: Optional[int] = None,
+    ) -> Route:
+        node = self.root
+        for segment in path.split("/"):
+            node = node.get_or_create_child(segment)
+
+        route = Route(
+            path, method, handler, middleware, exclude_middleware, max_body_size
+        )
+        node.routes[method] = route
+        return route
+
+    def resolve(self, method: str, path: str) -> RouteResolution:
+        """
+        Resolve a request to its route, or to the status explaining why not.
+
+        HEAD requests fall back to the GET route. When no route exists for the
+        method, the methods registered for the path decide between 404, 405
+        and an automatic OPTIONS answer.
+        """
+        match = self.match(method, path)
+        if match is None and method == HttpMethod.HEAD.value:
+            match = self.match(HttpMethod.GET.value, path)
+
+        if match is not None:
+            route, params = match
+            return RouteResolution(HTTPStatus.OK, route, params)
+
+        allowed_methods = self.allowed_methods(path)
+        if not allowed_methods:
+            return RouteResolution(HTTPStatus.NOT_FOUND)
+        if method == HttpMethod.OPTIONS.value:
+            return RouteResolution(
+                HTTPStatus.NO_CONTENT, allowed_methods=allowed_methods
+            )
+        return RouteResolution(
+            HTTPStatus.METHOD_NOT_ALLOWED, allowed_methods=allowed_methods
+        )
+
+    def match(self, method: str, path: str) -> Optional[Tuple[Route, Dict[str, Any]]]:
+        params: Dict[str, Any] = {}
+        route = self._match(self.root, path.split("/"), 0, method, params)
+        if route is None:
+            return None
+        return route, params
+
+    def _match(
+        self,
+        node: RouteNode,
+        segments: List[str],
+        index: int,
+        method: str,
+        params: Dict[str, Any],
+    ) -> Optional[Route]:
+        if index == len(segments):
+            return node.routes.get(method)
+
+        segment = segments[index]
+
+        child = node.static.get(segment)
+        if child is not None:
+            route = self._match(child, segments, index + 1, method, params)
+            if route is not None:
+                return route
+
+        for matcher, child in node.dynamic:
+            if matcher.is_catch_all:
+                route = self._match_rest(matcher, child, segments, index, method)
+                if route is not None:
+                    params.update(route[1])
+                    return route[0]
+                continue
+
+            values = matcher.match(segment)
+            if values is None:
+                continue
+            route = self._match(child, segments, index + 1, method, params)
+            if route is not None:
+                params.update(values)
+                return route
+
+        return None
+
+    def _match_rest(
+        self,
+        matcher: Segment,
+        node: RouteNode,
+        segments: List[str],
+        index: int,
+        method: str,
+    ) -> Optional[Tuple[Route, Dict[str, Any]]]:
+        # Prefer the longest remainder, giving back segments to whatever
+        # follows the placeholder in the route.
+        for end in range(len(segments), index, -1):
+            value = "/".join(segments[index:end])
+            if not value:
+                continue
+            params: Dict[str, Any] = {}
+            route = self._match(node, segments, end, method, params)
+            if route is not None:
+                params[matcher.name] = value
+                return route, params
+        return None
+
+    def allowed_methods(self, path: str) -> FrozenSet[str]:
+        """Return the methods of every route whose pattern matches the path."""
+        methods: Set[str] = set()
+        self._collect_methods(self.root, path.split("/"), 0, methods)
+        return frozenset(methods)
+
+    def _collect_methods(
+        self, node: RouteNode, segments: List[str], index: int, methods: Set[str]
+    ) -> None:
+        if index == len(segments):
+            methods.update(node.routes)
+            return
+
+        child = node.static.get(segments[index])
+        if child is not None:
+            self._collect_methods(child, segments, index + 1, methods)
+
+        for matcher, child in node.dynamic:
+            if matcher.is_catch_all:
+                for end in range(len(segments), index, -1):
+                    if "/".join(segments[index:end]):
+                        self._collect_methods(child, segments, end, methods)
+            elif matcher.match(segments[index]) is not None:
+                self._collect_methods(child, segments, index + 1, methods)
@@ -0,0 +1,366 @@
+import asyncio
+import email.utils
+import functools
+import hashlib
+import json
+import os
+import stat
+from http import HTTPStatus
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from inspira.constants import STATIC_DIST_DIRECTORY, STATIC_MANIFEST_FILE
+from inspira.datastructures import Headers
+from inspira.helpers.error_handlers import handle_method_not_allowed, handle_not_found
+from inspira.responses import FileResponse, HttpResponse, guess_content_type
+from inspira.utils.lru_cache import LRUCache
+
+# Precompressed siblings, in order of preference.
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+ALLOWED_METHODS = "GET, HEAD"
+
+HASH_CHUNK_SIZE = 256 * 1024
+
+# Fingerprinted files never change, so they may be cached for a year.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    """Read the manifest written by ``inspira static build``, if any."""
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+@functools.lru_cache(maxsize=64)
+def accepted_encodings(accept_encoding: str) -> FrozenSet[str]:
+    """Return the content codings an ``Accept-Encoding`` header allows."""
+    encodings = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                continue
+        if coding and quality > 0:
+            encodings.add(coding)
+    return frozenset(encodings)
+
+
+class StaticFile:
+    """An indexed file and its precompressed siblings."""
+
+    __slots__ = (
+        "path",
+        "stat_result",
+        "content_type",
+        "last_modified",
+        "etag",
+        "encodings",
+        "not_modified",
+    )
+
+    def __init__(self, path: str, stat_result: os.stat_result, content_type: str):
+        self.path = path
+        self.stat_result = stat_result
+        self.content_type = content_type
+        self.last_modified = email.utils.formatdate(stat_result.st_mtime, usegmt=True)
+        # Set by StaticFiles the first time the file is served.
+        self.etag: Optional[str] = None
+        self.encodings: Dict[str, "StaticFile"] = {}
+        self.not_modified: Optional[HttpResponse] = None
+
+    @property
+    def size(self) -> int:
+        return self.stat_result.st_size
+
+    def signature(self) -> Tuple[Any, ...]:
+        return (
+            self.stat_result.st_mtime_ns,
+            self.stat_result.st_size,
+            tuple(
+                (encoding, sibling.signature())
+                for encoding, sibling in self.encodings.items()
+            ),
+        )
+
+
+class StaticFiles:
+    """
+    ASGI application serving the files of a directory under a URL prefix.
+
+    The directory is indexed once, when the application is created, so
+    serving a file needs no ``stat`` or MIME type lookup, and unknown paths
+    are rejected without touching the disk. Files up to
+    ``cache_max_file_size`` bytes are kept, as pre-encoded responses, in an
+    LRU cache of ``cache_size`` entries, and get an ETag hashed from their
+    content the first time they are served. Larger files are streamed with
+    ``FileResponse``, which also answers ``Range`` requests, and get an ETag
+    built from their modification time and size, so they are never read
+    just to be hashed.
+
+    ``If-None-Match`` and ``If-Modified-Since`` are answered with 304, and a
+    ``.br`` or ``.gz`` sibling of a file is sent instead when the client
+    accepts that encoding. ``max_age`` adds a ``Cache-Control`` header.
+    Files fingerprinted by ``inspira static build`` are sent with an
+    immutable one instead, and ``url_for`` resolves names through its
+    manifest.
+
+    With ``auto_reload`` every request checks the file on disk, so files
+    added or changed after startup are picked up; use it in development.
+    """
+
+    def __init__(
+        self,
+        directory: str = "static",
+        prefix: str = "/static",
+        cache_size: int = 256,
+        cache_max_file_size: int = 64 * 1024,
+        max_age: Optional[int] = None,
+        auto_reload: bool = False,
+    ):
+        self.directory = os.path.realpath(directory)
+        self.prefix = "/" + prefix.strip("/")
+        self.cache_max_file_size = cache_max_file_size
+        self.max_age = max_age
+        self.auto_reload = auto_reload
+        self.responses = LRUCache(cache_size)
+        self.files: Dict[str, StaticFile] = {}
+        self.manifest: Dict[str, str] = {}
+        self.fingerprinted: FrozenSet[str] = frozenset()
+        self.index()
+
+    def index(self) -> None:
+        """(Re)build the index of the directory and empty the cache."""
+        files = {}
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                relative_path = os.path.relpath(
+                    os.path.join(root, name), self.directory
+                )
+                relative_path = relative_path.replace(os.sep, "/")
+                static_file = self.load_file(relative_path)
+                if static_file is not None:
+                    files[relative_path] = static_file
+        self.files = files
+        self.responses.clear()
+
+        self.manifest = load_manifest(
+            os.path.join(self.directory, STATIC_DIST_DIRECTORY, STATIC_MANIFEST_FILE)
+        )
+        self.fingerprinted = frozenset(
+            f"{STATIC_DIST_DIRECTORY}/{hashed_name}"
+            for hashed_name in self.manifest.values()
+        )
+
+    def url_for(self, name: str) -> str:
+        """
+        Return the URL of a static file, the fingerprinted one if the file is
+        in the build manifest.
+        """
+        name = name.lstrip("/")
+        hashed_name = self.manifest.get(name)
+        if hashed_name is not None:
+            return f"{self.prefix}/{STATIC_DIST_DIRECTORY}/{hashed_name}"
+        return f"{self.prefix}/{name}"
+
+    def load_file(self, relative_path: str) -> Optional[StaticFile]:
+        path = os.path.realpath(os.path.join(self.directory, relative_path))
+        # Symlinks may not lead out of the directory.
+        if not path.startswith(self.directory + os.sep):
+            return None
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        static_file = StaticFile(path, stat_result, guess_content_type(path))
+        for encoding, suffix in ENCODING_SUFFIXES:
+            sibling = self.load_file(relative_path + suffix)
+            if sibling is not None:
+                sibling.content_type = static_file.content_type
+                static_file.encodings[encoding] = sibling
+        return static_file
+
+    def is_static_path(self, path: str) -> bool:
+        return path == self.prefix or path.startswith(self.prefix + "/")
+
+    def relative_path(self, path: str) -> Optional[str]:
+        relative_path = path[len(self.prefix) + 1 :]
+        if not relative_path or "\\" in relative_path or "\x00" in relative_path:
+            return None
+        for segment in relative_path.split("/"):
+            if segment in ("", ".", ".."):
+                return None
+        return relative_path
+
+    async def lookup(self, relative_path: Optional[str]) -> Optional[StaticFile]:
+        if relative_path is None:
+            return None
+        if not self.auto_reload:
+            return self.files.get(relative_path)
+
+        static_file = await asyncio.to_thread(self.load_file, relative_path)
+        current = self.files.get(relative_path)
+        if static_file is None:
+            self.files.pop(relative_path, None)
+        elif current is None or current.signature() != static_file.signature():
+            self.files[relative_path] = static_file
+            for encoding in (None, *dict(ENCODING_SUFFIXES)):
+                self.responses.pop((relative_path, encoding))
+        else:
+            static_file = current
+        return static_file
+
+    async def __call__(
+        self, scope: Dict[str, Any], receive: Callable, send: Callable
+    ) -> None:
+        if scope["method"] not in ("GET", "HEAD"):
+            await handle_method_not_allowed(scope, receive, send, ALLOWED_METHODS)
+            return
+
+        relative_path = self.relative_path(scope["path"])
+        static_file = await self.lookup(relative_path)
+        if static_file is None:
+            await handle_not_found(scope, receive, send)
+            return
+
+        request_headers = Headers(scope.get("headers"))
+        encoding, representation = self.negotiate(
+            static_file, request_headers.get("accept-encoding")
+        )
+        if representation.etag is None:
+            if representation.size > self.cache_max_file_size:
+                self.compute_stat_etag(representation)
+            else:
+                await asyncio.to_thread(self.compute_etag, representation)
+
+        if self.is_not_modified(request_headers, representation):
+            if representation.not_modified is None:
+                representation.not_modified = HttpResponse(
+                    status_code=HTTPStatus.NOT_MODIFIED,
+                    content_type=representation.content_type,
+                    headers=self.response_headers(
+                        relative_path, static_file, representation, encoding
+                    ),
+                ).freeze()
+            await representation.not_modified(scope, receive, send)
+            return
+
+        if (
+            scope["method"] == "GET"
+            and "range" not in request_headers
+            and representation.size <= self.cache_max_file_size
+        ):
+            response = await self.cached_response(
+                relative_path, static_file, representation, encoding
+            )
+        else:
+            response = FileResponse(
+                representation.path,
+                content_type=representation.content_type,
+                headers=self.response_headers(
+                    relative_path, static_file, representation, encoding
+                ),
+                stat_result=representation.stat_result,
+            )
+        await response(scope, receive, send)
+
+    @staticmethod
+    def negotiate(
+        static_file: StaticFile, accept_encoding: Optional[str]
+    ) -> Tuple[Optional[str], StaticFile]:
+        if static_file.encodings and accept_encoding:
+            accepted = accepted_encodings(accept_encoding)
+            for encoding, _ in ENCODING_SUFFIXES:
+                if encoding in accepted and encoding in static_file.encodings:
+                    return encoding, static_file.encodings[encoding]
+        return None, static_file
+
+    @staticmethod
+    def compute_etag(static_file: StaticFile) -> None:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(static_file.path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        static_file.etag = f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def compute_stat_etag(static_file: StaticFile) -> None:
+        stat_result = static_file.stat_result
+        static_file.etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+    @staticmethod
+    def is_not_modified(request_headers: Headers, static_file: StaticFile) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison, as required for If-None-Match.
+            if if_none_match.strip() == "*":
+                return True
+            return static_file.etag in (
+                tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+            )
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return int(static_file.stat_result.st_mtime) <= since.timestamp()
+        return False
+
+    def response_headers(
+        self,
+        relative_path: str,
+        static_file: StaticFile,
+        representation: StaticFile,
+        encoding: Optional[str],
+    ) -> Dict[str, str]:
+        headers = {
+            "etag": representation.etag,
+            "last-modified": representation.last_modified,
+        }
+        if relative_path in self.fingerprinted:
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        elif self.max_age is not None:
+            headers["cache-control"] = f"public, max-age={self.max_age}"
+        if static_file.encodings:
+            headers["vary"] = "Accept-Encoding"
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        return headers
+
+    async def cached_response(
+        self,
+        relative_path: str,
+        static_file: StaticFile,
+        representation: StaticFile,
+        encoding: Optional[str],
+    ) -> HttpResponse:
+        key = (relative_path, encoding)
+        response = self.responses.get(key)
+        if response is None:
+            body = await asyncio.to_thread(read_file, representation.path)
+            response = HttpResponse(
+                body,
+                content_type=representation.content_type,
+                headers=self.response_headers(
+                    relative_path, static_file, representation, encoding
+                ),
+            ).freeze()
+            self.responses.set(key, response)
+        return response
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
@@ -0,0 +1,91 @@
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from inspira.globals import get_global_app
+
+
+class Templates:
+    """
+    Jinja2 environments shared by every render, one per template directory.
+
+    Keeping the environment keeps Jinja's cache of compiled templates, so a
+    template is only lexed, parsed and compiled once. Compiled templates are
+    also written to a ``FileSystemBytecodeCache`` when ``bytecode_cache`` is
+    set, which speeds up the first render after a restart; the cache lives
+    in ``bytecode_cache_dir``, or in a temporary directory by default.
+
+    With ``auto_reload`` off, template files are not checked for changes
+    after they have been loaded; turn it on in development.
+
+    Filters and globals added through ``add_filter`` and ``add_global`` are
+    available in every environment, and the hooks added through
+    ``add_environment_hook`` are called with each new environment.
+    """
+
+    def __init__(
+        self,
+        auto_reload: bool = False,
+        bytecode_cache: bool = True,
+        bytecode_cache_dir: Optional[str] = None,
+    ):
+        self.auto_reload = auto_reload
+        self.bytecode_cache = (
+            FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache else None
+        )
+        self.environments: Dict[str, Environment] = {}
+        self.filters: Dict[str, Callable] = {}
+        self.globals: Dict[str, Any] = {}
+        self.environment_hooks: List[Callable[[Environment], None]] = []
+
+    def get_environment(self, template_dir: str) -> Environment:
+        environment = self.environments.get(template_dir)
+        if environment is None:
+            environment = self.create_environment(template_dir)
+            self.environments[template_dir] = environment
+        return environment
+
+    def create_environment(self, template_dir: str) -> Environment:
+        environment = Environment(
+            loader=FileSystemLoader(os.path.abspath(template_dir)),
+            auto_reload=self.auto_reload,
+            bytecode_cache=self.bytecode_cache,
+        )
+        environment.filters.update(self.filters)
+        environment.globals.update(self.globals)
+        for hook in self.environment_hooks:
+            hook(environment)
+        return environment
+
+    def add_filter(self, name: str, function: Callable) -> Callable:
+        self.filters[name] = function
+        for environment in self.environments.values():
+            environment.filters[name] = function
+        return function
+
+    def add_global(self, name: str, value: Any) -> Any:
+        self.globals[name] = value
+        for environment in self.environments.values():
+            environment.globals[name] = value
+        return value
+
+    def add_environment_hook(
+        self, hook: Callable[[Environment], None]
+    ) -> Callable[[Environment], None]:
+        self.environment_hooks.append(hook)
+        for environment in self.environments.values():
+            hook(environment)
+        return hook
+
+
+# Used when templates are rendered without an app, as in unit tests.
+default_templates = Templates(bytecode_cache=False)
+
+
+def get_templates() -> Templates:
+    """Return the templates of the app, or the default ones without an app."""
+    app = get_global_app()
+    if app is None:
+        return default_templates
+    return app.templates
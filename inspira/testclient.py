@@ -30,3 +30,6 @@ class TestClient:
 
     async def options(self, path, **kwargs):
         return await self.request(HttpMethod.OPTIONS.value, path, **kwargs)
+
+    async def head(self, path, **kwargs):
+        return await self.request(HttpMethod.HEAD.value, path, **kwargs)
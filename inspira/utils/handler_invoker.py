@@ -1,25 +1,106 @@
 import inspect
-from typing import Any, Dict
+import typing
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 from inspira.requests import Request
-from inspira.utils.param_converter import convert_param_type
+from inspira.utils.param_converter import InvalidParameter, get_param_converter
 
+REQUEST = 0
+SCOPE = 1
+PARAM = 2
+PARAM_LIST = 3
 
-async def invoke_handler(handler, request: Request, scope: Dict[str, Any], params=None):
-    handler_signature = inspect.signature(handler)
-    handler_params = {}
-    for param_name, param in handler_signature.parameters.items():
+# The default of a parameter that has none.
+REQUIRED = inspect.Parameter.empty
+
+InvocationPlan = Tuple[Tuple[str, int, Optional[Callable], Any], ...]
+
+
+def build_invocation_plan(
+    handler: Callable, converted_params: Iterable[str] = ()
+) -> InvocationPlan:
+    """
+    Inspect the handler signature once and describe how to bind each argument.
+
+    Each entry is ``(name, kind, converter, default)``; ``converter`` and
+    ``default`` are only used for path and query parameters, and ``default``
+    is ``REQUIRED`` when the parameter has none. Parameters listed in
+    ``converted_params`` are already typed by the router and get no
+    converter. Parameters annotated as ``List[...]`` collect every value of a
+    repeated query parameter. ``*args`` and ``**kwargs`` are not bound.
+    """
+    plan = []
+    for param_name, param in inspect.signature(handler).parameters.items():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
         if param_name == "request":
-            handler_params["request"] = request
+            plan.append((param_name, REQUEST, None, None))
         elif param_name == "scope":
-            handler_params["scope"] = scope
-        elif param_name in params:
-            handler_params[param_name] = convert_param_type(
-                params[param_name], param.annotation
-            )
-        elif param.default != inspect.Parameter.empty:
-            handler_params[param_name] = param.default
+            plan.append((param_name, SCOPE, None, None))
         else:
-            handler_params[param_name] = None
+            default = param.default
+            if typing.get_origin(param.annotation) is list:
+                item_types = typing.get_args(param.annotation)
+                converter = get_param_converter(item_types[0] if item_types else None)
+                plan.append((param_name, PARAM_LIST, converter, default))
+                continue
+
+            converter = (
+                None
+                if param_name in converted_params
+                else get_param_converter(param.annotation)
+            )
+            plan.append((param_name, PARAM, converter, default))
+    return tuple(plan)
+
+
+async def invoke_handler(
+    handler,
+    request: Request,
+    scope: Dict[str, Any],
+    params=None,
+    plan: InvocationPlan = None,
+):
+    """
+    Call the handler with its arguments bound from the request.
+
+    Parameters that are not path parameters are looked up in the query
+    string, which is parsed at most once per request. Raises
+    ``InvalidParameter`` when a parameter without a default is missing or a
+    value cannot be converted to the annotated type.
+    """
+    if plan is None:
+        plan = build_invocation_plan(handler)
+
+    handler_params = {}
+    try:
+        for param_name, kind, converter, default in plan:
+            if kind == REQUEST:
+                handler_params[param_name] = request
+            elif kind == SCOPE:
+                handler_params[param_name] = scope
+            elif params and param_name in params:
+                value = params[param_name]
+                handler_params[param_name] = converter(value) if converter else value
+            elif kind == PARAM_LIST:
+                values = request.query_params.getlist(param_name)
+                if values:
+                    handler_params[param_name] = [converter(value) for value in values]
+                elif default is REQUIRED:
+                    raise InvalidParameter(f"Missing parameter '{param_name}'")
+                else:
+                    handler_params[param_name] = default
+            else:
+                value = request.query_params.get(param_name)
+                if value is not None:
+                    handler_params[param_name] = (
+                        converter(value) if converter else value
+                    )
+                elif default is REQUIRED:
+                    raise InvalidParameter(f"Missing parameter '{param_name}'")
+                else:
+                    handler_params[param_name] = default
+    except (TypeError, ValueError):
+        raise InvalidParameter(f"Invalid value for parameter '{param_name}'") from None
 
     return await handler(**handler_params)
@@ -0,0 +1,119 @@
+import dataclasses
+import datetime
+import decimal
+import functools
+import json
+import uuid
+from typing import Any, Dict, Type
+
+from inspira.globals import get_global_app
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+def json_default(obj: Any) -> Any:
+    """Convert the types the JSON libraries do not all handle natively."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, decimal.Decimal):
+        # Kept as a string so no precision is lost.
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """
+    Compact JSON encoding shared by requests, responses, sessions and
+    WebSockets.
+
+    ``dumps`` always returns bytes and ``loads`` accepts bytes or str.
+    datetime, date, time, UUID, Decimal and dataclass values are encoded the
+    same way by every codec.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=json_default).encode()
+
+    def loads(self, data: Any) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=json_default)
+        except TypeError:
+            # Non-string keys are only converted on request, as it is slower.
+            return orjson.dumps(
+                obj, default=json_default, option=orjson.OPT_NON_STR_KEYS
+            )
+
+    def loads(self, data: Any) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        self.encoder = msgspec.json.Encoder(enc_hook=json_default)
+        self.decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.encoder.encode(obj)
+
+    def loads(self, data: Any) -> Any:
+        return self.decoder.decode(data)
+
+
+JSON_CODECS: Dict[str, Type[JSONCodec]] = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+JSON_CODEC_MODULES = {"orjson": orjson, "msgspec": msgspec}
+
+
+@functools.lru_cache(maxsize=None)
+def load_json_codec(name: str = "auto") -> JSONCodec:
+    """
+    Return the codec for a ``JSON_CODEC`` config value.
+
+    ``auto`` picks orjson, then msgspec, whichever is installed, and falls
+    back to the standard library.
+    """
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            if JSON_CODEC_MODULES[candidate] is not None:
+                return JSON_CODECS[candidate]()
+        return JSONCodec()
+
+    if name not in JSON_CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if name in JSON_CODEC_MODULES and JSON_CODEC_MODULES[name] is None:
+        raise ValueError(f"JSON codec '{name}' requires the {name} package")
+    return JSON_CODECS[name]()
+
+
+def get_json_codec() -> JSONCodec:
+    """Return the codec selected by the ``JSON_CODEC`` config of the app."""
+    app = get_global_app()
+    name = app.config["JSON_CODEC"] if app is not None else None
+    return load_json_codec(name or "auto")
@@ -0,0 +1,233 @@
+import re
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from inspira.constants import UTF8
+
+DEFAULT_SPOOL_MAX_SIZE = 1024 * 1024
+DEFAULT_MAX_FIELD_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 16 * 1024
+
+PARAM_REGEX = re.compile(r';\s*([^\s=;]+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;]*))')
+
+PREAMBLE, AFTER_BOUNDARY, HEADERS, BODY, END = range(5)
+
+
+class MultipartError(ValueError):
+    pass
+
+
+class UploadedFile:
+    """
+    A file received in a multipart form.
+
+    The content is kept in memory up to ``spool_max_size`` bytes and rolls
+    over to a temporary file on disk after that.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        content_type: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+    ):
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.size = 0
+        self.file = SpooledTemporaryFile(max_size=spool_max_size)
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    def seek(self, offset: int) -> None:
+        self.file.seek(offset)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def in_memory(self) -> bool:
+        return not self.file._rolled
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(filename={self.filename!r}, "
+            f"content_type={self.content_type!r}, size={self.size})"
+        )
+
+
+def parse_options_header(value: str) -> Tuple[str, Dict[str, str]]:
+    """Split a header such as Content-Disposition into its value and params."""
+    main_value, _, params = value.partition(";")
+    options = {}
+    for match in PARAM_REGEX.finditer(";" + params):
+        name, quoted, token = match.groups()
+        if quoted is not None:
+            options[name.lower()] = re.sub(r"\\(.)", r"\1", quoted)
+        else:
+            options[name.lower()] = token.strip()
+    return main_value.strip().lower(), options
+
+
+class MultipartParser:
+    """
+    Incremental ``multipart/form-data`` parser.
+
+    Data is fed in chunks of any size through ``feed``. Only the bytes that
+    could still be part of a boundary are held back between chunks, so file
+    content goes straight into ``UploadedFile`` objects and memory use does
+    not grow with the size of the upload. Text fields are decoded with the
+    given charset and are held in memory, so a field larger than
+    ``max_field_size`` bytes raises ``MultipartError``; file content is
+    written untouched.
+    """
+
+    def __init__(
+        self,
+        boundary: Union[str, bytes],
+        spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+        charset: str = UTF8,
+        max_field_size: int = DEFAULT_MAX_FIELD_SIZE,
+    ):
+        if isinstance(boundary, str):
+            boundary = boundary.encode("latin-1")
+        self.delimiter = b"\r\n--" + boundary
+        self.spool_max_size = spool_max_size
+        self.charset = charset
+        self.max_field_size = max_field_size
+        self.state = PREAMBLE
+        # The first boundary is not preceded by a line break of its own.
+        self.buffer = bytearray(b"\r\n")
+        self.fields: Dict[str, Any] = {}
+        self.part_name: Optional[str] = None
+        self.part_file: Optional[UploadedFile] = None
+        self.part_data: List[bytes] = []
+        self.part_size = 0
+
+    def feed(self, data: Union[bytes, memoryview]) -> None:
+        buffer = self.buffer
+        buffer += data
+        delimiter = self.delimiter
+        keep = len(delimiter) - 1
+
+        while True:
+            if self.state == BODY:
+                index = buffer.find(delimiter)
+                if index == -1:
+                    if len(buffer) > keep:
+                        self._write_part(buffer, len(buffer) - keep)
+                        del buffer[: len(buffer) - keep]
+                    return
+                self._write_part(buffer, index)
+                self._finish_part()
+                del buffer[: index + len(delimiter)]
+                self.state = AFTER_BOUNDARY
+
+            elif self.state == AFTER_BOUNDARY:
+                if len(buffer) < 2:
+                    return
+                if buffer[:2] == b"--":
+                    self.state = END
+                elif buffer[:2] == b"\r\n":
+                    self.state = HEADERS
+                else:
+                    raise MultipartError("Invalid data after multipart boundary")
+
+            elif self.state == HEADERS:
+                # The buffer still starts with the line break ending the
+                # boundary, so a part without headers is found as well.
+                index = buffer.find(b"\r\n\r\n")
+                if index == -1:
+                    if len(buffer) > MAX_HEADER_SIZE:
+                        raise MultipartError("Multipart part headers are too large")
+                    return
+                self._start_part(bytes(buffer[2:index]))
+                del buffer[: index + 4]
+                self.state = BODY
+
+            elif self.state == PREAMBLE:
+                index = buffer.find(delimiter)
+                if index == -1:
+                    del buffer[: max(len(buffer) - keep, 0)]
+                    return
+                del buffer[: index + len(delimiter)]
+                self.state = AFTER_BOUNDARY
+
+            else:
+                buffer.clear()
+                return
+
+    def close(self) -> Dict[str, Any]:
+        """Check the multipart body was complete and return the fields."""
+        if self.state != END:
+            if self.part_file is not None:
+                self.part_file.close()
+            raise MultipartError("Multipart body ended before the closing boundary")
+        return self.fields
+
+    def _start_part(self, header_block: bytes) -> None:
+        try:
+            header_lines = header_block.decode(self.charset).split("\r\n")
+        except UnicodeDecodeError:
+            raise MultipartError("Multipart part headers are not valid text")
+
+        headers = {}
+        for line in header_lines:
+            name, separator, value = line.partition(":")
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+
+        disposition, options = parse_options_header(
+            headers.get("content-disposition", "")
+        )
+        if disposition != "form-data" or "name" not in options:
+            raise MultipartError("Multipart part without a form-data name")
+
+        self.part_name = options["name"]
+        if "filename" in options:
+            self.part_file = UploadedFile(
+                options["filename"],
+                headers.get("content-type"),
+                headers,
+                self.spool_max_size,
+            )
+        else:
+            self.part_file = None
+            self.part_data = []
+            self.part_size = 0
+
+    def _write_part(self, buffer: bytearray, end: int) -> None:
+        if not end:
+            return
+        with memoryview(buffer) as view:
+            if self.part_file is not None:
+                self.part_file.write(view[:end])
+            else:
+                self.part_size += end
+                if self.part_size > self.max_field_size:
+                    raise MultipartError("Multipart text field is too large")
+                self.part_data.append(bytes(view[:end]))
+
+    def _finish_part(self) -> None:
+        if self.part_name is None:
+            return
+
+        if self.part_file is not None:
+            self.part_file.seek(0)
+            self.fields[self.part_name] = self.part_file
+        else:
+            value = b"".join(self.part_data)
+            try:
+                self.fields[self.part_name] = value.decode(self.charset)
+            except UnicodeDecodeError:
+                raise MultipartError("Multipart text field is not valid text")
+
+        self.part_name = None
+        self.part_file = None
+        self.part_data = []
+        self.part_size = 0
@@ -1,4 +1,13 @@
 import inspect
+import re
+import uuid
+from typing import Any, Callable, Dict
+
+from inspira.datastructures import parse_bool
+
+
+class InvalidParameter(Exception):
+    """Raised when a handler parameter is missing or cannot be converted."""
 
 
 def convert_param_type(value, param_type):
@@ -8,3 +17,72 @@ def convert_param_type(value, param_type):
         return param_type(value)
     except ValueError:
         return value
+
+
+def get_param_converter(param_type) -> Callable[[Any], Any]:
+    """Return the callable converting a raw string, raising ValueError if invalid."""
+    if param_type is None or param_type == inspect.Parameter.empty:
+        return str
+    if param_type is bool:
+        # bool("false") is True, so booleans are parsed from their spelling.
+        return parse_bool
+    return param_type
+
+
+class PathConverter:
+    regex = "[^/]+"
+
+    def convert(self, value: str) -> Any:
+        if not value:
+            raise ValueError("Empty path segment")
+        return value
+
+
+class IntegerConverter(PathConverter):
+    regex = "[0-9]+"
+
+    def convert(self, value: str) -> int:
+        if not (value.isascii() and value.isdigit()):
+            raise ValueError(f"Invalid integer: {value!r}")
+        return int(value)
+
+
+class FloatConverter(PathConverter):
+    regex = r"[0-9]+(?:\.[0-9]+)?"
+    pattern = re.compile(regex)
+
+    def convert(self, value: str) -> float:
+        if not self.pattern.fullmatch(value):
+            raise ValueError(f"Invalid float: {value!r}")
+        return float(value)
+
+
+class UUIDConverter(PathConverter):
+    regex = (
+        "[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-" "[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    )
+
+    def convert(self, value: str) -> uuid.UUID:
+        if len(value) != 36:
+            raise ValueError(f"Invalid UUID: {value!r}")
+        return uuid.UUID(value)
+
+
+class RestOfPathConverter(PathConverter):
+    regex = ".+"
+
+
+PATH_CONVERTERS: Dict[str, PathConverter] = {
+    "str": PathConverter(),
+    "int": IntegerConverter(),
+    "float": FloatConverter(),
+    "uuid": UUIDConverter(),
+    "path": RestOfPathConverter(),
+}
+
+
+def get_path_converter(name: str) -> PathConverter:
+    try:
+        return PATH_CONVERTERS[name or "str"]
+    except KeyError:
+        raise ValueError(f"Unknown path converter '{name}'") from None
@@ -0,0 +1,211 @@
+import abc
+import copy
+import os
+import re
+import secrets
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, delete, select
+
+from inspira.utils.json_codec import get_json_codec
+from inspira.utils.lru_cache import LRUCache
+
+SESSION_ID_REGEX = re.compile(r"[A-Za-z0-9_-]{16,128}")
+
+
+def generate_session_id() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    return bool(session_id) and SESSION_ID_REGEX.fullmatch(session_id) is not None
+
+
+class SessionStore(abc.ABC):
+    """
+    Server-side storage for session data keyed by an opaque session id.
+
+    Used by ``SessionMiddleware(store=...)``, in which case the session cookie
+    only carries the id. The middleware calls the methods of ``blocking``
+    stores, which do file or network I/O, in a worker thread.
+    """
+
+    blocking = True
+
+    @abc.abstractmethod
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abc.abstractmethod
+    def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def purge_expired(self) -> int:
+        """Remove expired sessions and return how many were removed."""
+
+
+class MemorySessionStore(SessionStore):
+    """Bounded in-process store; the least recently used sessions are evicted."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 10000):
+        self.sessions = LRUCache(max_entries)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if expires_at <= time.time():
+            self.sessions.pop(session_id)
+            return None
+
+        return copy.deepcopy(data)
+
+    def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        self.sessions.set(session_id, (time.time() + max_age, copy.deepcopy(data)))
+
+    def delete(self, session_id: str) -> None:
+        self.sessions.pop(session_id)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = [
+            session_id
+            for session_id, (expires_at, _) in self.sessions.items()
+            if expires_at <= now
+        ]
+        for session_id in expired:
+            self.sessions.pop(session_id)
+        return len(expired)
+
+
+class FileSessionStore(SessionStore):
+    """
+    Stores each session in its own file, so a write never rewrites the data of
+    other sessions. Files are replaced atomically.
+    """
+
+    def __init__(self, directory: str = "sessions"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as file:
+                return get_json_codec().loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_session_id(session_id):
+            return None
+
+        entry = self._read(self._get_path(session_id))
+        if entry is None or entry["expires_at"] <= time.time():
+            return None
+
+        return entry["data"]
+
+    def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        path = self._get_path(session_id)
+        temp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        entry = {"expires_at": time.time() + max_age, "data": data}
+        with open(temp_path, "wb") as file:
+            file.write(get_json_codec().dumps(entry))
+        os.replace(temp_path, path)
+
+    def delete(self, session_id: str) -> None:
+        if not is_valid_session_id(session_id):
+            return
+
+        try:
+            os.remove(self._get_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        removed = 0
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(".json"):
+                continue
+
+            path = os.path.join(self.directory, file_name)
+            entry = self._read(path)
+            if entry is None or entry["expires_at"] <= now:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+class DatabaseSessionStore(SessionStore):
+    """
+    Stores sessions in a table through SQLAlchemy.
+
+    Without an explicit engine, the engine from the project's ``database.py``
+    is used, the same one the migrations run against.
+    """
+
+    def __init__(self, engine=None, table_name: str = "sessions"):
+        if engine is None:
+            from inspira.migrations.migrations import engine
+
+        self.engine = engine
+        metadata = MetaData()
+        self.table = Table(
+            table_name,
+            metadata,
+            Column("id", String(128), primary_key=True),
+            Column("data", Text, nullable=False),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        metadata.create_all(engine)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_session_id(session_id):
+            return None
+
+        query = select(self.table.c.data).where(
+            self.table.c.id == session_id, self.table.c.expires_at > time.time()
+        )
+        with self.engine.connect() as connection:
+            data = connection.execute(query).scalar()
+
+        return get_json_codec().loads(data) if data is not None else None
+
+    def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.id == session_id))
+            connection.execute(
+                self.table.insert().values(
+                    id=session_id,
+                    data=get_json_codec().dumps(data).decode(),
+                    expires_at=time.time() + max_age,
+                )
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.id == session_id))
+
+    def purge_expired(self) -> int:
+        with self.engine.begin() as connection:
+            result = connection.execute(
+                delete(self.table).where(self.table.c.expires_at <= time.time())
+            )
+        return result.rowcount or 0
@@ -1,46 +1,169 @@
-import datetime
+import asyncio
+import functools
 import json
-from http.cookies import SimpleCookie
+import zlib
+from typing import Any, Optional
 
 from itsdangerous import URLSafeTimedSerializer
+from itsdangerous.encoding import base64_encode
+from itsdangerous.url_safe import URLSafeSerializerMixin
 
 from inspira.globals import get_global_app
 from inspira.logging import log
+from inspira.utils.json_codec import JSONCodec, json_default, get_json_codec
+
+
+class Session(dict):
+    """
+    Session data that records whether it was modified after being loaded.
+
+    ``token`` is the session cookie the data was decoded from, and ``invalid``
+    is set when that cookie could not be verified. Writes to the session set
+    ``modified``; ``is_modified()`` also finds values changed in place, such
+    as a list in the session that was appended to.
+    """
+
+    def __init__(self, data=None, token=None, invalid=False):
+        super().__init__(data or {})
+        self.token = token
+        self.invalid = invalid
+        self.modified = False
+        self.snapshot = self.encode()
+
+    def encode(self) -> Optional[bytes]:
+        try:
+            return get_json_codec().dumps(dict(self))
+        except (TypeError, ValueError):
+            return None
+
+    def is_modified(self) -> bool:
+        """Check whether the data changed since the session was loaded."""
+        if self.modified:
+            return True
+        # Data that cannot be encoded is never assumed to be unchanged.
+        current = self.encode()
+        return current is None or current != self.snapshot
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.modified = True
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.modified = True
+
+    def pop(self, key, default=None):
+        self.modified = True
+        return super().pop(key, default)
+
+    def popitem(self):
+        self.modified = True
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.modified = True
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.modified = True
+
+    def clear(self):
+        super().clear()
+        self.modified = True
 
 
 class DateTimeEncoder(json.JSONEncoder):
+    """
+    Standard library encoder for the values the JSON codecs handle natively.
+
+    Sessions are encoded with ``get_json_codec()``; this encoder is kept for
+    code that still calls ``json.dumps(..., cls=DateTimeEncoder)``.
+    """
+
     def default(self, obj):
-        if isinstance(obj, datetime.datetime):
-            return obj.isoformat()
-        return super().default(obj)
+        try:
+            return json_default(obj)
+        except TypeError:
+            return super().default(obj)
 
 
-def encode_session_data(session_data, secret_key):
-    expiration_time = datetime.datetime.utcnow() + datetime.timedelta(
-        seconds=get_global_app().config["SESSION_MAX_AGE"]
-    )
+class SessionSerializer(URLSafeTimedSerializer):
+    """
+    Signs the session payload in a single JSON pass.
+
+    Payloads are only zlib compressed when they are larger than
+    ``compress_threshold`` bytes, so small sessions skip the compression work.
+    """
+
+    compress_threshold = 512
+
+    def dump_payload(self, obj: Any) -> bytes:
+        # Skip the URL-safe mixin, which tries to compress every payload.
+        payload = super(URLSafeSerializerMixin, self).dump_payload(obj)
+        is_compressed = False
 
-    serializer = URLSafeTimedSerializer(secret_key)
+        if len(payload) > self.compress_threshold:
+            compressed = zlib.compress(payload)
+            if len(compressed) < len(payload) - 1:
+                payload = compressed
+                is_compressed = True
 
-    payload = {**session_data, "expiration_time": expiration_time}
+        encoded = base64_encode(payload)
+        return b"." + encoded if is_compressed else encoded
 
-    json_session_data = json.dumps(payload, cls=DateTimeEncoder)
 
-    session_token = serializer.dumps(json_session_data)
+def get_session_serializer(secret_key: str) -> SessionSerializer:
+    return build_session_serializer(secret_key, get_json_codec())
 
-    return session_token
+
+@functools.lru_cache(maxsize=8)
+def build_session_serializer(secret_key: str, codec: JSONCodec) -> SessionSerializer:
+    return SessionSerializer(secret_key, serializer=codec)
+
+
+def get_session_max_age() -> Optional[int]:
+    app = get_global_app()
+    return app.config["SESSION_MAX_AGE"] if app is not None else None
+
+
+def encode_session_data(session_data, secret_key):
+    # The JSON codec produces bytes, so the serializer returns bytes as well.
+    return get_session_serializer(secret_key).dumps(dict(session_data)).decode()
 
 
 def decode_session_data(session_token, secret_key):
     try:
-        serializer = URLSafeTimedSerializer(secret_key)
-        json_session_data = serializer.loads(session_token)
-        decoded_payload = json.loads(json_session_data)
-        return decoded_payload
+        session_data = get_session_serializer(secret_key).loads(
+            session_token, max_age=get_session_max_age()
+        )
     except Exception as e:
         log.error(f"Error decoding session: {e}")
         return None
 
+    if isinstance(session_data, str):
+        session_data = decode_legacy_session_data(session_data)
+
+    if not isinstance(session_data, dict):
+        log.error("Error decoding session: the payload is not an object")
+        return None
+
+    return session_data
+
+
+def decode_legacy_session_data(json_session_data):
+    # Older cookies signed the session as a JSON string that carried its own
+    # "expiration_time"; the signature timestamp is checked instead now.
+    try:
+        session_data = json.loads(json_session_data)
+    except ValueError:
+        return None
+
+    if isinstance(session_data, dict):
+        session_data.pop("expiration_time", None)
+    return session_data
+
 
 def get_or_create_session(request):
     session_cookie = get_session_token_from_request(
@@ -59,7 +182,60 @@ def get_or_create_session(request):
         log.error("No session in cookies")
 
 
+def load_session(request) -> Session:
+    app = get_global_app()
+    if app is None:
+        return Session()
+
+    session_cookie = get_session_token_from_request(
+        request, app.config["SESSION_COOKIE_NAME"]
+    )
+    if not session_cookie:
+        return Session()
+
+    if app.session_store is not None:
+        if app.session_store.blocking:
+            log.warning(
+                "Loading the session from a blocking store on the event loop; "
+                "use preload_session() to load it in a worker thread"
+            )
+        return load_stored_session(app.session_store, session_cookie)
+
+    session_data = decode_session_data(session_cookie, app.secret_key)
+    if session_data is None:
+        return Session(token=session_cookie, invalid=True)
+
+    return Session(session_data, token=session_cookie)
+
+
+def load_stored_session(store, session_id) -> Session:
+    session_data = store.load(session_id)
+    if session_data is None:
+        return Session()
+    return Session(session_data, token=session_id)
+
+
+async def preload_session(request) -> None:
+    """
+    Load the session of the request from a blocking store in a worker thread.
+
+    The app calls this before the middleware chain runs, so reading
+    ``request.session`` later never does blocking I/O on the event loop.
+    Sessions in non-blocking stores and in cookies are still loaded lazily.
+    """
+    app = get_global_app()
+    store = app.session_store if app is not None else None
+    if store is None or not store.blocking or request.is_session_loaded():
+        return
+
+    session_id = get_session_token_from_request(
+        request, app.config["SESSION_COOKIE_NAME"]
+    )
+    if session_id:
+        request.session = await asyncio.to_thread(
+            load_stored_session, store, session_id
+        )
+
+
 def get_session_token_from_request(request, session_cookie_name):
-    cookies = SimpleCookie(request.get_headers().get("cookie", ""))
-    token_cookie = cookies.get(session_cookie_name)
-    return token_cookie.value if token_cookie else None
+    return request.cookies().get(session_cookie_name) or None
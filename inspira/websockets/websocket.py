@@ -1,5 +1,3 @@
-import json
-
 from inspira.constants import (
     WEBSOCKET_ACCEPT_TYPE,
     WEBSOCKET_CLOSE_TYPE,
@@ -7,6 +5,7 @@ from inspira.constants import (
     WEBSOCKET_TYPE,
 )
 from inspira.logging import log
+from inspira.utils.json_codec import get_json_codec
 
 
 class WebSocket:
@@ -19,7 +18,7 @@ class WebSocket:
         await self._send({"type": WEBSOCKET_SEND_TYPE, "text": data})
 
     async def send_json(self, data: dict) -> None:
-        text_message = json.dumps(data, separators=(",", ":"))
+        text_message = get_json_codec().dumps(data).decode()
         await self._send({"type": WEBSOCKET_SEND_TYPE, "text": text_message})
 
     async def send_binary(self, data: bytes) -> None:
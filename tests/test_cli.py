@@ -1,9 +1,12 @@
+import gzip
+import json
 import os
 from unittest.mock import patch
 
 from click.testing import CliRunner
 
 from inspira.cli import cli
+from inspira.cli.build_static import build_static_files
 from inspira.cli.cli import controller
 from inspira.cli.generate_model_file import database_file_exists, generate_model_file
 
@@ -109,3 +112,60 @@ def test_database_file_exists_prints_error_message():
         database_file_exists()
 
         mock_echo.assert_called_once_with("Main script (database.py) not found.")
+
+
+def test_static_build_command(runner, tmp_path):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_text("body { margin: 0; }\n" * 50)
+    (source / "logo.png").write_bytes(b"\x89PNG" + b"\x00" * 100)
+
+    result = runner.invoke(
+        cli, ["static", "build", "--source", str(source), "--workers", "1"]
+    )
+    assert result.exit_code == 0
+    assert "Built 2 files, 0 unchanged." in result.output
+
+    dist = source / "dist"
+    manifest = json.loads((dist / "manifest.json").read_text())
+    assert set(manifest) == {"css/site.css", "logo.png"}
+    hashed_css = manifest["css/site.css"]
+    assert hashed_css.startswith("css/site.") and hashed_css.endswith(".css")
+    assert (dist / hashed_css).read_bytes() == (
+        source / "css" / "site.css"
+    ).read_bytes()
+    assert gzip.decompress((dist / (hashed_css + ".gz")).read_bytes()) == (
+        (source / "css" / "site.css").read_bytes()
+    )
+    assert not (dist / (manifest["logo.png"] + ".gz")).exists()
+
+    result = runner.invoke(cli, ["static", "build", "--source", str(source)])
+    assert "Built 0 files, 2 unchanged." in result.output
+
+    (source / "css" / "site.css").write_text("body { margin: 1px; }\n" * 50)
+    result = runner.invoke(cli, ["static", "build", "--source", str(source), "--clean"])
+    assert "Built 1 files, 1 unchanged." in result.output
+    new_manifest = json.loads((dist / "manifest.json").read_text())
+    assert new_manifest["css/site.css"] != hashed_css
+    assert not (dist / hashed_css).exists()
+    assert (dist / new_manifest["css/site.css"]).exists()
+
+
+def test_static_build_in_parallel(tmp_path):
+    source = tmp_path / "static"
+    source.mkdir()
+    for index in range(4):
+        (source / f"app{index}.js").write_text(f"console.log({index});" * 100)
+
+    built, unchanged = build_static_files(str(source), workers=2)
+
+    assert sorted(built) == [f"app{index}.js" for index in range(4)]
+    assert unchanged == []
+    assert len(list((source / "dist").glob("app*.js"))) == 4
+
+
+def test_static_build_without_source_directory(runner, tmp_path):
+    result = runner.invoke(
+        cli, ["static", "build", "--source", str(tmp_path / "missing")]
+    )
+    assert "does not exist" in result.output
@@ -1,10 +1,16 @@
+from http import HTTPStatus
 from unittest.mock import mock_open, patch
 
+import pytest
+
 from inspira.constants import TEXT_HTML
 from inspira.helpers.error_templates import (
+    format_forbidden_exception,
     format_internal_server_error,
     format_method_not_allowed_exception,
     format_not_found_exception,
+    reset_error_templates,
+    set_error_template,
 )
 from inspira.utils.controller_parser import parse_controller_decorators
 
@@ -31,6 +37,46 @@ def test_format_method_not_allowed_exception():
     assert "The method is not allowed for the requested URL." in response.content
 
 
+def test_error_responses_are_rendered_once():
+    response = format_not_found_exception()
+
+    assert format_not_found_exception() is response
+    assert response.is_frozen()
+    assert format_method_not_allowed_exception("GET, OPTIONS") is (
+        format_method_not_allowed_exception("GET, OPTIONS")
+    )
+    assert format_method_not_allowed_exception("GET, OPTIONS").headers == {
+        "Allow": "GET, OPTIONS"
+    }
+
+
+def test_set_error_template():
+    set_error_template("<h1>{status_code} {title}</h1>")
+    set_error_template("<p>{message}</p>", HTTPStatus.FORBIDDEN)
+    try:
+        assert format_not_found_exception().content == "<h1>404 Not Found</h1>"
+        assert format_forbidden_exception().content == "<p>Forbidden</p>"
+    finally:
+        reset_error_templates()
+
+    assert "Ooops!!!" in format_not_found_exception().content
+
+
+def test_set_error_template_rejects_unknown_placeholders():
+    with pytest.raises(KeyError):
+        set_error_template("<h1>{path}</h1>")
+
+
+@pytest.mark.asyncio
+async def test_not_found_page_through_app(client):
+    response = await client.get("/missing")
+    other_response = await client.get("/also-missing")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.headers["content-length"] == str(len(response.content))
+    assert response.content == other_response.content
+
+
 def test_parse_controller_decorators_with_path_decorator():
     code = """
 @path("/example")
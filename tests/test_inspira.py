@@ -1,13 +1,25 @@
 import inspect
 import os
+import tracemalloc
 from http import HTTPStatus
-from unittest.mock import Mock
+from typing import List
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from inspira.decorators.http_methods import get
+from inspira.decorators.http_methods import get, post
 from inspira.enums import HttpMethod
-from inspira.responses import JsonResponse
+from inspira.middlewares.cors import CORSMiddleware
+from inspira.requests import Request
+from inspira.responses import HttpResponse, JsonResponse
+from inspira.utils.handler_invoker import (
+    PARAM,
+    PARAM_LIST,
+    REQUEST,
+    SCOPE,
+    build_invocation_plan,
+    invoke_handler,
+)
 from inspira.utils.param_converter import convert_param_type
 
 
@@ -55,3 +67,205 @@ def test_convert_param_type_with_none_type(app):
 def test_convert_param_type_with_empty_type(app):
     result = convert_param_type("10", inspect.Parameter.empty)
     assert result == "10", "Expected the value to be converted to str"
+
+
+def test_build_invocation_plan():
+    async def handler(request, scope, item_id: int, page=1):
+        pass
+
+    plan = build_invocation_plan(handler)
+
+    assert [(name, kind) for name, kind, _, _ in plan] == [
+        ("request", REQUEST),
+        ("scope", SCOPE),
+        ("item_id", PARAM),
+        ("page", PARAM),
+    ]
+    assert plan[2][2]("10") == 10
+    assert plan[3][3] == 1
+
+
+@pytest.mark.asyncio
+async def test_invoke_handler_with_plan():
+    async def handler(request, item_id: int, page=1, sort=None):
+        return request, item_id, page, sort
+
+    plan = build_invocation_plan(handler)
+    request = Request({"query_string": b""}, AsyncMock(), AsyncMock())
+
+    result = await invoke_handler(handler, request, {}, {"item_id": "7"}, plan)
+
+    assert result == (request, 7, 1, None)
+
+
+@pytest.mark.asyncio
+async def test_invoke_handler_without_params():
+    async def handler(request, page=1):
+        return page
+
+    request = Request({"query_string": b""}, AsyncMock(), AsyncMock())
+
+    result = await invoke_handler(handler, request, {})
+
+    assert result == 1
+
+
+@pytest.mark.asyncio
+async def test_request_over_max_body_size_is_rejected(app, client):
+    handler = Mock()
+    app.config["MAX_BODY_SIZE"] = 10
+
+    @post("/upload")
+    async def upload(request):
+        handler()
+        return JsonResponse({"size": len(await request.body())})
+
+    app.add_route("/upload", HttpMethod.POST, upload)
+
+    small = await client.post("/upload", content=b"x" * 10)
+    large = await client.post("/upload", content=b"x" * 11)
+
+    assert small.json() == {"size": 10}
+    assert large.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert handler.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_route_max_body_size_overrides_config(app, client):
+    app.config["MAX_BODY_SIZE"] = 10
+
+    @post("/upload", max_body_size=100)
+    async def upload(request):
+        return JsonResponse({"size": len(await request.body())})
+
+    app.add_route("/upload", HttpMethod.POST, upload)
+    app.add_route("/small-upload", HttpMethod.POST, upload, max_body_size=5)
+
+    response = await client.post("/upload", content=b"x" * 50)
+    small_response = await client.post("/small-upload", content=b"x" * 6)
+
+    assert response.json() == {"size": 50}
+    assert small_response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_while_reading_body_sends_nothing(app):
+    @post("/upload")
+    async def upload(request):
+        return JsonResponse({"size": len(await request.body())})
+
+    app.add_route("/upload", HttpMethod.POST, upload)
+    receive = AsyncMock(
+        side_effect=[
+            {"type": "http.request", "body": b"partial", "more_body": True},
+            {"type": "http.disconnect"},
+        ]
+    )
+    send = AsyncMock()
+    scope = {"type": "http", "method": "POST", "path": "/upload", "headers": []}
+
+    await app(scope, receive, send)
+
+    send.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invoke_handler_binds_query_params():
+    async def handler(
+        item_id: int, page: int = 1, active: bool = False, tags: List[int] = None
+    ):
+        return item_id, page, active, tags
+
+    plan = build_invocation_plan(handler)
+    scope = {"query_string": b"item_id=9&page=3&active=true&tags=1&tags=2"}
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    result = await invoke_handler(handler, request, scope, {"item_id": "7"}, plan)
+
+    assert plan[3][1] == PARAM_LIST
+    assert result == (7, 3, True, [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_query_params_bound_through_app(app, client):
+    @get("/items")
+    async def list_items(search: str = "", page: int = 1, tag: List[str] = None):
+        return JsonResponse({"search": search, "page": page, "tag": tag})
+
+    app.add_route("/items", HttpMethod.GET, list_items)
+
+    response = await client.get("/items?search=lamp&page=2&tag=new&tag=sale")
+    default_response = await client.get("/items")
+
+    assert response.json() == {"search": "lamp", "page": 2, "tag": ["new", "sale"]}
+    assert default_response.json() == {"search": "", "page": 1, "tag": None}
+
+
+@pytest.mark.asyncio
+async def test_invalid_or_missing_query_params_return_bad_request(app, client):
+    @get("/items")
+    async def list_items(category: str, page: int = 1, tag: List[int] = None):
+        return JsonResponse({"category": category, "page": page, "tag": tag})
+
+    app.add_route("/items", HttpMethod.GET, list_items)
+
+    invalid_page = await client.get("/items?category=lamps&page=abc")
+    invalid_tag = await client.get("/items?category=lamps&tag=1&tag=x")
+    missing = await client.get("/items?page=2")
+    valid = await client.get("/items?category=lamps")
+
+    assert invalid_page.status_code == HTTPStatus.BAD_REQUEST
+    assert invalid_tag.status_code == HTTPStatus.BAD_REQUEST
+    assert missing.status_code == HTTPStatus.BAD_REQUEST
+    assert valid.json() == {"category": "lamps", "page": 1, "tag": None}
+
+
+@pytest.mark.asyncio
+async def test_simple_get_allocation_budget(app):
+    app.add_middleware(CORSMiddleware(allow_origins=["http://localhost"]))
+
+    async def index():
+        return HttpResponse("ok")
+
+    app.add_route("/", HttpMethod.GET, index)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost")],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    # Warm up the route cache, the middleware chain and the invocation plan.
+    for _ in range(5):
+        await app(dict(scope), receive, send)
+    messages.clear()
+
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await app(dict(scope), receive, send)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert messages[0]["status"] == HTTPStatus.OK
+    assert peak - current < 8 * 1024
+
+
+def test_request_and_response_use_slots(mock_scope):
+    request = Request(mock_scope, AsyncMock(), AsyncMock())
+    response = HttpResponse("ok")
+
+    assert not hasattr(request, "__dict__")
+    assert not hasattr(response, "__dict__")
+    assert not hasattr(JsonResponse({}), "__dict__")
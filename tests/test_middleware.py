@@ -7,6 +7,8 @@ from inspira.auth.auth_utils import decode_auth_token, login_user
 from inspira.auth.decorators import login_required
 from inspira.auth.mixins.user_mixin import AnonymousUserMixin
 from inspira.decorators.http_methods import get
+from inspira.decorators.middleware import middleware
+from inspira.decorators.path import path
 from inspira.enums import HttpMethod
 from inspira.logging import log
 from inspira.middlewares.cors import CORSMiddleware
@@ -121,15 +123,38 @@ async def test_set_session_success(app, secret_key, client):
     decoded_session = decode_session_data(session_cookie.value, secret_key)
     expected_session = {"message": "Hej"}
 
-    expiration_time = decoded_session.pop("expiration_time", None)
     session_id = decoded_session.pop("session_id", None)
 
     assert decoded_session == expected_session
     assert response.status_code == HTTPStatus.OK
-    assert expiration_time is not None
     assert session_id is not None
 
 
+@pytest.mark.asyncio
+async def test_session_middleware_saves_nested_changes(app, client, secret_key):
+    app.add_middleware(SessionMiddleware())
+
+    @get("/add")
+    async def add(request: Request):
+        request.set_session("cart", [1])
+        return HttpResponse("added")
+
+    @get("/append")
+    async def append(request: Request):
+        request.session["cart"].append(2)
+        return HttpResponse("appended")
+
+    app.add_route("/add", HttpMethod.GET, add)
+    app.add_route("/append", HttpMethod.GET, append)
+
+    response = await client.get("/add")
+    session_cookie = SimpleCookie(response.headers["set-cookie"])["session"].value
+    response = await client.get("/append", cookies={"session": session_cookie})
+    session_cookie = SimpleCookie(response.headers["set-cookie"])["session"].value
+
+    assert decode_session_data(session_cookie, secret_key)["cart"] == [1, 2]
+
+
 @pytest.mark.asyncio
 async def test_invalid_signature_exception(app, client):
     session_middleware = SessionMiddleware()
@@ -311,3 +336,201 @@ async def test_user_loader_middleware_anonymous_user(
 
     user_in_method = RequestContext.get_current_user()
     assert isinstance(user_in_method, AnonymousUserMixin)
+
+
+@pytest.mark.asyncio
+async def test_middleware_chain_is_built_once(app, client):
+    calls = []
+
+    async def counting_middleware(handler):
+        calls.append(handler)
+
+        async def middleware(scope, receive, send):
+            await handler(scope, receive, send)
+
+        return middleware
+
+    app.add_middleware(counting_middleware)
+
+    @get("/test")
+    async def test_route(request: Request):
+        return HttpResponse("hello")
+
+    app.add_route("/test", HttpMethod.GET, test_route)
+
+    await client.get("/test")
+    await client.get("/test")
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_asgi_middleware_can_short_circuit(app, client):
+    class MaintenanceMiddleware:
+        def __init__(self, app):
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            await HttpResponse("maintenance", status_code=503)(scope, receive, send)
+
+    @get("/test")
+    async def test_route(request: Request):
+        return HttpResponse("hello")
+
+    app.add_route("/test", HttpMethod.GET, test_route)
+
+    response = await client.get("/test")
+    assert response.status_code == HTTPStatus.OK
+
+    app.add_middleware(MaintenanceMiddleware)
+    response = await client.get("/test")
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.text == "maintenance"
+
+
+@pytest.mark.asyncio
+async def test_middleware_can_rewrite_path(app, client):
+    class StripPrefixMiddleware:
+        def __init__(self, app):
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            if scope["path"].startswith("/api/"):
+                scope["path"] = scope["path"][len("/api") :]
+            await self.app(scope, receive, send)
+
+    @get("/items")
+    async def items(request: Request):
+        return HttpResponse("items")
+
+    app.add_route("/items", HttpMethod.GET, items)
+    app.add_middleware(StripPrefixMiddleware)
+
+    response = await client.get("/api/items")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text == "items"
+
+
+class HeaderMiddleware:
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, app):
+        async def middleware(scope, receive, send):
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"].append((b"x-middleware", self.name.encode()))
+                await send(message)
+
+            await app(scope, receive, send_wrapper)
+
+        return middleware
+
+
+@pytest.mark.asyncio
+async def test_route_can_exclude_global_middleware(app, client):
+    app.add_middleware(HeaderMiddleware("global"))
+
+    @get("/healthz")
+    async def healthz(request: Request):
+        return HttpResponse("ok")
+
+    @get("/test")
+    async def test_route(request: Request):
+        return HttpResponse("hello")
+
+    app.add_route(
+        "/healthz", HttpMethod.GET, healthz, exclude_middleware=[HeaderMiddleware]
+    )
+    app.add_route("/test", HttpMethod.GET, test_route)
+
+    health_response = await client.get("/healthz")
+    response = await client.get("/test")
+
+    assert "x-middleware" not in health_response.headers
+    assert response.headers["x-middleware"] == "global"
+
+
+@pytest.mark.asyncio
+async def test_middleware_decorator_adds_route_middleware(app, client):
+    @get("/test")
+    @middleware(HeaderMiddleware("route"))
+    async def test_route(request: Request):
+        return HttpResponse("hello")
+
+    @get("/other")
+    async def other_route(request: Request):
+        return HttpResponse("hello")
+
+    app.add_route("/test", HttpMethod.GET, test_route)
+    app.add_route("/other", HttpMethod.GET, other_route)
+
+    response = await client.get("/test")
+    other_response = await client.get("/other")
+
+    assert response.headers["x-middleware"] == "route"
+    assert "x-middleware" not in other_response.headers
+
+
+@pytest.mark.asyncio
+async def test_controller_middleware_selection(app, client):
+    global_middleware = HeaderMiddleware("global")
+    app.add_middleware(global_middleware)
+
+    @path("/public", exclude_middleware=[global_middleware])
+    class PublicController:
+        @get("/ping")
+        async def ping(self, request: Request):
+            return HttpResponse("pong")
+
+    app._add_class_routes(PublicController)
+
+    response = await client.get("/public/ping")
+
+    assert response.text == "pong"
+    assert "x-middleware" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_session_is_not_decoded_when_not_read(app, client, mocker):
+    app.add_middleware(SessionMiddleware())
+    decode = mocker.patch("inspira.utils.session_utils.decode_session_data")
+
+    @get("/healthz")
+    async def healthz(request: Request):
+        return HttpResponse("ok")
+
+    app.add_route("/healthz", HttpMethod.GET, healthz)
+
+    response = await client.get("/healthz", cookies={"session": "token"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert "set-cookie" not in response.headers
+    decode.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unmodified_session_is_not_re_signed(app, client, secret_key):
+    app.add_middleware(SessionMiddleware())
+
+    @get("/set")
+    async def set_route(request: Request):
+        request.set_session("message", "Hej")
+        return HttpResponse("set")
+
+    @get("/read")
+    async def read_route(request: Request):
+        return HttpResponse(request.get_session("message"))
+
+    app.add_route("/set", HttpMethod.GET, set_route)
+    app.add_route("/read", HttpMethod.GET, read_route)
+
+    set_response = await client.get("/set")
+    session_cookie = SimpleCookie(set_response.headers["set-cookie"])["session"]
+
+    response = await client.get("/read", cookies={"session": session_cookie.value})
+
+    assert response.text == "Hej"
+    assert "set-cookie" not in response.headers
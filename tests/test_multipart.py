@@ -0,0 +1,194 @@
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+
+import pytest
+
+from inspira.decorators.http_methods import post
+from inspira.enums import HttpMethod
+from inspira.requests import Request
+from inspira.responses import JsonResponse
+from inspira.utils.multipart import MultipartError, MultipartParser, UploadedFile
+
+BOUNDARY = "boundary123"
+
+BINARY_CONTENT = b"\x00\xff\r\n--boundary12\r\n\r\n\x89PNG\r\n"
+
+BODY = (
+    b"--boundary123\r\n"
+    b'Content-Disposition: form-data; name="title"\r\n'
+    b"\r\n"
+    b"  Hello, w\xc3\xb6rld  \r\n"
+    b"--boundary123\r\n"
+    b'Content-Disposition: form-data; name="upload"; filename="image.png"\r\n'
+    b"Content-Type: image/png\r\n"
+    b"\r\n" + BINARY_CONTENT + b"\r\n"
+    b"--boundary123--\r\n"
+)
+
+
+def parse(body, chunk_size, **kwargs):
+    parser = MultipartParser(BOUNDARY, **kwargs)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start : start + chunk_size])
+    return parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(BODY)])
+def test_parser_handles_any_chunk_size(chunk_size):
+    fields = parse(BODY, chunk_size)
+
+    assert fields["title"] == "  Hello, wörld  "
+    upload = fields["upload"]
+    assert isinstance(upload, UploadedFile)
+    assert upload.filename == "image.png"
+    assert upload.content_type == "image/png"
+    assert upload.size == len(BINARY_CONTENT)
+    assert upload.read() == BINARY_CONTENT
+
+
+def test_parser_spools_large_files_to_disk():
+    content = b"x" * 2048
+    body = (
+        b"--boundary123\r\n"
+        b'Content-Disposition: form-data; name="small"; filename="a.txt"\r\n'
+        b"\r\n"
+        b"abc\r\n"
+        b"--boundary123\r\n"
+        b'Content-Disposition: form-data; name="large"; filename="b.txt"\r\n'
+        b"\r\n" + content + b"\r\n"
+        b"--boundary123--"
+    )
+
+    fields = parse(body, 512, spool_max_size=1024)
+
+    assert fields["small"].in_memory()
+    assert not fields["large"].in_memory()
+    assert fields["large"].read() == content
+
+
+def test_parser_rejects_truncated_body():
+    with pytest.raises(MultipartError):
+        parse(BODY[:-20], 64)
+
+
+def test_parser_rejects_part_without_name():
+    body = b"--boundary123\r\nContent-Type: text/plain\r\n\r\nvalue\r\n--boundary123--"
+
+    with pytest.raises(MultipartError):
+        parse(body, 64)
+
+
+def test_parser_limits_text_field_size():
+    body = (
+        b"--boundary123\r\n"
+        b'Content-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+        b"\r\n" + b"x" * 2048 + b"\r\n"
+        b"--boundary123\r\n"
+        b'Content-Disposition: form-data; name="comment"\r\n'
+        b"\r\n" + b"x" * 2048 + b"\r\n"
+        b"--boundary123--"
+    )
+
+    with pytest.raises(MultipartError):
+        parse(body, 512, max_field_size=1024)
+
+
+def test_parser_rejects_undecodable_text_field():
+    body = (
+        b"--boundary123\r\n"
+        b'Content-Disposition: form-data; name="title"\r\n'
+        b"\r\n\xff\xfe\r\n"
+        b"--boundary123--"
+    )
+
+    with pytest.raises(MultipartError):
+        parse(body, 64)
+
+
+@pytest.mark.asyncio
+async def test_request_form_streams_multipart_body():
+    scope = {
+        "headers": [
+            (b"content-type", b'multipart/form-data; boundary="boundary123"'),
+        ]
+    }
+    receive = AsyncMock()
+    receive.side_effect = [
+        {"type": "http.request", "body": BODY[:100], "more_body": True},
+        {"type": "http.request", "body": BODY[100:], "more_body": False},
+    ]
+    request = Request(scope, receive, AsyncMock())
+
+    form = await request.form()
+
+    assert form["title"] == "  Hello, wörld  "
+    assert form["upload"].read() == BINARY_CONTENT
+    assert await request.form() is form
+
+
+@pytest.mark.asyncio
+async def test_upload_through_app(app, client):
+    @post("/upload")
+    async def upload(request):
+        form = await request.form()
+        file = form["document"]
+        return JsonResponse(
+            {"name": form["name"], "filename": file.filename, "size": file.size}
+        )
+
+    app.add_route("/upload", HttpMethod.POST, upload)
+
+    response = await client.post(
+        "/upload",
+        data={"name": "report"},
+        files={"document": ("report.bin", BINARY_CONTENT, "application/pdf")},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "name": "report",
+        "filename": "report.bin",
+        "size": len(BINARY_CONTENT),
+    }
+
+
+@pytest.mark.asyncio
+async def test_malformed_upload_returns_bad_request(app, client):
+    @post("/upload")
+    async def upload(request):
+        form = await request.form()
+        return JsonResponse({"fields": len(form)})
+
+    app.add_route("/upload", HttpMethod.POST, upload)
+
+    response = await client.post(
+        "/upload",
+        content=BODY[:-20],
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_body_after_multipart_form(app, client):
+    @post("/form-then-body")
+    async def form_then_body(request):
+        await request.form()
+        return JsonResponse({"size": len(await request.body())})
+
+    @post("/body-then-form")
+    async def body_then_form(request):
+        body = await request.body()
+        form = await request.form()
+        return JsonResponse({"size": len(body), "title": form["title"]})
+
+    app.add_route("/form-then-body", HttpMethod.POST, form_then_body)
+    app.add_route("/body-then-form", HttpMethod.POST, body_then_form)
+    headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+    response = await client.post("/form-then-body", content=BODY, headers=headers)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = await client.post("/body-then-form", content=BODY, headers=headers)
+    assert response.json() == {"size": len(BODY), "title": "  Hello, wörld  "}
@@ -11,3 +11,8 @@ def test_path_decorator():
     assert ExampleController.__path__ == "/example/path"
     assert hasattr(ExampleController, "__is_controller__")
     assert ExampleController.__is_controller__ is True
+
+
+def test_path_decorator_middleware_defaults():
+    assert ExampleController.__middleware__ == []
+    assert ExampleController.__exclude_middleware__ == []
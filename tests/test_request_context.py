@@ -0,0 +1,81 @@
+import asyncio
+import random
+from http.cookies import SimpleCookie
+
+import pytest
+
+from inspira.auth.auth_utils import encode_auth_token
+from inspira.decorators.http_methods import get
+from inspira.enums import HttpMethod
+from inspira.middlewares.sessions import SessionMiddleware
+from inspira.middlewares.user_loader import UserLoaderMiddleware
+from inspira.requests import RequestContext
+from inspira.responses import JsonResponse
+from inspira.utils.session_utils import decode_session_data, encode_session_data
+
+CONCURRENT_REQUESTS = 2000
+
+
+class User:
+    def __init__(self, id):
+        self.id = id
+
+
+class UserModel:
+    class query:
+        @staticmethod
+        def get(user_id):
+            return User(user_id)
+
+
+@pytest.mark.asyncio
+async def test_request_context_is_isolated_between_tasks():
+    async def handle(index):
+        RequestContext.set_request(index)
+        RequestContext.set_current_user(index)
+        await asyncio.sleep(random.random() / 1000)
+        return RequestContext.get_request(), RequestContext.get_current_user()
+
+    results = await asyncio.gather(*(handle(index) for index in range(100)))
+
+    assert results == [(index, index) for index in range(100)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_do_not_share_sessions_or_users(
+    app, client, secret_key
+):
+    app.add_middleware(SessionMiddleware())
+    app.add_middleware(UserLoaderMiddleware(UserModel))
+
+    @get("/whoami")
+    async def whoami(request, n: int):
+        request.set_session("n", n)
+        for _ in range(random.randint(1, 3)):
+            await asyncio.sleep(random.random() / 1000)
+
+        assert RequestContext.get_request() is request
+        return JsonResponse(
+            {
+                "n": n,
+                "session_n": RequestContext.get_request().get_session("n"),
+                "user_id": RequestContext.get_current_user().id,
+                "request_user_id": request.user.id,
+            }
+        )
+
+    app.add_route("/whoami", HttpMethod.GET, whoami)
+
+    async def fire(n):
+        session = encode_session_data({"token": encode_auth_token(n)}, secret_key)
+        response = await client.get(
+            f"/whoami?n={n}", headers={"cookie": f"session={session}"}
+        )
+        cookie = SimpleCookie(response.headers["set-cookie"])
+        return response.json(), decode_session_data(cookie["session"].value, secret_key)
+
+    results = await asyncio.gather(*(fire(n) for n in range(1, CONCURRENT_REQUESTS + 1)))
+
+    for n, (body, session) in enumerate(results, 1):
+        assert body == {"n": n, "session_n": n, "user_id": n, "request_user_id": n}
+        assert session["n"] == n
@@ -2,7 +2,13 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from inspira.requests import Request, RequestContext
+from inspira.requests import (
+    ClientDisconnect,
+    Request,
+    RequestBodyConsumed,
+    RequestContext,
+    RequestEntityTooLarge,
+)
 
 
 def test_set_request(mock_scope):
@@ -86,6 +92,48 @@ async def test_form_with_urlencoded_data():
     assert form_data == {"key1": "value1", "key2": "value2"}
 
 
+@pytest.mark.asyncio
+async def test_body_is_joined_from_chunks_and_cached():
+    scope = {"headers": [(b"content-type", b"application/json")]}
+    receive = AsyncMock()
+    receive.side_effect = [
+        {"type": "http.request", "body": b'{"key": ', "more_body": True},
+        {"type": "http.request", "body": b'"value"}', "more_body": False},
+    ]
+    request = Request(scope, receive, AsyncMock())
+
+    assert await request.body() == b'{"key": "value"}'
+    assert await request.json() == {"key": "value"}
+    assert await request.body() == b'{"key": "value"}'
+    assert receive.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_form_and_json_share_the_body():
+    scope = {"headers": [(b"content-type", b"application/x-www-form-urlencoded")]}
+    receive = AsyncMock()
+    receive.side_effect = [{"body": b"key1=value1", "more_body": False}]
+    request = Request(scope, receive, AsyncMock())
+
+    assert await request.form() == {"key1": "value1"}
+    assert await request.form() == {"key1": "value1"}
+    assert receive.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_body_raises_client_disconnect():
+    receive = AsyncMock()
+    receive.side_effect = [
+        {"type": "http.request", "body": b"partial", "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    request = Request({"headers": []}, receive, AsyncMock())
+
+    with pytest.raises(ClientDisconnect):
+        await request.body()
+    assert request._body is None
+
+
 @pytest.mark.asyncio
 async def test_form_with_multipart_form_data():
     scope = {
@@ -153,3 +201,117 @@ async def test_cookies_with_malformed_cookie_header():
     cookies = request.cookies()
 
     assert cookies == {}
+
+
+def test_session_is_loaded_lazily(mock_scope):
+    request = Request(mock_scope, AsyncMock(), AsyncMock())
+
+    assert request.is_session_loaded() is False
+
+    request.get_session("user_id")
+
+    assert request.is_session_loaded() is True
+    assert request.session.modified is False
+
+
+def test_headers_are_case_insensitive_and_keep_repeated_values():
+    scope = {
+        "headers": [
+            (b"content-type", b"text/plain"),
+            (b"x-forwarded-for", b"10.0.0.1"),
+            (b"X-Forwarded-For", b"10.0.0.2"),
+        ]
+    }
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    assert request.headers["Content-Type"] == "text/plain"
+    assert request.headers.get("x-forwarded-for") == "10.0.0.1"
+    assert request.headers.getlist("X-FORWARDED-FOR") == ["10.0.0.1", "10.0.0.2"]
+    assert "CONTENT-TYPE" in request.headers
+    assert request.headers.get("missing", "default") == "default"
+    assert set(request.headers) == {"content-type", "x-forwarded-for"}
+
+
+def test_headers_and_cookies_are_parsed_once():
+    scope = {"headers": [(b"cookie", b"key1=value1")]}
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    assert request.get_headers() is request.headers
+    assert request.cookies() is request.cookies()
+
+
+def test_cookies_skip_malformed_pairs():
+    scope = {"headers": [(b"cookie", b'broken; key1=value1; key2="quoted"; =x')]}
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    assert request.cookies() == {"key1": "value1", "key2": "quoted"}
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_memoryviews():
+    receive = AsyncMock()
+    receive.side_effect = [
+        {"type": "http.request", "body": b"first", "more_body": True},
+        {"type": "http.request", "body": b"second", "more_body": False},
+    ]
+    request = Request({"headers": []}, receive, AsyncMock())
+
+    chunks = [chunk async for chunk in request.stream()]
+
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert b"".join(chunks) == b"firstsecond"
+    with pytest.raises(RequestBodyConsumed):
+        await request.body()
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_large_content_length_before_receiving():
+    receive = AsyncMock()
+    request = Request({"headers": [(b"content-length", b"11")]}, receive, AsyncMock())
+    request.max_body_size = 10
+
+    with pytest.raises(RequestEntityTooLarge):
+        await request.body()
+    receive.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_once_the_limit_is_crossed():
+    receive = AsyncMock()
+    receive.side_effect = [
+        {"type": "http.request", "body": b"x" * 6, "more_body": True},
+        {"type": "http.request", "body": b"x" * 6, "more_body": True},
+        {"type": "http.request", "body": b"x" * 6, "more_body": False},
+    ]
+    request = Request({"headers": []}, receive, AsyncMock())
+    request.max_body_size = 10
+
+    with pytest.raises(RequestEntityTooLarge):
+        await request.body()
+    assert receive.await_count == 2
+
+
+def test_query_params_are_parsed_once():
+    scope = {"headers": [], "query_string": b"page=2&tag=a&tag=b&q=hello%20world"}
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    query_params = request.query_params
+
+    assert request.query_params is query_params
+    assert query_params["tag"] == "a"
+    assert query_params.getlist("tag") == ["a", "b"]
+    assert query_params.get("q") == "hello world"
+    assert query_params.get("missing", "default") == "default"
+    assert set(query_params) == {"page", "tag", "q"}
+
+
+def test_query_params_typed_getters():
+    scope = {"query_string": b"page=2&ratio=0.5&active=false&invalid=abc&empty="}
+    request = Request(scope, AsyncMock(), AsyncMock())
+
+    assert request.query_params.get_int("page") == 2
+    assert request.query_params.get_float("ratio") == 0.5
+    assert request.query_params.get_bool("active") is False
+    assert request.query_params.get_int("invalid", 1) == 1
+    assert request.query_params.get_int("missing") is None
+    assert request.query_params.get("empty") == ""
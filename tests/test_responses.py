@@ -1,6 +1,8 @@
-import json
+import asyncio
 import os
+import threading
 from http import HTTPStatus
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -9,11 +11,14 @@ from inspira.decorators.http_methods import delete, get, patch, post, put
 from inspira.enums import HttpMethod
 from inspira.requests import Request
 from inspira.responses import (
+    FileResponse,
     ForbiddenResponse,
     HttpResponse,
     HttpResponseRedirect,
     JsonResponse,
+    StreamingResponse,
     TemplateResponse,
+    parse_range_header,
 )
 
 
@@ -63,6 +68,7 @@ async def test_set_cookie_with_route(app, client):
     expected_headers = {
         "content-type": TEXT_PLAIN,
         "set-cookie": "my_cookie=my_cookie_value; Path=/",
+        "content-length": "23",
     }
 
     assert headers_dict == expected_headers
@@ -86,6 +92,7 @@ async def test_set_multiple_cookie(app, client_session):
     expected_header = {
         "content-type": TEXT_PLAIN,
         "set-cookie": "my_cookie=my_cookie_value; Path=/, my_second_cookie=my_second_cookie_value; Path=/",
+        "content-length": "23",
     }
 
     assert headers_dict == expected_header
@@ -266,6 +273,13 @@ async def test_template(client, app):
     assert response.text == "<h1>test</h1>"
 
 
+def test_template_response_static_dir_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        response = TemplateResponse("example.html", static_dir="static")
+
+    assert response.template_name == "example.html"
+
+
 @pytest.mark.asyncio
 async def test_serialize_content_byte():
     response = HttpResponse(content=b"example")
@@ -277,7 +291,7 @@ async def test_serialize_content_byte():
 async def test_serialize_content_json():
     response = JsonResponse(content={"key": "value"})
     result = await response.serialize_content()
-    expected_result = json.dumps({"key": "value"}).encode(UTF8)
+    expected_result = b'{"key":"value"}'
     assert result == expected_result
 
 
@@ -344,3 +358,362 @@ def test_forbidden_response_content_type_json():
 
     assert response.content == content
     assert response.content_type == APPLICATION_JSON
+
+
+@pytest.mark.asyncio
+async def test_response_sends_content_length():
+    send = AsyncMock()
+    response = JsonResponse({"message": "héllo"})
+
+    await response({"type": "http"}, AsyncMock(), send)
+
+    start, body = (call.args[0] for call in send.await_args_list)
+    assert (b"content-length", str(len(body["body"])).encode()) in start["headers"]
+
+
+@pytest.mark.asyncio
+async def test_response_keeps_explicit_content_length_and_skips_204():
+    send = AsyncMock()
+    await HttpResponse("abc", headers={"Content-Length": "3"})({}, AsyncMock(), send)
+    await HttpResponse(status_code=HTTPStatus.NO_CONTENT)({}, AsyncMock(), send)
+
+    explicit, _, no_content, _ = (call.args[0] for call in send.await_args_list)
+    assert [k for k, _ in explicit["headers"] if k.lower() == b"content-length"] == [
+        b"Content-Length"
+    ]
+    assert all(key != b"content-length" for key, _ in no_content["headers"])
+
+
+@pytest.mark.asyncio
+async def test_frozen_response_reuses_encoded_headers():
+    response = HttpResponse("gone", headers={"X-Reason": "moved"}).freeze()
+    send = AsyncMock()
+
+    await response({}, AsyncMock(), send)
+    await response({}, AsyncMock(), send)
+
+    first, first_body, second, _ = (call.args[0] for call in send.await_args_list)
+    assert first["headers"] == second["headers"]
+    assert first["headers"][0][1] is second["headers"][0][1]
+    assert (b"content-length", b"4") in first["headers"]
+    assert first_body["body"] == b"gone"
+    with pytest.raises(TypeError):
+        response.headers["X-Other"] = "value"
+
+
+async def never_disconnect():
+    await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_coalesces_small_chunks():
+    async def rows():
+        for index in range(10):
+            yield f"{index},"
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    response = StreamingResponse(rows(), content_type="text/csv", chunk_size=8)
+    await response({"type": "http"}, never_disconnect, send)
+
+    start, *bodies = messages
+    assert (b"content-type", b"text/csv") in start["headers"]
+    assert all(key != b"content-length" for key, _ in start["headers"])
+    assert [body["body"] for body in bodies] == [
+        b"0,1,2,3,",
+        b"4,5,6,7,",
+        b"8,9,",
+        b"",
+    ]
+    assert [body["more_body"] for body in bodies] == [True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_sends_chunks_as_they_are_produced():
+    first_sent = asyncio.Event()
+
+    async def events():
+        yield "data: 1\n\n"
+        # Only resumes once the first event has reached the client.
+        await asyncio.wait_for(first_sent.wait(), timeout=1)
+        yield "data: 2\n\n"
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+        if message.get("body"):
+            first_sent.set()
+
+    await StreamingResponse(events())({}, never_disconnect, send)
+
+    assert [message.get("body") for message in messages[1:]] == [
+        b"data: 1\n\n",
+        b"data: 2\n\n",
+        b"",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_consumes_sync_iterables_in_a_thread():
+    main_thread = threading.get_ident()
+    threads = set()
+
+    def rows():
+        for index in range(3):
+            threads.add(threading.get_ident())
+            yield b"row%d\n" % index
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await StreamingResponse(rows(), chunk_size=0)({}, never_disconnect, send)
+
+    assert b"".join(message.get("body", b"") for message in messages) == (
+        b"row0\nrow1\nrow2\n"
+    )
+    assert main_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_stops_when_client_disconnects():
+    produced = []
+    closed = asyncio.Event()
+    disconnect = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                produced.append(1)
+                if len(produced) == 5:
+                    disconnect.set()
+                await asyncio.sleep(0)
+                yield b"x"
+        finally:
+            closed.set()
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await StreamingResponse(endless(), chunk_size=0)({}, receive, send)
+
+    assert closed.is_set()
+    assert len(produced) < 10
+    assert messages[-1]["more_body"] is True
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_through_app(app, client):
+    @get("/export")
+    async def export():
+        async def rows():
+            yield "id,name\n"
+            for index in range(1000):
+                yield f"{index},item{index}\n"
+
+        return StreamingResponse(rows(), content_type="text/csv")
+
+    app.add_route("/export", HttpMethod.GET, export)
+
+    response = await client.get("/export")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text.splitlines()[:2] == ["id,name", "0,item0"]
+    assert len(response.text.splitlines()) == 1001
+
+
+def file_scope(headers=None, method="GET", extensions=None):
+    return {
+        "type": "http",
+        "method": method,
+        "headers": [(key.encode(), value.encode()) for key, value in headers or []],
+        "extensions": extensions or {},
+    }
+
+
+async def send_file_response(response, scope):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await response(scope, never_disconnect, send)
+    start, *bodies = messages
+    return start, dict(start["headers"]), bodies
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(bytes(range(256)) * 4)
+    return path
+
+
+def test_parse_range_header():
+    assert parse_range_header("bytes=0-9", 100) == [(0, 9)]
+    assert parse_range_header("bytes=90-", 100) == [(90, 99)]
+    assert parse_range_header("bytes=-10", 100) == [(90, 99)]
+    assert parse_range_header("bytes=0-500", 100) == [(0, 99)]
+    assert parse_range_header("bytes=20-29, 0-9, 5-14", 100) == [(0, 14), (20, 29)]
+    assert parse_range_header("bytes=200-300", 100) == []
+    assert parse_range_header("bytes=9-0", 100) is None
+    assert parse_range_header("bytes=a-b", 100) is None
+    assert parse_range_header("items=0-9", 100) is None
+
+
+@pytest.mark.asyncio
+async def test_file_response_reads_in_chunks(data_file):
+    response = FileResponse(data_file, chunk_size=300)
+    start, headers, bodies = await send_file_response(response, file_scope())
+
+    assert start["status"] == HTTPStatus.OK
+    assert headers[b"content-type"] == b"text/plain"
+    assert headers[b"content-length"] == b"1024"
+    assert headers[b"accept-ranges"] == b"bytes"
+    assert b"etag" in headers.keys() and b"last-modified" in headers.keys()
+    assert [len(body["body"]) for body in bodies] == [300, 300, 300, 124, 0]
+    assert b"".join(body["body"] for body in bodies) == data_file.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_file_response_single_range(data_file):
+    response = FileResponse(data_file)
+    start, headers, bodies = await send_file_response(
+        response, file_scope([("Range", "bytes=10-19")])
+    )
+
+    assert start["status"] == HTTPStatus.PARTIAL_CONTENT
+    assert headers[b"content-range"] == b"bytes 10-19/1024"
+    assert headers[b"content-length"] == b"10"
+    assert b"".join(body["body"] for body in bodies) == bytes(range(10, 20))
+
+
+@pytest.mark.asyncio
+async def test_file_response_multiple_ranges(data_file):
+    response = FileResponse(data_file)
+    start, headers, bodies = await send_file_response(
+        response, file_scope([("Range", "bytes=0-3,-4")])
+    )
+
+    assert start["status"] == HTTPStatus.PARTIAL_CONTENT
+    content_type = headers[b"content-type"].decode()
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("=")[1]
+
+    body = b"".join(body["body"] for body in bodies)
+    assert int(headers[b"content-length"]) == len(body)
+    assert (
+        body
+        == (
+            f"--{boundary}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Range: bytes 0-3/1024\r\n\r\n"
+        ).encode()
+        + bytes(range(4))
+        + (
+            f"\r\n--{boundary}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Range: bytes 1020-1023/1024\r\n\r\n"
+        ).encode()
+        + bytes(range(252, 256))
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+
+
+@pytest.mark.asyncio
+async def test_file_response_unsatisfiable_range(data_file):
+    response = FileResponse(data_file)
+    start, headers, _ = await send_file_response(
+        response, file_scope([("Range", "bytes=2000-")])
+    )
+
+    assert start["status"] == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert headers[b"content-range"] == b"bytes */1024"
+
+
+@pytest.mark.asyncio
+async def test_file_response_ignores_range_for_stale_if_range(data_file):
+    response = FileResponse(data_file, headers={"ETag": '"v2"'})
+    start, headers, _ = await send_file_response(
+        response, file_scope([("Range", "bytes=0-9"), ("If-Range", '"v1"')])
+    )
+    assert start["status"] == HTTPStatus.OK
+    assert headers[b"content-length"] == b"1024"
+
+    response = FileResponse(data_file, headers={"ETag": '"v2"'})
+    start, _, _ = await send_file_response(
+        response, file_scope([("Range", "bytes=0-9"), ("If-Range", '"v2"')])
+    )
+    assert start["status"] == HTTPStatus.PARTIAL_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_file_response_uses_pathsend(data_file):
+    response = FileResponse(data_file)
+    _, headers, messages = await send_file_response(
+        response, file_scope(extensions={"http.response.pathsend": {}})
+    )
+
+    assert headers[b"content-length"] == b"1024"
+    assert messages == [
+        {"type": "http.response.pathsend", "path": os.path.abspath(data_file)}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_file_response_uses_zerocopy_for_a_range(data_file):
+    response = FileResponse(data_file)
+    _, _, messages = await send_file_response(
+        response,
+        file_scope(
+            [("Range", "bytes=100-")], extensions={"http.response.zerocopy": {}}
+        ),
+    )
+
+    assert len(messages) == 1
+    assert messages[0]["type"] == "http.response.zerocopy"
+    assert (messages[0]["offset"], messages[0]["count"]) == (100, 924)
+
+
+@pytest.mark.asyncio
+async def test_file_response_missing_file(tmp_path, caplog):
+    path = tmp_path / "missing.txt"
+    response = FileResponse(path)
+    start, _, _ = await send_file_response(response, file_scope())
+
+    assert start["status"] == HTTPStatus.NOT_FOUND
+    assert f"File not found: {path}" in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_file_response_through_app(app, client, data_file):
+    @get("/download")
+    async def download():
+        return FileResponse(data_file, filename="report 1.txt")
+
+    app.add_route("/download", HttpMethod.GET, download)
+
+    response = await client.get("/download", headers={"Range": "bytes=0-1"})
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == bytes(range(2))
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="report 1.txt"'
+    )
+
+    response = await client.head("/download")
+    assert response.headers["content-length"] == "1024"
+    assert response.content == b""
+
+    missing = await client.get("/download-missing")
+    assert missing.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,292 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+
+from inspira.decorators.http_methods import get
+from inspira.enums import HttpMethod
+from inspira.responses import JsonResponse
+from inspira.router import Router
+
+
+def handler_a():
+    pass
+
+
+def handler_b():
+    pass
+
+
+def resolve(router, method, path):
+    match = router.match(method, path)
+    if match is None:
+        return None
+    route, params = match
+    return route.handler, params
+
+
+def test_match_static_route():
+    router = Router()
+    router.add_route("/users", HttpMethod.GET.value, handler_a)
+
+    assert resolve(router, "GET", "/users") == (handler_a, {})
+    assert resolve(router, "GET", "/users/") is None
+    assert resolve(router, "POST", "/users") is None
+
+
+def test_match_extracts_params():
+    router = Router()
+    router.add_route("/users/{user_id}/posts/{post_id}", "GET", handler_a)
+
+    assert resolve(router, "GET", "/users/1/posts/abc") == (
+        handler_a,
+        {"user_id": "1", "post_id": "abc"},
+    )
+    assert resolve(router, "GET", "/users//posts/abc") is None
+    assert resolve(router, "GET", "/users/1/posts") is None
+
+
+def test_static_segment_takes_precedence_over_param():
+    router = Router()
+    router.add_route("/users/{user_id}", "GET", handler_a)
+    router.add_route("/users/me", "GET", handler_b)
+
+    assert resolve(router, "GET", "/users/me") == (handler_b, {})
+    assert resolve(router, "GET", "/users/42") == (handler_a, {"user_id": "42"})
+
+
+def test_match_backtracks_to_param_route():
+    router = Router()
+    router.add_route("/users/me/settings", "GET", handler_a)
+    router.add_route("/users/{user_id}/profile", "GET", handler_b)
+
+    assert resolve(router, "GET", "/users/me/profile") == (
+        handler_b,
+        {"user_id": "me"},
+    )
+
+
+def test_match_placeholder_inside_segment():
+    router = Router()
+    router.add_route("/files/{name}.{ext}", "GET", handler_a)
+
+    assert resolve(router, "GET", "/files/report.csv") == (
+        handler_a,
+        {"name": "report", "ext": "csv"},
+    )
+    assert resolve(router, "GET", "/files/report") is None
+
+
+@pytest.mark.asyncio
+async def test_dynamic_route(app, client):
+    @get("/users/{user_id}")
+    async def get_user(request, user_id: int):
+        return JsonResponse({"user_id": user_id})
+
+    app.add_route("/users/{user_id}", HttpMethod.GET, get_user)
+
+    response = await client.get("/users/42")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"user_id": 42}
+
+
+@pytest.mark.asyncio
+async def test_dynamic_route_not_found(app, client):
+    @get("/users/{user_id}")
+    async def get_user(request, user_id: int):
+        return JsonResponse({"user_id": user_id})
+
+    app.add_route("/users/{user_id}", HttpMethod.GET, get_user)
+
+    response = await client.get("/users/42/posts")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_match_int_converter():
+    router = Router()
+    router.add_route("/users/{user_id:int}", "GET", handler_a)
+
+    assert resolve(router, "GET", "/users/42") == (handler_a, {"user_id": 42})
+    assert resolve(router, "GET", "/users/abc") is None
+    assert resolve(router, "GET", "/users/-1") is None
+
+
+def test_typed_param_falls_through_to_next_candidate():
+    router = Router()
+    router.add_route("/users/{slug}", "GET", handler_b)
+    router.add_route("/users/{user_id:int}", "GET", handler_a)
+
+    assert resolve(router, "GET", "/users/42") == (handler_a, {"user_id": 42})
+    assert resolve(router, "GET", "/users/john") == (handler_b, {"slug": "john"})
+
+
+def test_match_float_and_uuid_converters():
+    router = Router()
+    router.add_route("/prices/{amount:float}", "GET", handler_a)
+    router.add_route("/orders/{order_id:uuid}", "GET", handler_b)
+
+    assert resolve(router, "GET", "/prices/9.5") == (handler_a, {"amount": 9.5})
+    assert resolve(router, "GET", "/prices/nine") is None
+    assert resolve(router, "GET", "/orders/12345678-1234-5678-1234-567812345678") == (
+        handler_b,
+        {"order_id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    )
+    assert resolve(router, "GET", "/orders/not-a-uuid") is None
+
+
+def test_match_path_converter():
+    router = Router()
+    router.add_route("/files/{rest:path}", "GET", handler_a)
+    router.add_route("/docs/{rest:path}/edit", "GET", handler_b)
+
+    assert resolve(router, "GET", "/files/a/b/c.txt") == (
+        handler_a,
+        {"rest": "a/b/c.txt"},
+    )
+    assert resolve(router, "GET", "/docs/a/b/edit") == (handler_b, {"rest": "a/b"})
+    assert resolve(router, "GET", "/files/") is None
+
+
+def test_match_converter_inside_segment():
+    router = Router()
+    router.add_route("/reports/{year:int}.{fmt}", "GET", handler_a)
+
+    assert resolve(router, "GET", "/reports/2024.csv") == (
+        handler_a,
+        {"year": 2024, "fmt": "csv"},
+    )
+    assert resolve(router, "GET", "/reports/last.csv") is None
+
+
+def test_unknown_converter_raises():
+    router = Router()
+
+    with pytest.raises(ValueError):
+        router.add_route("/users/{user_id:integer}", "GET", handler_a)
+
+
+@pytest.mark.asyncio
+async def test_typed_route_does_not_invoke_handler_on_mismatch(app, client):
+    calls = []
+
+    @get("/items/{item_id:int}")
+    async def get_item(request, item_id):
+        calls.append(item_id)
+        return JsonResponse({"item_id": item_id})
+
+    app.add_route("/items/{item_id:int}", HttpMethod.GET, get_item)
+
+    response = await client.get("/items/5")
+    not_found = await client.get("/items/abc")
+
+    assert response.json() == {"item_id": 5}
+    assert not_found.status_code == HTTPStatus.NOT_FOUND
+    assert calls == [5]
+
+
+@pytest.mark.asyncio
+async def test_route_resolution_is_cached(app, client):
+    @get("/products/{product_id:int}")
+    async def get_product(request, product_id):
+        return JsonResponse({"product_id": product_id})
+
+    app.add_route("/products/{product_id:int}", HttpMethod.GET, get_product)
+
+    await client.get("/products/1")
+    await client.get("/products/1")
+    await client.get("/missing")
+    response = await client.get("/missing")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert app.route_cache.hits == 2
+    assert app.route_cache.misses == 2
+    assert app.resolve_route("GET", "/missing").status is HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_route_cache_is_cleared_when_route_is_added(app, client):
+    response = await client.get("/late")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @get("/late")
+    async def late(request):
+        return JsonResponse({"late": True})
+
+    app.add_route("/late", HttpMethod.GET, late)
+
+    response = await client.get("/late")
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_route_cache_size_from_config(app):
+    assert app.route_cache.max_size == app.config["ROUTE_CACHE_SIZE"]
+
+
+def test_allowed_methods_cover_parameterized_routes():
+    router = Router()
+    router.add_route("/users/{user_id:int}", "GET", handler_a)
+    router.add_route("/users/{user_id:int}", "DELETE", handler_b)
+    router.add_route("/users/me", "POST", handler_a)
+
+    assert router.allowed_methods("/users/1") == {"GET", "DELETE"}
+    assert router.allowed_methods("/users/me") == {"POST"}
+    assert router.allowed_methods("/users/abc") == frozenset()
+
+
+def test_resolve_method_not_allowed():
+    router = Router()
+    router.add_route("/users/{user_id}", "GET", handler_a)
+
+    resolution = router.resolve("POST", "/users/1")
+
+    assert resolution.status is HTTPStatus.METHOD_NOT_ALLOWED
+    assert resolution.allow_header == "GET, HEAD, OPTIONS"
+
+
+@pytest.mark.asyncio
+async def test_method_not_allowed_on_parameterized_route(app, client):
+    @get("/orders/{order_id}")
+    async def get_order(request, order_id):
+        return JsonResponse({"order_id": order_id})
+
+    app.add_route("/orders/{order_id}", HttpMethod.GET, get_order)
+
+    response = await client.post("/orders/1")
+
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+    assert response.headers["allow"] == "GET, HEAD, OPTIONS"
+
+
+@pytest.mark.asyncio
+async def test_options_is_answered_without_calling_handlers(app, client):
+    calls = []
+
+    @get("/orders/{order_id}")
+    async def get_order(request, order_id):
+        calls.append(order_id)
+        return JsonResponse({"order_id": order_id})
+
+    app.add_route("/orders/{order_id}", HttpMethod.GET, get_order)
+
+    response = await client.options("/orders/1")
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert response.headers["allow"] == "GET, HEAD, OPTIONS"
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_head_uses_get_route_without_body(app, client):
+    @get("/orders/{order_id}")
+    async def get_order(request, order_id):
+        return JsonResponse({"order_id": order_id})
+
+    app.add_route("/orders/{order_id}", HttpMethod.GET, get_order)
+
+    response = await client.head("/orders/1")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b""
@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+
+import pytest
+from sqlalchemy import create_engine
+
+from inspira.decorators.http_methods import get
+from inspira.enums import HttpMethod
+from inspira.middlewares.sessions import SessionMiddleware
+from inspira.requests import Request
+from inspira.responses import HttpResponse
+from inspira.utils.session_stores import (
+    DatabaseSessionStore,
+    FileSessionStore,
+    MemorySessionStore,
+    SessionStore,
+    generate_session_id,
+    is_valid_session_id,
+)
+from inspira.utils.session_utils import load_session
+
+
+class RecordingStore(FileSessionStore):
+    """Records the threads the store is called from."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.threads = []
+
+    def load(self, session_id):
+        self.threads.append(threading.get_ident())
+        return super().load(session_id)
+
+    def save(self, session_id, data, max_age):
+        self.threads.append(threading.get_ident())
+        super().save(session_id, data, max_age)
+
+
+@pytest.fixture(params=["memory", "file", "database"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore(max_entries=10)
+    if request.param == "file":
+        return FileSessionStore(str(tmp_path / "sessions"))
+    return DatabaseSessionStore(create_engine("sqlite://"))
+
+
+def test_store_save_and_load(store):
+    session_id = generate_session_id()
+    store.save(session_id, {"cart": [1, 2, 3]}, max_age=60)
+
+    assert store.load(session_id) == {"cart": [1, 2, 3]}
+
+
+def test_store_delete(store):
+    session_id = generate_session_id()
+    store.save(session_id, {"cart": [1]}, max_age=60)
+
+    store.delete(session_id)
+
+    assert store.load(session_id) is None
+
+
+def test_store_expired_sessions_are_purged(store):
+    expired_id = generate_session_id()
+    active_id = generate_session_id()
+    store.save(expired_id, {"cart": [1]}, max_age=-1)
+    store.save(active_id, {"cart": [2]}, max_age=60)
+
+    assert store.purge_expired() == 1
+    assert store.load(expired_id) is None
+    assert store.load(active_id) == {"cart": [2]}
+
+
+def test_file_store_rejects_unsafe_session_ids(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+
+    assert store.load("../../etc/passwd") is None
+    assert is_valid_session_id("../../etc/passwd") is False
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_entries=1)
+    first_id = generate_session_id()
+    second_id = generate_session_id()
+
+    store.save(first_id, {"a": 1}, max_age=60)
+    store.save(second_id, {"b": 2}, max_age=60)
+
+    assert store.load(first_id) is None
+    assert store.load(second_id) == {"b": 2}
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_with_store(app, client):
+    store = MemorySessionStore()
+    app.add_middleware(SessionMiddleware(store=store, purge_interval=None))
+
+    @get("/add")
+    async def add_to_cart(request: Request):
+        cart = request.get_session("cart", [])
+        request.set_session("cart", cart + ["item"])
+        return HttpResponse("added")
+
+    @get("/cart")
+    async def get_cart(request: Request):
+        return HttpResponse(",".join(request.get_session("cart", [])))
+
+    app.add_route("/add", HttpMethod.GET, add_to_cart)
+    app.add_route("/cart", HttpMethod.GET, get_cart)
+
+    response = await client.get("/add")
+    session_id = SimpleCookie(response.headers["set-cookie"])["session"].value
+
+    assert is_valid_session_id(session_id)
+    assert store.load(session_id) == {"cart": ["item"]}
+
+    response = await client.get("/cart", cookies={"session": session_id})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text == "item"
+    assert "set-cookie" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_saves_nested_changes_to_store(app, client):
+    store = MemorySessionStore()
+    app.add_middleware(SessionMiddleware(store=store, purge_interval=None))
+
+    @get("/add")
+    async def add(request: Request):
+        request.set_session("cart", [1])
+        return HttpResponse("added")
+
+    @get("/append")
+    async def append(request: Request):
+        request.session["cart"].append(2)
+        return HttpResponse("appended")
+
+    app.add_route("/add", HttpMethod.GET, add)
+    app.add_route("/append", HttpMethod.GET, append)
+
+    response = await client.get("/add")
+    session_id = SimpleCookie(response.headers["set-cookie"])["session"].value
+    await client.get("/append", cookies={"session": session_id})
+
+    assert store.load(session_id) == {"cart": [1, 2]}
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_runs_blocking_store_in_thread(app, client, tmp_path):
+    store = RecordingStore(str(tmp_path / "sessions"))
+    threads = store.threads
+    app.add_middleware(SessionMiddleware(store=store, purge_interval=None))
+
+    @get("/count")
+    async def count(request: Request):
+        request.set_session("count", request.get_session("count", 0) + 1)
+        return HttpResponse(str(request.get_session("count")))
+
+    app.add_route("/count", HttpMethod.GET, count)
+
+    response = await client.get("/count")
+    session_id = SimpleCookie(response.headers["set-cookie"])["session"].value
+    response = await client.get("/count", cookies={"session": session_id})
+
+    assert response.text == "2"
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_session_read_without_middleware_is_loaded_in_thread(
+    app, client, tmp_path
+):
+    store = RecordingStore(str(tmp_path / "sessions"))
+    session_middleware = SessionMiddleware(store=store, purge_interval=None)
+    app.add_middleware(session_middleware)
+    session_id = generate_session_id()
+    store.save(session_id, {"user": "ada"}, 60)
+    store.threads.clear()
+
+    async def whoami(request: Request):
+        return HttpResponse(request.get_session("user"))
+
+    app.add_route(
+        "/whoami", HttpMethod.GET, whoami, exclude_middleware=[session_middleware]
+    )
+
+    response = await client.get("/whoami", cookies={"session": session_id})
+
+    assert response.text == "ada"
+    assert len(store.threads) == 1
+    assert threading.get_ident() not in store.threads
+
+
+def test_load_session_warns_about_blocking_store(app, tmp_path, mocker):
+    log = mocker.patch("inspira.utils.session_utils.log")
+    store = FileSessionStore(str(tmp_path / "sessions"))
+    app.session_store = store
+    session_id = generate_session_id()
+    store.save(session_id, {"user": "ada"}, 60)
+    request = Request(
+        {"headers": [(b"cookie", f"session={session_id}".encode())]}, None, None
+    )
+
+    assert load_session(request) == {"user": "ada"}
+    assert "blocking store" in log.warning.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_purges_in_background(app, client, mocker):
+    store = MemorySessionStore()
+    purge_expired = mocker.spy(store, "purge_expired")
+    session_middleware = SessionMiddleware(store=store, purge_interval=0.01)
+    app.add_middleware(session_middleware)
+
+    @get("/test")
+    async def test_route(request: Request):
+        return HttpResponse("hello")
+
+    app.add_route("/test", HttpMethod.GET, test_route)
+
+    await client.get("/test")
+    deadline = time.monotonic() + 1
+    while not purge_expired.called and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+    session_middleware.purge_task.cancel()
+
+    assert purge_expired.called
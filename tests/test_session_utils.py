@@ -1,13 +1,21 @@
 import datetime
+import json
+from unittest.mock import AsyncMock
 
 import pytest
+from itsdangerous import URLSafeTimedSerializer
 
+from inspira.datastructures import parse_cookie_header
+from inspira.requests import Request
 from inspira.utils.session_utils import (
     DateTimeEncoder,
+    Session,
     decode_session_data,
     encode_session_data,
     get_or_create_session,
+    get_session_serializer,
     get_session_token_from_request,
+    load_session,
 )
 
 
@@ -42,12 +50,33 @@ def test_encode_decode_session_data(secret_key):
 
     decoded_session_data = decode_session_data(session_token, secret_key)
 
-    expiration_time = decoded_session_data.pop("expiration_time", None)
-
-    assert expiration_time is not None
     assert decoded_session_data == session_data
 
 
+def test_decode_expired_session_data(app, secret_key):
+    session_token = encode_session_data({"user_id": 1}, secret_key)
+    max_age = app.config["SESSION_MAX_AGE"]
+    app.config["SESSION_MAX_AGE"] = -1
+    try:
+        assert decode_session_data(session_token, secret_key) is None
+    finally:
+        app.config["SESSION_MAX_AGE"] = max_age
+
+
+def test_encode_session_data_compresses_large_payloads(app, secret_key):
+    small_token = encode_session_data({"cart": "x" * 10}, secret_key)
+    large_token = encode_session_data({"cart": "x" * 4000}, secret_key)
+
+    assert not small_token.startswith(".")
+    assert large_token.startswith(".")
+    assert len(large_token) < 4000
+    assert decode_session_data(large_token, secret_key) == {"cart": "x" * 4000}
+
+
+def test_session_serializer_is_cached(secret_key):
+    assert get_session_serializer(secret_key) is get_session_serializer(secret_key)
+
+
 def test_get_or_create_session_with_valid_cookie(secret_key):
     session_data = {"email": "hayri@inspiraframework.com"}
     encoded_session_token = encode_session_data(session_data, secret_key)
@@ -56,18 +85,15 @@ def test_get_or_create_session_with_valid_cookie(secret_key):
         def __init__(self, cookie_value):
             self.headers = {"cookie": cookie_value}
 
-        def get_headers(self):
-            return self.headers
+        def cookies(self):
+            return parse_cookie_header(self.headers["cookie"])
 
     mock_request = MockRequest(f"session={encoded_session_token}")
     result = get_or_create_session(mock_request)
 
     expected_result = {"email": "hayri@inspiraframework.com"}
 
-    expiration_time = result.pop("expiration_time", None)
-
     assert result == expected_result
-    assert expiration_time is not None
 
 
 def test_get_or_create_session_with_invalid_session(secret_key):
@@ -78,8 +104,8 @@ def test_get_or_create_session_with_invalid_session(secret_key):
             self.session = None
             self.headers = {"cookie": cookie_value}
 
-        def get_headers(self):
-            return self.headers
+        def cookies(self):
+            return parse_cookie_header(self.headers["cookie"])
 
     mock_request = MockRequest(f"session={session_id}")
 
@@ -102,11 +128,80 @@ def test_get_session_token_from_request(cookie_value, expected_token):
         def __init__(self, cookie_value):
             self.headers = {"cookie": cookie_value}
 
-        def get_headers(self):
-            return self.headers
+        def cookies(self):
+            return parse_cookie_header(self.headers["cookie"])
 
     session_cookie_name = "session"
     mock_request = MockRequest(cookie_value)
     result = get_session_token_from_request(mock_request, session_cookie_name)
 
     assert result == expected_token
+
+
+def test_session_tracks_modifications():
+    session = Session({"user_id": 1})
+    assert session.modified is False
+
+    session.get("user_id")
+    assert session.modified is False
+
+    session["user_id"] = 2
+    assert session.modified is True
+
+
+def test_session_detects_nested_modifications():
+    session = Session({"cart": [1]})
+    assert session.is_modified() is False
+
+    session["cart"].append(2)
+
+    assert session.modified is False
+    assert session.is_modified() is True
+
+
+def test_load_session_without_cookie(app):
+    request = Request({"headers": []}, AsyncMock(), AsyncMock())
+
+    session = load_session(request)
+
+    assert session == {}
+    assert session.token is None
+    assert session.invalid is False
+
+
+def test_load_session_with_invalid_cookie(app):
+    request = Request(
+        {"headers": [(b"cookie", b"session=invalid")]}, AsyncMock(), AsyncMock()
+    )
+
+    session = load_session(request)
+
+    assert session == {}
+    assert session.invalid is True
+
+
+def test_load_session_with_legacy_cookie(app):
+    payload = {
+        "user_id": 1,
+        "expiration_time": datetime.datetime.utcnow() + datetime.timedelta(hours=1),
+    }
+    session_token = URLSafeTimedSerializer(app.secret_key).dumps(
+        json.dumps(payload, cls=DateTimeEncoder)
+    )
+    request = Request(
+        {"headers": [(b"cookie", f"session={session_token}".encode())]},
+        AsyncMock(),
+        AsyncMock(),
+    )
+
+    session = load_session(request)
+
+    assert session == {"user_id": 1}
+    assert session.invalid is False
+
+
+def test_decode_session_data_rejects_non_object_payload(secret_key):
+    serializer = URLSafeTimedSerializer(secret_key)
+
+    assert decode_session_data(serializer.dumps([1, 2]), secret_key) is None
+    assert decode_session_data(serializer.dumps("not json"), secret_key) is None
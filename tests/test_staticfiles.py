@@ -0,0 +1,259 @@
+import gzip
+import os
+from http import HTTPStatus
+
+import pytest
+
+from inspira import Inspira
+from inspira.cli.build_static import build_static_files
+from inspira.config import Config
+from inspira.decorators.http_methods import get
+from inspira.enums import HttpMethod
+from inspira.responses import TemplateResponse
+from inspira.staticfiles import StaticFiles, accepted_encodings
+from inspira.testclient import TestClient
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    directory = tmp_path / "static"
+    (directory / "css").mkdir(parents=True)
+    (directory / "css" / "site.css").write_text("body { color: red; }")
+    (directory / "app.js").write_text("console.log('app');" * 100)
+    (directory / "app.js.gz").write_bytes(gzip.compress(b"console.log('app');" * 100))
+    (directory / "large.bin").write_bytes(b"x" * 4096)
+    (tmp_path / "secret.txt").write_text("secret")
+    return directory
+
+
+@pytest.fixture
+def static_client(static_dir):
+    config = Config()
+    config["STATIC_DIR"] = str(static_dir)
+    config["STATIC_MAX_AGE"] = 3600
+    config["STATIC_CACHE_MAX_FILE_SIZE"] = 1024
+    return TestClient(Inspira(config=config))
+
+
+async def call(static_files, path, method="GET", headers=None):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    await static_files(scope, receive, send)
+    return messages[0]["status"]
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+
+
+def test_static_files_indexes_directory_at_startup(static_dir):
+    static_files = StaticFiles(str(static_dir))
+
+    assert set(static_files.files) == {
+        "css/site.css",
+        "app.js",
+        "app.js.gz",
+        "large.bin",
+    }
+    assert static_files.files["css/site.css"].content_type == "text/css"
+    assert set(static_files.files["app.js"].encodings) == {"gzip"}
+
+
+@pytest.mark.asyncio
+async def test_serves_file_with_caching_headers(static_client):
+    response = await static_client.get("/static/css/site.css")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text == "body { color: red; }"
+    assert response.headers["content-type"] == "text/css"
+    assert response.headers["content-length"] == "20"
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_cached(static_client):
+    static_files = static_client.app.static_files
+
+    await static_client.get("/static/css/site.css")
+    await static_client.get("/static/css/site.css")
+    await static_client.get("/static/large.bin")
+
+    assert ("css/site.css", None) in static_files.responses
+    assert static_files.responses.hits == 1
+    assert len(static_files.responses) == 1
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_return_not_modified(static_client):
+    response = await static_client.get("/static/css/site.css")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = await static_client.get(
+        "/static/css/site.css", headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = await static_client.get(
+        "/static/css/site.css", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = await static_client.get(
+        "/static/css/site.css", headers={"If-None-Match": '"other"'}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_large_files_get_etag_from_stat(static_client, static_dir, mocker):
+    compute_etag = mocker.spy(StaticFiles, "compute_etag")
+    stat_result = os.stat(static_dir / "large.bin")
+
+    response = await static_client.get("/static/large.bin")
+    etag = response.headers["etag"]
+
+    assert etag == f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    compute_etag.assert_not_called()
+
+    response = await static_client.get(
+        "/static/large.bin", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_serves_precompressed_sibling(static_client):
+    plain = await static_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    compressed = await static_client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip"}
+    )
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"] == "text/javascript"
+    assert compressed.headers["etag"] != plain.headers["etag"]
+    assert compressed.text == plain.text
+
+
+@pytest.mark.asyncio
+async def test_range_and_head_requests(static_client):
+    response = await static_client.get(
+        "/static/large.bin", headers={"Range": "bytes=0-9"}
+    )
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == b"x" * 10
+
+    response = await static_client.head("/static/css/site.css")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-length"] == "20"
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_paths_and_methods(static_client):
+    assert (await static_client.get("/static/missing.css")).status_code == 404
+    assert (await static_client.get("/static/css")).status_code == 404
+    assert (await static_client.get("/staticfoo")).status_code == 404
+
+    response = await static_client.post("/static/css/site.css")
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+    assert response.headers["allow"] == "GET, HEAD"
+
+
+@pytest.mark.asyncio
+async def test_blocks_path_traversal(static_dir):
+    os.symlink(static_dir.parent / "secret.txt", static_dir / "link.txt")
+    static_files = StaticFiles(str(static_dir), auto_reload=True)
+
+    for path in (
+        "/static/../secret.txt",
+        "/static/css/../../secret.txt",
+        "/static//etc/passwd",
+        "/static/..\\secret.txt",
+        "/static/link.txt",
+    ):
+        assert await call(static_files, path) == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_auto_reload_picks_up_changes(static_dir):
+    static_files = StaticFiles(str(static_dir), auto_reload=True)
+    (static_dir / "new.txt").write_text("new")
+
+    assert await call(static_files, "/static/new.txt") == HTTPStatus.OK
+
+    os.remove(static_dir / "new.txt")
+    assert await call(static_files, "/static/new.txt") == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_index_is_used_without_auto_reload(static_dir):
+    static_files = StaticFiles(str(static_dir))
+    (static_dir / "new.txt").write_text("new")
+
+    assert await call(static_files, "/static/new.txt") == HTTPStatus.NOT_FOUND
+
+    static_files.index()
+    assert await call(static_files, "/static/new.txt") == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_fingerprinted_files_are_immutable(static_dir):
+    build_static_files(str(static_dir), workers=1)
+    config = Config()
+    config["STATIC_DIR"] = str(static_dir)
+    app = Inspira(config=config)
+    client = TestClient(app)
+
+    url = app.static_files.url_for("css/site.css")
+    assert url.startswith("/static/dist/css/site.")
+    assert app.static_files.url_for("unknown.css") == "/static/unknown.css"
+
+    response = await client.get(url)
+    assert response.text == "body { color: red; }"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    response = await client.get("/static/css/site.css")
+    assert "cache-control" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_static_url_in_templates(static_dir, tmp_path):
+    build_static_files(str(static_dir), workers=1)
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    (template_dir / "page.html").write_text("{{ static_url('app.js') }}")
+    config = Config()
+    config["STATIC_DIR"] = str(static_dir)
+    app = Inspira(config=config)
+
+    @get("/page")
+    async def page():
+        return TemplateResponse("page.html", template_dir=str(template_dir))
+
+    app.add_route("/page", HttpMethod.GET, page)
+    response = await TestClient(app).get("/page")
+
+    assert response.text == app.static_files.url_for("app.js")
+    assert response.text.startswith("/static/dist/app.")
@@ -0,0 +1,117 @@
+import os
+from http import HTTPStatus
+
+import pytest
+
+from inspira import Inspira
+from inspira.config import Config
+from inspira.decorators.http_methods import get
+from inspira.enums import HttpMethod
+from inspira.responses import TemplateResponse
+from inspira.templating import Templates
+from inspira.testclient import TestClient
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "base.html").write_text(
+        "<title>{% block title %}{% endblock %}</title>{% include 'nav.html' %}"
+    )
+    (directory / "nav.html").write_text("<nav>{{ user }}</nav>")
+    (directory / "page.html").write_text(
+        "{% extends 'base.html' %}{% block title %}{{ title | shout }}{% endblock %}"
+    )
+    return directory
+
+
+def add_page_route(app, template_dir, template_name="page.html"):
+    @get("/page")
+    async def page():
+        return TemplateResponse(
+            template_name,
+            {"title": "home", "user": "ada"},
+            template_dir=str(template_dir),
+        )
+
+    app.add_route("/page", HttpMethod.GET, page)
+
+
+@pytest.mark.asyncio
+async def test_environment_is_shared_between_renders(app, template_dir):
+    app.add_template_filter(lambda value: value.upper() + "!", "shout")
+    add_page_route(app, template_dir)
+    client = TestClient(app)
+
+    first = await client.get("/page")
+    environment = app.templates.environments[str(template_dir)]
+    compiled = environment.get_template("page.html")
+    second = await client.get("/page")
+
+    assert first.text == second.text == "<title>HOME!</title><nav>ada</nav>"
+    assert list(app.templates.environments) == [str(template_dir)]
+    assert environment.get_template("page.html") is compiled
+
+
+@pytest.mark.asyncio
+async def test_template_globals_and_environment_hooks(app, template_dir):
+    (template_dir / "hook.html").write_text("{{ site_name }} {{ 'x' | double }}")
+
+    app.add_template_global("Inspira", "site_name")
+    app.templates.add_environment_hook(
+        lambda environment: environment.filters.update(double=lambda v: v * 2)
+    )
+    add_page_route(app, template_dir, "hook.html")
+
+    response = await TestClient(app).get("/page")
+
+    assert response.text == "Inspira xx"
+
+
+@pytest.mark.asyncio
+async def test_missing_template_returns_not_found(app, template_dir):
+    add_page_route(app, template_dir, "missing.html")
+
+    response = await TestClient(app).get("/page")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_auto_reload_follows_config(template_dir):
+    config = Config()
+    config["TEMPLATE_AUTO_RELOAD"] = True
+    app = Inspira(config=config)
+
+    assert app.templates.get_environment(str(template_dir)).auto_reload is True
+    assert Templates().get_environment(str(template_dir)).auto_reload is False
+
+
+def test_template_changes_are_only_seen_with_auto_reload(template_dir):
+    templates = Templates(bytecode_cache=False)
+    reloading = Templates(auto_reload=True, bytecode_cache=False)
+    for environment in (
+        templates.get_environment(str(template_dir)),
+        reloading.get_environment(str(template_dir)),
+    ):
+        environment.get_template("nav.html")
+
+    path = template_dir / "nav.html"
+    path.write_text("<nav>changed</nav>")
+    stat_result = path.stat()
+    os.utime(path, (stat_result.st_atime, stat_result.st_mtime + 10))
+
+    environment = templates.get_environment(str(template_dir))
+    assert environment.get_template("nav.html").render() == "<nav></nav>"
+    environment = reloading.get_environment(str(template_dir))
+    assert environment.get_template("nav.html").render() == "<nav>changed</nav>"
+
+
+def test_bytecode_cache_is_written_to_disk(template_dir, tmp_path):
+    cache_dir = tmp_path / "bytecode"
+    cache_dir.mkdir()
+    templates = Templates(bytecode_cache_dir=str(cache_dir))
+
+    templates.get_environment(str(template_dir)).get_template("nav.html")
+
+    assert len(list(cache_dir.iterdir())) == 1
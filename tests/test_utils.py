@@ -1,3 +1,10 @@
+import dataclasses
+import datetime
+import decimal
+import uuid
+
+import pytest
+
 from inspira.utils import (
     convert_to_camel_case,
     convert_to_snake_case,
@@ -5,6 +12,8 @@ from inspira.utils import (
     pluralize_word,
     singularize,
 )
+from inspira.utils.json_codec import get_json_codec, load_json_codec, msgspec, orjson
+from inspira.utils.lru_cache import LRUCache
 
 
 def test_singularize_word():
@@ -48,3 +57,105 @@ def test_convert_to_camel_case():
     assert convert_to_camel_case("get-started") == "GetStarted"
     assert convert_to_camel_case("get_started") == "GetStarted"
     assert convert_to_camel_case("GetStarted") == "Getstarted"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+
+    cache.get("a")
+    cache.get("missing")
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_lru_cache_with_zero_size_stores_nothing():
+    cache = LRUCache(0)
+    cache.set("a", 1)
+
+    assert len(cache) == 0
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def json_codec(request):
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    return load_json_codec(request.param)
+
+
+@dataclasses.dataclass
+class Order:
+    id: uuid.UUID
+    total: decimal.Decimal
+    created_at: datetime.datetime
+
+
+def test_json_codec_round_trip(json_codec):
+    data = {"id": 1, "day": datetime.date(2024, 1, 2), "tags": ["a", "b"]}
+
+    encoded = json_codec.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded
+    assert json_codec.loads(encoded) == {
+        "id": 1,
+        "day": "2024-01-02",
+        "tags": ["a", "b"],
+    }
+    assert json_codec.loads(encoded.decode()) == json_codec.loads(encoded)
+
+
+def test_json_codec_encodes_rich_types(json_codec):
+    order = Order(
+        id=uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        total=decimal.Decimal("19.99"),
+        created_at=datetime.datetime(2024, 1, 2, 3, 4, 5),
+    )
+
+    assert json_codec.loads(json_codec.dumps({"order": order})) == {
+        "order": {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "total": "19.99",
+            "created_at": "2024-01-02T03:04:05",
+        }
+    }
+
+
+def test_load_json_codec_auto_prefers_installed_library():
+    codec = load_json_codec("auto")
+
+    assert codec is load_json_codec("auto")
+    if orjson is not None:
+        assert codec.name == "orjson"
+    elif msgspec is None:
+        assert codec.name == "json"
+
+
+def test_load_json_codec_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        load_json_codec("yaml")
+
+
+def test_get_json_codec_follows_config(app):
+    app.config["JSON_CODEC"] = "json"
+    try:
+        assert get_json_codec().name == "json"
+    finally:
+        app.config["JSON_CODEC"] = "auto"
+
+
+def test_json_codec_converts_non_string_keys(json_codec):
+    assert json_codec.loads(json_codec.dumps({1: "a"})) == {"1": "a"}